@@ -0,0 +1,3 @@
+"""
+Módulo Benchmarks - HB sintéticos e tempos por fase da conversão
+"""
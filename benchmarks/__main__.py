@@ -0,0 +1,162 @@
+"""
+Benchmarks da conversão HB -> Painel CCM
+
+Uso (na raiz do repositório):
+  python -m benchmarks generate --sizes 1k,10k,100k,500k
+  python -m benchmarks run --sizes 1k,10k -o benchmarks/resultados.json
+  python -m benchmarks compare linha_base.json benchmarks/resultados.json
+  python -m benchmarks import-time -o benchmarks/inicializacao.json
+"""
+
+import argparse
+import os
+import sys
+from typing import List
+
+from benchmarks.runner import (
+    DATA_DIR,
+    DEFAULT_MIN_DELTA,
+    DEFAULT_THRESHOLD,
+    compare,
+    input_file,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+from benchmarks.import_time import run_import_time
+from benchmarks.synthetic_hb import SIZES, parse_size
+
+
+DEFAULT_SIZES = '1k,10k'
+
+
+def _sizes(text: str) -> List[str]:
+    sizes = [size.strip().lower() for size in text.split(',') if size.strip()]
+    for size in sizes:
+        parse_size(size)
+    return sizes
+
+
+def _add_threshold_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD * 100,
+                        help=f'Piora (%%) que conta como regressão '
+                             f'(padrão: {DEFAULT_THRESHOLD * 100:.0f})')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help=f'Piora mínima em segundos (padrão: {DEFAULT_MIN_DELTA})')
+
+
+def _print_comparison(baseline_path: str, current, threshold: float, min_delta: float) -> int:
+    lines, regressions = compare(load_results(baseline_path), current, threshold, min_delta)
+    print(f"\n📊 Comparação com {baseline_path} (limite +{threshold * 100:.0f}%, "
+          f"mínimo {min_delta:.3f}s):")
+    for line in lines:
+        print(f"   {line}")
+    if regressions:
+        print(f"\n⚠️  {regressions} regressão(ões) de desempenho")
+        return 1
+    print("\n✅ Sem regressões")
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmarks da conversão com HB sintéticos '
+                    f"(tamanhos: {', '.join(SIZES)} ou um número de linhas)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('\n\n', 1)[1],
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='Gera os HB sintéticos')
+    generate.add_argument('--sizes', default=','.join(SIZES),
+                          help='Tamanhos separados por vírgula (padrão: todos)')
+    generate.add_argument('--seed', type=int, default=0, help='Semente do gerador')
+    generate.add_argument('--data-dir', default=DATA_DIR,
+                          help='Diretório dos HB gerados (padrão: benchmarks/.dados)')
+
+    run = commands.add_parser('run', help='Roda os benchmarks e grava os tempos em JSON')
+    run.add_argument('--sizes', default=DEFAULT_SIZES,
+                     help=f'Tamanhos separados por vírgula (padrão: {DEFAULT_SIZES})')
+    run.add_argument('-n', '--repeat', type=int, default=3,
+                     help='Conversões medidas por tamanho (padrão: 3)')
+    run.add_argument('--no-warmup', action='store_true',
+                     help='Sem a conversão de aquecimento antes das medidas')
+    run.add_argument('-o', '--output', default=None,
+                     help='Arquivo JSON dos resultados (padrão: benchmarks/resultados_<data>.json)')
+    run.add_argument('-c', '--config', default=None, help='Arquivo de configuração (.yaml)')
+    run.add_argument('--output-profile', default=None,
+                     help='Perfil de saída (fast, compact, pretty)')
+    run.add_argument('--baseline', default=None,
+                     help='Compara com estes resultados ao final (sai com 1 se houver regressão)')
+    run.add_argument('--seed', type=int, default=0, help='Semente do gerador')
+    run.add_argument('--data-dir', default=DATA_DIR,
+                     help='Diretório dos HB gerados (padrão: benchmarks/.dados)')
+
+    _add_threshold_arguments(run)
+
+    compare_parser = commands.add_parser('compare', help='Compara resultados com uma linha de base')
+    compare_parser.add_argument('baseline', help='Resultados de referência (.json)')
+    compare_parser.add_argument('current', help='Resultados novos (.json)')
+    _add_threshold_arguments(compare_parser)
+
+    import_time = commands.add_parser('import-time',
+                                      help='Mede a inicialização da CLI (interpretador novo)')
+    import_time.add_argument('-n', '--repeat', type=int, default=10,
+                             help='Execuções medidas por caso (padrão: 10)')
+    import_time.add_argument('-o', '--output', default=None,
+                             help='Arquivo JSON dos resultados')
+    import_time.add_argument('--baseline', default=None,
+                             help='Compara com estes resultados ao final (sai com 1 se houver regressão)')
+    _add_threshold_arguments(import_time)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        return _print_comparison(args.baseline, load_results(args.current),
+                                 args.threshold / 100, args.min_delta)
+
+    if args.command == 'import-time':
+        print(f"⏱️  Inicialização: {args.repeat} execuções por caso (+1 de aquecimento)...")
+        results = run_import_time(args.repeat)
+        if args.output:
+            save_results(results, args.output)
+            print(f"\n💾 Resultados salvos em: {args.output}")
+        if args.baseline:
+            return _print_comparison(args.baseline, results, args.threshold / 100,
+                                     args.min_delta)
+        return 0
+
+    try:
+        sizes = _sizes(args.sizes)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
+        return 1
+
+    if args.command == 'generate':
+        for size in sizes:
+            print(f"   {size}: {input_file(size, args.seed, args.data_dir)}")
+        return 0
+
+    from main import PainelConverter
+
+    output_options = {'profile': args.output_profile} if args.output_profile else None
+    results = run_benchmarks(
+        PainelConverter, sizes, args.repeat, not args.no_warmup, args.seed, args.data_dir,
+        converter_kwargs={'config_path': args.config}, output_options=output_options
+    )
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        f"resultados_{results['data'].replace(':', '').replace('-', '')}.json"
+    )
+    save_results(results, output)
+    print(f"\n💾 Resultados salvos em: {output}")
+
+    if args.baseline:
+        return _print_comparison(args.baseline, results, args.threshold / 100, args.min_delta)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
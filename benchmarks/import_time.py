@@ -0,0 +1,91 @@
+"""
+Tempo de inicialização da CLI
+Cada caso roda num interpretador novo (como na linha de comando): ajuda,
+erro de argumentos, import de main e criação do PainelConverter. Com
+-X importtime aponta os imports de topo mais caros de cada caso
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from benchmarks.runner import _git_commit, _summary
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Caso -> argumentos do interpretador
+CASES = {
+    'help': ['main.py', '--help'],
+    'erro_argumentos': ['main.py'],
+    'import_main': ['-c', 'import main'],
+    'conversor': ['-c', 'import main; main.PainelConverter()'],
+    # Sem o snapshot da configuração (lê o patterns.yaml e grava o snapshot num
+    # diretório temporário; os snapshots em config/.snapshot ficam intactos)
+    'conversor_yaml': ['-c', 'import os, tempfile\n'
+                             'with tempfile.TemporaryDirectory() as d:\n'
+                             '    os.environ["PAINEL_SNAPSHOT_DIR"] = d\n'
+                             '    import main; main.PainelConverter()'],
+}
+
+
+def _run(args: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def top_imports(args: List[str], limit: int = 5) -> List[Tuple[str, float]]:
+    """
+    Imports de topo mais caros (módulo, segundos acumulados) via -X importtime;
+    no lugar de main entram os imports feitos por ele
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    children = []  # o importtime lista os filhos antes do módulo que os importou
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[0].startswith('import time:'):
+            continue
+        try:
+            cumulative = int(parts[1]) / 1e6
+        except ValueError:  # cabeçalho
+            continue
+        name = parts[2].rstrip()
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level == 1:
+            children.append((name.strip(), cumulative))
+        elif level == 0:
+            imports.extend(children if name.strip() == 'main' else [(name.strip(), cumulative)])
+            children = []
+    return sorted(imports, key=lambda item: -item[1])[:limit]
+
+
+def run_import_time(repeat: int = 10) -> Dict:
+    """Mede os casos (repeat execuções cada, após uma de aquecimento)"""
+    results = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'repeticoes': repeat,
+        'casos': {},
+    }
+    for name, args in CASES.items():
+        _run(args)  # cache de disco e bytecode
+        samples = [_run(args) for _ in range(repeat)]
+        results['casos'][name] = {
+            'fases': {'total': _summary(samples)},
+            'imports': [[module, round(seconds, 4)] for module, seconds in top_imports(args)],
+        }
+        imports = ', '.join(f'{module} {seconds * 1000:.0f}ms'
+                            for module, seconds in top_imports(args, 3))
+        print(f"   {name:<16} {statistics.median(samples) * 1000:7.0f}ms "
+              f"(mín {min(samples) * 1000:.0f}ms)  {imports}")
+    return results
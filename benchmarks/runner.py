@@ -0,0 +1,207 @@
+"""
+Execução e comparação dos benchmarks
+Cada caso converte um HB sintético algumas vezes com PainelConverter; os
+tempos por fase vêm das métricas por etapa da própria conversão (stage()).
+Os resultados são gravados em JSON e comparados com uma linha de base pela
+mediana de cada fase
+"""
+
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic_hb import generate_hb, parse_size
+
+
+# Fases medidas: nome -> etapas de PainelConverter.convert somadas
+PHASES = {
+    'parse': ('load', 'parse'),
+    'transform': ('transform',),
+    'expand': ('expand',),
+    'validate': ('validate', 'validate_csharp'),
+    'generate': ('build_tables', 'generate'),
+}
+
+# Conversão completa (total das métricas)
+END_TO_END = 'total'
+
+# Diretório padrão dos HB sintéticos (gerados uma vez por tamanho/semente)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.dados')
+
+# Comparação: piora relativa e absoluta mínimas para acusar regressão
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_DELTA = 0.02
+
+
+def input_file(size: str, seed: int = 0, directory: str = DATA_DIR) -> str:
+    """HB sintético do tamanho (gerado se ainda não existe)"""
+    rows = parse_size(size)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'hb_{size}_s{seed}.xlsx')
+    if not os.path.exists(path):
+        print(f"🧪 Gerando HB sintético {size} ({rows} linhas)...")
+        start = time.perf_counter()
+        tmp = f'{path}.{os.getpid()}.tmp.xlsx'
+        counts = generate_hb(tmp, rows, seed=seed)
+        os.replace(tmp, path)
+        sheets = ', '.join(f'{name}: {count}' for name, count in counts.items())
+        print(f"   {path} ({time.perf_counter() - start:.1f}s; {sheets})")
+    return path
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, timeout=10,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _summary(samples: List[float]) -> Dict:
+    return {
+        'mediana': round(statistics.median(samples), 6),
+        'minimo': round(min(samples), 6),
+        'amostras': [round(sample, 6) for sample in samples],
+    }
+
+
+def run_case(factory: Callable, path: str, repeat: int = 3, warmup: bool = True,
+             converter_kwargs: Dict = None, output_options: Dict = None) -> Dict:
+    """
+    Converte o arquivo repeat vezes e resume os tempos por fase
+
+    Com warmup, uma conversão a mais antes das amostras (imports tardios,
+    caches do conversor) fica fora dos resultados.
+    """
+    converter = factory(**{**(converter_kwargs or {}), 'parse_cache': {'enabled': False}})
+    if output_options:
+        converter.configure_output(**output_options)
+
+    samples: Dict[str, List[float]] = {name: [] for name in (*PHASES, END_TO_END)}
+    points = rows_out = None
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = os.path.join(tmp, 'Painel_CCM_benchmark.xlsx')
+        for run in range(repeat + int(warmup)):
+            with redirect_stdout(io.StringIO()):
+                success = converter.convert(path, output_file)
+            if not success:
+                raise RuntimeError(f"Conversão falhou: {path}")
+            if warmup and run == 0:
+                continue
+
+            walls: Dict[str, float] = {}
+            for record in converter.metrics.records:
+                if record.depth == 0:
+                    walls[record.name] = walls.get(record.name, 0.0) + record.wall
+                    if record.name == 'parse':
+                        points = record.rows_out
+                    if record.name == 'generate':
+                        rows_out = record.rows_out
+            for name, stages in PHASES.items():
+                samples[name].append(sum(walls.get(stage, 0.0) for stage in stages))
+            samples[END_TO_END].append(converter.metrics.totals()['tempo'])
+
+    return {
+        'arquivo': os.path.basename(path),
+        'pontos': points,
+        'linhas_saida': rows_out,
+        'fases': {name: _summary(values) for name, values in samples.items()},
+    }
+
+
+def run_benchmarks(factory: Callable, sizes: List[str], repeat: int = 3, warmup: bool = True,
+                   seed: int = 0, data_dir: str = DATA_DIR, converter_kwargs: Dict = None,
+                   output_options: Dict = None) -> Dict:
+    """Roda os casos (um por tamanho) e devolve o resultado completo"""
+    results = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'repeticoes': repeat,
+        'aquecimento': warmup,
+        'semente': seed,
+        'casos': {},
+    }
+    for size in sizes:
+        path = input_file(size, seed, data_dir)
+        print(f"⏱️  {size}: {repeat} conversões{' (+1 de aquecimento)' if warmup else ''}...")
+        case = run_case(factory, path, repeat, warmup, converter_kwargs, output_options)
+        case['linhas'] = parse_size(size)
+        results['casos'][size] = case
+        for line in case_lines(case):
+            print(f"   {line}")
+    return results
+
+
+def case_lines(case: Dict) -> List[str]:
+    """Mediana por fase de um caso (uma linha por fase)"""
+    lines = []
+    for name, summary in case['fases'].items():
+        text = f"{name:<10} {summary['mediana']:9.3f}s (mín {summary['minimo']:.3f}s)"
+        if name == 'parse' and case.get('pontos') and summary['mediana'] > 0:
+            # Sem separador de milhar, como no resumo por etapa (stage_metrics)
+            text += f", {case['pontos'] / summary['mediana']:.0f} pontos/s"
+        lines.append(text)
+    return lines
+
+
+def save_results(results: Dict, path: str):
+    """Grava os resultados em JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD,
+            min_delta: float = DEFAULT_MIN_DELTA) -> Tuple[List[str], int]:
+    """
+    Compara a mediana de cada fase com a linha de base
+
+    Uma fase é regressão quando fica mais de threshold (fração) e mais de
+    min_delta segundos mais lenta.
+
+    Returns:
+        (linhas da comparação, número de regressões)
+    """
+    lines = []
+    regressions = 0
+    for size, case in current.get('casos', {}).items():
+        base_case = baseline.get('casos', {}).get(size)
+        if base_case is None:
+            lines.append(f"{size}: sem linha de base")
+            continue
+
+        lines.append(f"{size}:")
+        for name, summary in case['fases'].items():
+            base = base_case['fases'].get(name)
+            if base is None:
+                continue
+            before, after = base['mediana'], summary['mediana']
+            delta = after - before
+            ratio = after / before if before > 0 else float('inf') if after > 0 else 1.0
+
+            status = ''
+            if ratio > 1 + threshold and delta > min_delta:
+                status = '  ⚠️ REGRESSÃO'
+                regressions += 1
+            elif ratio < 1 - threshold and -delta > min_delta:
+                status = '  ✅ melhora'
+            lines.append(f"   {name:<10} {before:9.3f}s -> {after:9.3f}s "
+                         f"({(ratio - 1) * 100:+6.1f}%){status}")
+    return lines, regressions
@@ -0,0 +1,289 @@
+"""
+Gerador de arquivos HB sintéticos
+Monta Listas de I/O com a estrutura dos HB reais (modelo:
+data/mapeamento_completo_hb_ref.json): abas de acionamento, status, peças e
+bornes, títulos antes do cabeçalho, cartões de 16/20 canais com linhas em
+branco entre eles, pares A/F de atuadores, pistões abre/fecha,
+despeliculadoras, elevadores, motores e acionamentos reserva. Determinístico
+para a mesma semente
+"""
+
+import random
+from typing import Dict, Iterator, List, Optional
+
+from openpyxl import Workbook
+
+
+# Tamanhos nomeados do benchmark (linhas de I/O)
+SIZES = {
+    '1k': 1_000,
+    '10k': 10_000,
+    '100k': 100_000,
+    '500k': 500_000,
+}
+
+# Fração das linhas de I/O na aba de acionamento (o resto vai para status)
+ACIONAMENTO_FRACTION = 0.75
+
+# CV -> cabo (aba de peças)
+CABOS = {
+    0.5: 'Cabo PP 4x1,5mm²',
+    1.0: 'Cabo PP 4x1,5mm²',
+    2.0: 'Cabo PP 4x1,5mm²',
+    3.0: 'Cabo PP 4x2,5mm²',
+    5.5: 'Cabo PP 4x2,5mm²',
+    7.5: 'Cabo PP 4x4mm²',
+    10.0: 'Cabo PP 4x6mm²',
+    15.0: 'Cabo PP 4x10mm²',
+    20.0: 'Cabo PP 4x16mm²',
+    30.0: 'Cabo PP 4x25mm²',
+}
+
+MOTORES = ['BOMBA', 'ROSCA', 'VENTILADOR', 'EXAUSTOR', 'TRANSPORTADOR', 'REDUTOR']
+
+# Blocos da aba de acionamento e peso de cada um
+ACIONAMENTO_BLOCKS = {
+    'atuador': 30,
+    'motor': 25,
+    'reserva': 12,
+    'pistao': 10,
+    'elevador': 5,
+    'despeliculadora': 5,
+    'inversor': 5,
+    'motor_reserva': 4,
+    'acionamento_reserva': 4,
+}
+
+STATUS_BLOCKS = {
+    'sensor': 45,
+    'fim_de_curso': 30,
+    'elevador_ligado': 10,
+    'reserva': 15,
+}
+
+HEADER_ACIONAMENTO = ['NOMENCLATURA', 'DESCRIÇÃO', 'CARTÃO', 'ANILHA 1', 'ANILHA 2',
+                      'RELE', 'CV', 'BORNE']
+HEADER_STATUS = ['NOMENCLATURA', 'DESCRIÇÃO', 'CARTÃO', 'ANILHA', 'BORNE']
+
+
+def parse_size(text: str) -> int:
+    """Tamanho em linhas: nome do benchmark (10k) ou número (2500, 20k, 1m)"""
+    text = str(text).strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    number = text[:-1] if multiplier > 1 else text
+    try:
+        rows = int(float(number) * multiplier)
+    except ValueError:
+        raise ValueError(f"Tamanho inválido: {text} (ex: 1k, 10k, 2500)")
+    if rows <= 0:
+        raise ValueError(f"Tamanho inválido: {text}")
+    return rows
+
+
+class _Cards:
+    """Cartões de I/O: canal a canal, com linhas em branco entre cartões"""
+
+    def __init__(self, rng: random.Random, painel: str, channels: int, first_card: int):
+        self.rng = rng
+        self.painel = painel
+        self.channels = channels
+        self.card = first_card
+        self.channel = 0
+
+    def next(self) -> Optional[str]:
+        """Anilha do próximo canal; None quando o cartão virou (linha em branco)"""
+        if self.channel == self.channels:
+            self.card += 1
+            self.channel = 0
+            # HB reais têm linhas vazias/títulos entre cartões (ex: linha 16 -> 22)
+            if self.rng.random() < 0.5:
+                return None
+        self.channel += 1
+        return f'{self.painel}-CT-{self.card}.{self.channel}'
+
+
+class SyntheticHB:
+    """
+    Lista de I/O sintética
+
+    Args:
+        rows: Linhas de I/O (acionamento + status)
+        painel: ID do painel (nome das abas e prefixo das anilhas)
+        seed: Semente (mesmo rows/painel/seed = mesmo arquivo)
+    """
+
+    def __init__(self, rows: int, painel: str = '1A', seed: int = 0):
+        self.rows = rows
+        self.painel = painel
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.numbers: Dict[str, int] = {}
+        self.bornes: Dict[str, str] = {}
+        self.relay = 0
+        self._borne = 0
+
+    def _number(self, kind: str) -> int:
+        self.numbers[kind] = self.numbers.get(kind, 0) + 1
+        return self.numbers[kind]
+
+    def _new_borne(self, descricao: str) -> str:
+        # Réguas de borne se repetem a cada 999 posições (aba de bornes limitada)
+        self._borne = self._borne % 999 + 1
+        borne = f'x{self._borne}'
+        self.bornes.setdefault(borne, descricao)
+        return borne
+
+    def _title_rows(self, titulo: str) -> List[List]:
+        """Títulos antes do cabeçalho (deslocamento de 0 a 6 linhas)"""
+        rows = [[f'LISTA DE I/O - {titulo} {self.painel}'], [], ['Cliente: SINTÉTICO'],
+                ['Revisão: 0'], [], ['Gerado para benchmark']]
+        return rows[:self.rng.randint(0, len(rows))]
+
+    def _blocks(self, weights: Dict[str, int]) -> Iterator[str]:
+        names, values = list(weights), list(weights.values())
+        while True:
+            yield self.rng.choices(names, values)[0]
+
+    # ------------------------------------------------------------------
+    # Abas
+    # ------------------------------------------------------------------
+
+    def acionamento_rows(self, count: int) -> Iterator[List]:
+        """Linhas de I/O da aba de acionamento (saídas digitais)"""
+        cards = _Cards(self.rng, self.painel, 16, 1)
+        emitted = 0
+        for block in self._blocks(ACIONAMENTO_BLOCKS):
+            for row in self._acionamento_block(block):
+                anilha = cards.next()
+                if anilha is None:
+                    yield [None] * len(HEADER_ACIONAMENTO)
+                    anilha = cards.next()
+                row[3] = anilha
+                yield row
+                emitted += 1
+                if emitted >= count:
+                    return
+
+    def _acionamento_block(self, block: str) -> List[List]:
+        p = self.painel
+
+        def line(nom, desc, cv=None, borne=None, cartao='16 DO'):
+            self.relay += 1
+            return [nom, desc, cartao, None, f'{p}-ACT-{self.relay}', f'R{self.relay}',
+                    cv, borne or self._new_borne(desc)]
+
+        if block == 'atuador':
+            n = self._number('AT')
+            borne = self._new_borne(f'Atuador {n}')
+            return [line(f'K-AT-{n}A', f'Atuador {n}A', borne=f'{borne}A'),
+                    line(f'K-AT-{n}F', f'Atuador {n}F', borne=f'{borne}B')]
+        if block == 'pistao':
+            n = self._number('PIS')
+            return [line('', f'Pistão {n} abre'), line('', f'Pistão {n} fecha')]
+        if block == 'motor':
+            motor = self.rng.choice(MOTORES)
+            n = self._number(motor)
+            cv = self.rng.choice(list(CABOS))
+            return [line(f'M-{motor[:3]}-{n}', f'{motor.title()} {n}', cv=cv)]
+        if block == 'elevador':
+            n = self._number('EL')
+            return [line(f'M-EL-{n}', f'Elevador {n}', cv=self.rng.choice([3.0, 5.5, 7.5]))]
+        if block == 'despeliculadora':
+            n = self._number('DESP')
+            return [line('', f'Despeliculadora {n}', cv=self.rng.choice([2.0, 3.0]))]
+        if block == 'inversor':
+            n = self._number('E')
+            return [line(f'E-{n}', f'Inversor esteira {n}', cv=self.rng.choice([5.5, 10.0]),
+                         cartao='8 AO')]
+        if block == 'motor_reserva':
+            return [line('', f'Motor reserva {self._number("MT-RES")}')]
+        if block == 'acionamento_reserva':
+            return [line('', f'Acionamento reserva {self._number("ACT-RES")}')]
+        # Canal reserva: cartão e anilha, sem equipamento
+        return [['', 'RESERVA', '16 DO', None, '', '', None, '']]
+
+    def status_rows(self, count: int) -> Iterator[List]:
+        """Linhas de I/O da aba de status (entradas digitais)"""
+        cards = _Cards(self.rng, self.painel, 20, 500)
+        emitted = 0
+        for block in self._blocks(STATUS_BLOCKS):
+            if block == 'sensor':
+                n = self._number('S')
+                row = [f'S-{n}', f'Sensor nível {n}', '20 DI', None, self._new_borne('Sensor')]
+            elif block == 'fim_de_curso':
+                n = self._number('FDC')
+                row = [f'FDC-{n}', '', '20 DI PF', None, self._new_borne('Fim de curso')]
+            elif block == 'elevador_ligado':
+                n = self.rng.randint(1, max(1, self.numbers.get('EL', 1)))
+                row = ['', f'Sensor elevador ligado {n}', '20 DI PF', None,
+                       self._new_borne('Elevador')]
+            else:
+                row = ['', 'RESERVA', '20 DI', None, '']
+
+            anilha = cards.next()
+            if anilha is None:
+                yield [None] * len(HEADER_STATUS)
+                anilha = cards.next()
+            row[3] = anilha
+            yield row
+            emitted += 1
+            if emitted >= count:
+                return
+
+    # ------------------------------------------------------------------
+    # Arquivo
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> Dict[str, int]:
+        """
+        Grava o HB (openpyxl em modo write-only)
+
+        Returns:
+            Linhas de dados por aba
+        """
+        p = self.painel
+        acionamento = int(self.rows * ACIONAMENTO_FRACTION)
+        status = self.rows - acionamento
+        counts = {}
+
+        wb = Workbook(write_only=True)
+
+        ws = wb.create_sheet(f'Acionamento {p}')
+        for row in self._title_rows('ACIONAMENTOS'):
+            ws.append(row)
+        ws.append(HEADER_ACIONAMENTO)
+        counts[ws.title] = 0
+        for row in self.acionamento_rows(acionamento):
+            ws.append(row)
+            counts[ws.title] += row[2] is not None
+
+        ws = wb.create_sheet(f'Status {p}')
+        for row in self._title_rows('STATUS'):
+            ws.append(row)
+        ws.append(HEADER_STATUS)
+        counts[ws.title] = 0
+        for row in self.status_rows(status):
+            ws.append(row)
+            counts[ws.title] += row[2] is not None
+
+        ws = wb.create_sheet(f'Peças CCM {p}')
+        ws.append(['CV', 'CABO', 'DISJUNTOR'])
+        for cv, cabo in CABOS.items():
+            ws.append([cv, cabo, f'DJ-{cv:g}CV'])
+        counts[ws.title] = len(CABOS)
+
+        ws = wb.create_sheet(f'Borne {p}')
+        ws.append(['BORNE', 'DESCRIÇÃO', 'FUSÍVEL'])
+        for index, (borne, descricao) in enumerate(self.bornes.items()):
+            ws.append([borne, descricao, f'F{index % 40 + 1}'])
+        counts[ws.title] = len(self.bornes)
+
+        wb.save(path)
+        return counts
+
+
+def generate_hb(path: str, rows: int, painel: str = '1A', seed: int = 0) -> Dict[str, int]:
+    """Grava um HB sintético com rows linhas de I/O (retorna linhas por aba)"""
+    return SyntheticHB(rows, painel, seed).save(path)
@@ -7,42 +7,91 @@ Autor: J.Cortiça Automação Industrial
 Versão: 2.0 - Sistema Adaptável
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import yaml
+import time
 import argparse
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Union
 from datetime import datetime
 
 # Adiciona diretório src ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.parser.hb_parser import HBParser, IOPoint
+# Só módulos leves no topo: pandas/openpyxl (parser, gerador, validador) e os
+# subcomandos são importados onde são usados, assim --help e erros de
+# argumento não pagam a importação
+from src.config.snapshot import load_config
 from src.transformer.transformers import (
     NomenclaturaTransformer,
     CartaoTransformer,
     CabeamentoTransformer,
     FusivelTransformer
 )
-from src.generator.excel_generator import (
-    PainelExcelGenerator,
-    ValidationReport
-)
+from src.transformer.mapping_store import MappingStore
+from src.generator.output_options import BACKENDS, DERIVED_DESTINATIONS, OUTPUT_PROFILES
+from src.instrumentation.memory import MemoryTracker
+from src.instrumentation.profiling import PROFILE_MODES, ConversionProfiler
+from src.instrumentation.stage_metrics import StageMetrics, StageSections, stage
+from src.instrumentation.tracing import TraceRecorder, write_trace
+
+if TYPE_CHECKING:
+    from src.generator.excel_generator import PainelExcelGenerator, SheetTable
+    from src.parser.hb_parser import HBParser
+    from src.parser.parse_cache import ParseCache
+
+
+@dataclass
+class ConversionResult:
+    """
+    Resultado de PainelConverter.convert_bytes
+    
+    xlsx é None quando a conversão falhou; findings traz as ocorrências da
+    validação e relatorio o mesmo texto do _relatorio.txt da conversão em
+    arquivo.
+    """
+    success: bool
+    xlsx: Optional[bytes] = None
+    painel: str = ''
+    errors: int = 0
+    warnings: int = 0
+    # Ocorrências: code, severity, row, field, subject e mensagem formatada
+    findings: List[Dict] = field(default_factory=list)
+    info: List[str] = field(default_factory=list)
+    # Linhas gravadas por aba
+    linhas: Dict[str, int] = field(default_factory=dict)
+    # Métricas por etapa (StageMetrics.to_dict)
+    metrics: Dict = field(default_factory=dict)
+    relatorio: str = ''
+    
+    def to_dict(self) -> Dict:
+        """Resultado sem o conteúdo do xlsx (serializável em JSON)"""
+        data = asdict(self)
+        data['xlsx'] = len(self.xlsx) if self.xlsx is not None else None
+        return data
 
 
 class PainelConverter:
     """Conversor principal HB -> Painel CCM - Versão Adaptável"""
     
-    def __init__(self, config_path: str = None, reference_file: str = None):
+    def __init__(self, config_path: str = None, reference_file: str = None,
+                 parse_cache: Dict = None):
         """
         Inicializa o conversor
         
         Args:
             config_path: Caminho para arquivo de configuração YAML
             reference_file: Arquivo de referência para aprendizado automático
+            parse_cache: Sobrescreve opções da seção parse_cache (ex: enabled, diretorio)
         """
         self.config = self._load_config(config_path)
+        if parse_cache:
+            self.config['parse_cache'] = {**self.config.get('parse_cache', {}), **parse_cache}
         self.reference_file = reference_file
         self.learned_patterns = None
         
@@ -65,12 +114,59 @@ class PainelConverter:
             self.config.get('fusivel', {})
         )
         
-        # Parser e gerador
+        # Mapeamentos conhecidos (consultados antes das regras)
+        self.mapping_store = self._load_mapping_store()
+        
+        # Parser (com cache das abas decodificadas) e gerador
+        self.parse_cache = self._create_parse_cache()
         self.parser: Optional[HBParser] = None
-        self.generator = PainelExcelGenerator(self.config.get('output', {}))
+        self.generator = self._create_generator()
         
         # Relatório de validação
+        from src.generator.excel_generator import ValidationReport
         self.report = ValidationReport()
+        self._csharp_result = None
+        self.metrics = StageMetrics()
+        
+        # Memória por etapa (--memory-report; tracemalloc deixa a conversão mais lenta)
+        self.memory_report = False
+        self.memory: Optional[MemoryTracker] = None
+    
+    def _create_generator(self) -> PainelExcelGenerator:
+        """Cria o gerador com a seção output e a formatação do patterns.yaml"""
+        from src.generator.excel_generator import PainelExcelGenerator
+        
+        return PainelExcelGenerator({
+            **self.config.get('output', {}),
+            'formatting': self.config.get('formatting', {}),
+        })
+    
+    def _create_parse_cache(self) -> Optional[ParseCache]:
+        """Cache de parsing da seção parse_cache (None se desativado)"""
+        cache_config = self.config.get('parse_cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        from src.parser.parse_cache import ParseCache
+        
+        return ParseCache(
+            cache_config.get('diretorio'),
+            cache_config.get('max_entradas', 16)
+        )
+    
+    def configure_output(self, **options):
+        """
+        Sobrescreve opções da seção output (ex: backend, template) para as
+        próximas conversões
+        
+        Subseções (ex: exports, template) são mescladas com as do patterns.yaml.
+        """
+        output = self.config.setdefault('output', {})
+        for key, value in options.items():
+            if isinstance(value, dict) and isinstance(output.get(key), dict):
+                output[key] = {**output[key], **value}
+            else:
+                output[key] = value
+        self.generator = self._create_generator()
     
     def _learn_patterns(self, reference_file: str) -> Optional[Dict]:
         """Aprende padrões do arquivo de referência"""
@@ -78,10 +174,11 @@ class PainelConverter:
             from src.learning.pattern_learner import PatternLearner
             
             learner = PatternLearner()
-            patterns = learner.learn_from_files(
-                input_file=None,  # Será passado depois
-                reference_path=reference_file
-            )
+            with stage('learn_patterns'):
+                patterns = learner.learn_from_files(
+                    input_file=None,  # Será passado depois
+                    reference_path=reference_file
+                )
             
             # Salvar padrões aprendidos
             learner.save_patterns('config/learned_patterns.yaml')
@@ -97,22 +194,22 @@ class PainelConverter:
             return None
     
     def _load_config(self, config_path: str = None) -> Dict:
-        """Carrega arquivo de configuração"""
-        if config_path and os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        
-        # Tenta carregar configuração padrão
-        default_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            'config', 'patterns.yaml'
-        )
+        """Carrega arquivo de configuração (do snapshot compilado quando válido)"""
+        return load_config(config_path)
+    
+    def _load_mapping_store(self) -> Optional[MappingStore]:
+        """Carrega índice de mapeamentos conhecidos HB -> Referência"""
+        mapeamento_config = self.config.get('mapeamento_conhecido', {})
+        
+        if not mapeamento_config.get('enabled', False):
+            return None
         
-        if os.path.exists(default_path):
-            with open(default_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+        arquivo = mapeamento_config.get('arquivo', 'data/mapeamento_completo_hb_ref.json')
+        if not os.path.isabs(arquivo):
+            arquivo = os.path.join(os.path.dirname(os.path.abspath(__file__)), arquivo)
         
-        return {}
+        store = MappingStore.from_json(arquivo)
+        return store if len(store) else None
     
     def convert(self, 
                 input_file: str, 
@@ -129,51 +226,162 @@ class PainelConverter:
         Returns:
             True se conversão bem sucedida
         """
+        return self._convert(input_file, output_file, info_projeto, input_file)
+    
+    def convert_bytes(self,
+                      input: Union[bytes, BinaryIO],
+                      info_projeto: Dict = None,
+                      filename: str = '') -> ConversionResult:
+        """
+        Converte um HB em memória: lê do buffer e devolve o xlsx em bytes,
+        sem arquivos temporários nem gravação em disco
+        
+        A escrita incremental e as exportações em arquivo ficam desativadas e
+        os backends openpyxl e streaming dão lugar ao native (ver writer_name
+        do gerador).
+        Um conversor atende uma conversão por vez; para uso concorrente no
+        mesmo processo, um conversor por thread.
+        
+        Args:
+            input: Conteúdo do HB (bytes ou arquivo binário aberto)
+            info_projeto: Informações do projeto (opcional)
+            filename: Nome original do arquivo (cliente/projeto extraídos do nome)
+        
+        Returns:
+            ConversionResult com o xlsx e o relatório estruturado
+        """
+        output = BytesIO()
+        success = self._convert(input, output, info_projeto, filename)
+        
+        report = self.report
+        return ConversionResult(
+            success=success,
+            xlsx=output.getvalue() if success else None,
+            painel=self.parser.painel_id if self.parser else '',
+            errors=report.count(report.ERROR),
+            warnings=report.count(report.WARNING),
+            findings=[{**finding._asdict(), 'mensagem': report.format_finding(finding)}
+                      for finding in report.iter_findings()],
+            info=list(report.info),
+            linhas={stat.name: stat.rows for stat in self.generator.sheet_stats} if success else {},
+            metrics=self.metrics.to_dict(),
+            relatorio=self._report_text(),
+        )
+    
+    def _convert(self, source: Union[str, bytes, BinaryIO], output: Union[str, BinaryIO, None],
+                 info_projeto: Optional[Dict], name: str) -> bool:
+        """Conversão com as métricas (e a memória) por etapa"""
+        # Métricas por etapa (recriadas a cada conversão)
+        self.metrics = StageMetrics()
+        self.metrics.meta = {'arquivo': name}
+        self.memory = MemoryTracker() if self.memory_report else None
+        with self.metrics.recording(), (self.memory.recording() if self.memory else nullcontext()):
+            return self._run_conversion(source, output, info_projeto, name)
+    
+    def _run_conversion(self, input_file: Union[str, bytes, BinaryIO],
+                        output_file: Union[str, BinaryIO, None],
+                        info_projeto: Optional[Dict], name: str = '') -> bool:
+        """
+        Etapas da conversão (cada uma medida em self.metrics)
+        
+        Com output_file em memória (buffer) a entrada também está em memória
+        e nada é gravado em disco (nem o relatório).
+        """
+        from src.generator.excel_generator import ValidationReport
+        from src.parser.hb_parser import HBParser
+        
         print("\n" + "=" * 60)
         print("CONVERSOR HB -> PAINEL CCM")
         print("=" * 60)
         
-        # Valida arquivo de entrada
-        if not os.path.exists(input_file):
-            print(f"[ERRO] Arquivo nao encontrado: {input_file}")
-            return False
-        
-        print(f"\n[INPUT] Arquivo de entrada: {input_file}")
-        
-        # Define arquivo de saída
-        if not output_file:
-            base_name = Path(input_file).stem
-            output_file = f"Painel_CCM_Gerado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        # Estado por conversão (o conversor pode ser reutilizado, ex: em lote)
+        self.report = ValidationReport()
+        self._csharp_result = None
+        self.parser = None
+        in_memory = output_file is not None and not isinstance(output_file, str)
         
-        print(f"📄 Arquivo de saída: {output_file}")
+        if in_memory:
+            print(f"\n[INPUT] HB em memória: {name or '(sem nome)'}")
+        else:
+            # Valida arquivo de entrada
+            if not os.path.exists(input_file):
+                print(f"[ERRO] Arquivo nao encontrado: {input_file}")
+                return False
+            
+            print(f"\n[INPUT] Arquivo de entrada: {input_file}")
+            
+            # Define arquivo de saída
+            if not output_file:
+                base_name = Path(input_file).stem
+                output_file = f"Painel_CCM_Gerado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            
+            print(f"📄 Arquivo de saída: {output_file}")
+            self.metrics.meta['saida'] = output_file
         
         # Etapa 1: Parsing
         print("\n[1/4] Carregando e parseando arquivo HB...")
-        self.parser = HBParser(input_file, self.config)
+        self.parser = HBParser(input_file, self.config, cache=self.parse_cache, name=name)
         
-        if not self.parser.load():
+        with stage('load'):
+            loaded = self.parser.load()
+        if not loaded:
+            self.report.add_error(f"Arquivo HB não pôde ser lido: {self.parser.load_error}")
             return False
         
-        sheets = self.parser.parse_all_sheets()
-        print(f"      [OK] {len(sheets)} abas identificadas")
+        with stage('parse') as record:
+            sheets = self.parser.parse_all_sheets()
+            record.rows_out = len(self.parser.get_all_points())
+        print(f"      [OK] {len(sheets)} abas identificadas"
+              f"{' (cache de parsing)' if self.parser.cache_hit else ''}")
         
-        for name, data in sheets.items():
-            print(f"        • {name} ({data.tipo}): {len(data.points)} pontos")
+        for sheet_name, data in sheets.items():
+            print(f"        • {sheet_name} ({data.tipo}): {len(data.points)} pontos")
         
         # Etapa 2: Transformação
         print("\n[2/4] Transformando dados...")
-        acionamentos = self._transform_acionamentos()
-        status = self._transform_status()
+        if self.mapping_store:
+            self.mapping_store.reset_stats()
+        
+        with stage('transform') as record:
+            with stage('transform_acionamentos') as sub:
+                acionamentos = self._transform_acionamentos()
+                sub.rows_out = len(acionamentos)
+            with stage('transform_status') as sub:
+                status = self._transform_status()
+                sub.rows_out = len(status)
+            record.rows_out = len(acionamentos) + len(status)
         
         # Expande acionamentos (gera linhas múltiplas para AT, PIS, etc)
-        acionamentos = self._expand_acionamentos(acionamentos)
+        with stage('expand', rows_in=len(acionamentos)) as record:
+            acionamentos = self._expand_acionamentos(acionamentos)
+            record.rows_out = len(acionamentos)
         
         print(f"      [OK] {len(acionamentos)} acionamentos processados")
         print(f"      [OK] {len(status)} status processados")
         
+        if self.mapping_store:
+            stats = self.mapping_store.get_stats()
+            print(f"      [OK] {stats['caminho_rapido']} linhas por mapeamento conhecido, "
+                  f"{stats['regras']} por regras")
+        
         # Etapa 3: Validação
         print("\n[3/4] Validando dados...")
-        self._validate_data(acionamentos, status)
+        with stage('validate', rows_in=len(acionamentos) + len(status)):
+            self._validate_data(acionamentos, status)
+        
+        # Prepara informações do projeto
+        if not info_projeto:
+            info_projeto = self._extract_project_info()
+        
+        info_projeto['painel'] = self.parser.painel_id
+        
+        # Monta as abas em memória e valida compatibilidade C# antes de gravar
+        with stage('build_tables', rows_in=len(acionamentos) + len(status)) as record:
+            tables = self.generator.build_tables(acionamentos, status, info_projeto)
+            record.rows_out = sum(len(table.rows) for table in tables.values())
+        
+        with stage('validate_csharp', rows_in=record.rows_out):
+            csharp_ok = self._validate_csharp(tables)
         
         if self.report.has_errors():
             print(self.report.get_summary())
@@ -181,30 +389,39 @@ class PainelConverter:
         else:
             print("      [OK] Validação concluída sem erros")
         
+        fail_fast = self.config.get('validation', {}).get('csharp', {}).get('fail_fast', False)
+        if not csharp_ok and fail_fast:
+            print("\n❌ Incompatibilidades com o sistema C#: geração cancelada (fail_fast)")
+            if not in_memory:
+                self._save_report(output_file)
+            return False
+        
         # Etapa 4: Geração
         print("\n[4/4] Gerando arquivo Excel...")
         
-        # Prepara informações do projeto
-        if not info_projeto:
-            info_projeto = self._extract_project_info()
-        
-        info_projeto['painel'] = self.parser.painel_id
-        
-        success = self.generator.generate(
-            acionamentos=acionamentos,
-            status=status,
-            info_projeto=info_projeto,
-            output_path=output_file
-        )
+        with stage('generate') as record:
+            self.generator.add_derived_fields(tables)
+            success = self.generator.write(tables, output_file)
+            record.rows_out = sum(stat.rows for stat in self.generator.sheet_stats) if success else 0
         
-        # Salva relatório
-        report_file = output_file.replace('.xlsx', '_relatorio.txt')
+        if success:
+            if self.generator.incremental_stats:
+                reaproveitadas = self.generator.incremental_stats['reaproveitadas']
+                self.report.add_info(
+                    f"Abas reaproveitadas da geração anterior: {len(reaproveitadas)}"
+                    + (f" ({', '.join(reaproveitadas)})" if reaproveitadas else "")
+                )
+            for line in self.generator.stats_summary():
+                self.report.add_info(line)
+            with stage('verify_output'):
+                self._verify_output(output_file)
+            with stage('export'):
+                self.generator.export(tables, output_file)
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            # Salva relatório de validação
-            f.write(self.report.get_summary())
-        
-        print(f"📋 Relatório salvo em: {report_file}")
+        # Salva relatório (em memória ele volta no ConversionResult)
+        if not in_memory:
+            with stage('report'):
+                self._save_report(output_file)
         
         print("\n" + "=" * 60)
         if success:
@@ -215,16 +432,118 @@ class PainelConverter:
         
         return success
     
+    def _validate_csharp(self, tables: Dict[str, SheetTable]) -> bool:
+        """
+        Valida compatibilidade com o sistema C# sobre as abas em memória
+        
+        Returns:
+            True se não há erros críticos (ou se a validação está desativada)
+        """
+        self._csharp_result = None
+        
+        csharp_config = self.config.get('validation', {}).get('csharp', {})
+        if not csharp_config.get('enabled', True):
+            return True
+        
+        # Abas com os nomes e cabeçalhos que serão gravados (as colunares
+        # são validadas direto do DataFrame)
+        sheets = {
+            table.name: (table.headers, table.frame if table.frame is not None else table.rows)
+            for table in tables.values()
+        }
+        
+        from src.validator.validador_csharp import CSharpCompatibilityValidator
+        
+        validator = CSharpCompatibilityValidator(painel_id=self.parser.painel_id)
+        is_valid, errors, warnings = validator.validate_sheets(sheets)
+        
+        self.report.add_findings('CSHARP', self.report.ERROR, [None] * len(errors), subjects=errors)
+        self.report.add_findings('CSHARP', self.report.WARNING, [None] * len(warnings), subjects=warnings)
+        
+        print(f"      [OK] Compatibilidade C#: {len(errors)} erros, {len(warnings)} avisos")
+        self._csharp_result = (errors, warnings)
+        return is_valid
+    
+    def _verify_output(self, output_file: Union[str, BinaryIO]) -> bool:
+        """
+        Revalida o arquivo gravado e compara com a validação C# em memória
+        
+        Garante que o backend de escrita (openpyxl, streaming, xlsxwriter)
+        produziu um arquivo equivalente às abas validadas.
+        
+        Returns:
+            True se equivalente (ou se a verificação está desativada)
+        """
+        csharp_config = self.config.get('validation', {}).get('csharp', {})
+        if not csharp_config.get('verify_output', False) or self._csharp_result is None:
+            return True
+        
+        from src.validator.validador_csharp import CSharpCompatibilityValidator
+        
+        source = output_file if isinstance(output_file, str) else BytesIO(output_file.getvalue())
+        validator = CSharpCompatibilityValidator(source, painel_id=self.parser.painel_id)
+        _, errors, warnings = validator.validate_all()
+        
+        if (errors, warnings) == self._csharp_result:
+            print(f"      [OK] Arquivo gravado ({self.generator.writer_name}) equivalente às abas validadas")
+            return True
+        
+        self.report.add_error(
+            f"Arquivo gravado pelo backend '{self.generator.writer_name}' difere das abas validadas "
+            f"({len(errors)} erros / {len(warnings)} avisos no arquivo, "
+            f"{len(self._csharp_result[0])} / {len(self._csharp_result[1])} em memória)"
+        )
+        print(f"⚠️  Arquivo gravado ({self.generator.writer_name}) difere das abas validadas")
+        return False
+    
+    def _report_text(self) -> str:
+        """Texto do relatório: validação, desempenho e memória por etapa"""
+        # Relatório de validação
+        text = self.report.get_summary()
+        
+        # Desempenho por etapa (até a gravação do relatório)
+        metrics_lines = self.metrics.summary_lines()
+        if metrics_lines:
+            text += '\n\n' + '\n'.join(metrics_lines) + '\n'
+        
+        # Memória por etapa e maiores alocações (--memory-report)
+        memory_lines = self.memory.summary_lines() if self.memory else []
+        if memory_lines:
+            text += '\n' + '\n'.join(memory_lines) + '\n'
+        return text
+    
+    def _save_report(self, output_file: str):
+        """Salva relatório de validação ao lado do arquivo de saída"""
+        report_file = output_file.replace('.xlsx', '_relatorio.txt')
+        
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(self._report_text())
+        
+        print(f"📋 Relatório salvo em: {report_file}")
+    
     def _transform_acionamentos(self) -> List[Dict]:
         """Transforma pontos de acionamento (DO)"""
         results = []
         
         for point in self.parser.get_points_by_type('DO'):
+            # Caminho rápido: linha com resultado conhecido
+            mapeamento = None
+            if self.mapping_store:
+                mapeamento = self.mapping_store.lookup(
+                    point.nomenclatura,
+                    point.anilha_cartao,
+                    point.anilha_rele
+                )
+            
             # Transforma nomenclatura
-            nom, tipo = self.nom_transformer.transform(
-                point.nomenclatura, 
-                point.descricao
-            )
+            if mapeamento:
+                nom = mapeamento.nomenclatura
+                tipo = self.nom_transformer.identify_type(nom, point.descricao)
+            else:
+                nom, tipo = self.nom_transformer.transform(
+                    point.nomenclatura, 
+                    point.descricao
+                )
             
             # Transforma cartão
             cartao = self.cartao_transformer.transform(point.cartao_raw)
@@ -254,6 +573,7 @@ class PainelConverter:
                 'cabeamento': cabeamento,
                 'fusivel': fusivel,
                 '_row': point.row_index,
+                '_mapeamento': mapeamento,
             })
         
         return results
@@ -297,8 +617,6 @@ class PainelConverter:
         - Motores Reserva (MT-RES-*): Duplica cada linha
         - Despeliculadoras (DESP-*): Gera 3 linhas por despeliculadora
         """
-        import re
-        
         # FILTRO: Remover APENAS cabeçalhos duplicados "NOMENCLATURA"
         # Mantém linhas vazias/sem nomenclatura pois podem ser importantes na estrutura
         acionamentos = [
@@ -306,7 +624,17 @@ class PainelConverter:
             if item.get('nomenclatura') != 'NOMENCLATURA'  # Remove apenas cabeçalhos
         ]
         
+        # Cada grupo da expansão é uma etapa (encerrada mesmo se a expansão falhar)
+        with StageSections('expand_group') as groups:
+            return self._expand_groups(acionamentos, groups)
+    
+    def _expand_groups(self, acionamentos: List[Dict], groups: StageSections) -> List[Dict]:
+        """Agrupa equipamentos por número e expande cada grupo (etapas de groups)"""
+        import re
+        from src.parser.codigos import formatar_anilha, formatar_borne
+        
         # Agrupa equipamentos por número
+        groups.next('agrupamento', rows_in=len(acionamentos))
         atuadores_dict = {}  # {numero: [items]}
         pistoes_dict = {}    # {numero: [items]}
         motores_res_dict = {}  # {numero: [items]}
@@ -458,30 +786,39 @@ class PainelConverter:
         
         # Atuadores expandidos (4 linhas por atuador)
         # Aplica transformações aprendidas: ANILHA e BORNE customizados
+        groups.next('atuadores')
         for num in sorted(atuadores_dict.keys(), key=lambda x: int(x)):
             items = atuadores_dict[num]
             if len(items) >= 2:
                 num_int = int(num)
                 base_item = items[0]
                 
+                # Mapeamentos conhecidos têm prioridade sobre a fórmula
+                conhecidos = {
+                    item['_mapeamento'].descricao: item['_mapeamento']
+                    for item in items if item.get('_mapeamento')
+                }
+                k_at_a = conhecidos.get(f'K-AT-{num}A')
+                k_at_f = conhecidos.get(f'K-AT-{num}F')
+                
                 # K-AT-XA: ANILHA=1A-AT-X.1, BORNE=x{19+X}A
                 expanded.append({
                     **base_item, 
                     'descricao': f'K-AT-{num}A',
-                    'anilha_cartao': f'1A-AT-{num}.1',
-                    'anilha_rele': '',
+                    'anilha_cartao': k_at_a.anilha_cartao if k_at_a else formatar_anilha('1A', 'AT', num, 1),
+                    'anilha_rele': k_at_a.anilha_rele if k_at_a else '',
                     'rele': '',
-                    'borne': f'x{19+num_int}A'
+                    'borne': k_at_a.borne if k_at_a else formatar_borne(19 + num_int, 'A')
                 })
                 
                 # K-AT-XF: ANILHA=1A-AT-X.2, BORNE=x{19+X}B
                 expanded.append({
                     **base_item, 
                     'descricao': f'K-AT-{num}F',
-                    'anilha_cartao': f'1A-AT-{num}.2',
-                    'anilha_rele': '',
+                    'anilha_cartao': k_at_f.anilha_cartao if k_at_f else formatar_anilha('1A', 'AT', num, 2),
+                    'anilha_rele': k_at_f.anilha_rele if k_at_f else '',
                     'rele': '',
-                    'borne': f'x{19+num_int}B'
+                    'borne': k_at_f.borne if k_at_f else formatar_borne(19 + num_int, 'B')
                 })
                 
                 # Atuador X (2 linhas): mantém ANILHA original do item[0] e item[1]
@@ -494,6 +831,7 @@ class PainelConverter:
                 expanded.extend(items)
         
         # Pistões expandidos (3 linhas por pistão)
+        groups.next('pistoes')
         for num in sorted(pistoes_dict.keys(), key=lambda x: int(x)):
             items = pistoes_dict[num]
             if len(items) >= 2:
@@ -505,6 +843,7 @@ class PainelConverter:
                 expanded.extend(items)
         
         # Motores Reserva (2 linhas cada - DM e CONTATOR)
+        groups.next('motores_reserva')
         for num in sorted(motores_res_dict.keys(), key=lambda x: int(x)):
             items = motores_res_dict[num]
             for item in items:
@@ -514,6 +853,7 @@ class PainelConverter:
         # Despeliculadoras - PADRÃO DESCOBERTO AUTOMATICAMENTE
         # DESP-1: 3 base (Desp 1,2,3) + 9 bornes (3 bornes × 3 items) = 12 linhas
         # DESP-2: 2 base (Desp 4, Autorização) + 3 bornes (3 bornes × 1 item) = 5 linhas
+        groups.next('despeliculadoras')
         for num in sorted(desp_dict.keys(), key=lambda x: int(x)):
             items = desp_dict[num]
             if not items:
@@ -549,6 +889,7 @@ class PainelConverter:
         
         # Inversores Porta Carga - PADRÃO DESCOBERTO: 5 linhas (Forno, Máximo, Mínimo, Positivo, Negativo)
         # IMPORTANTE: Apenas expande o PRIMEIRO item, ignorando duplicações vindas de descrições transformadas
+        groups.next('inversores_porta_carga')
         if if_pc_list:
             item = if_pc_list[0]  # Usa apenas o primeiro item real
             expanded.append({**item, 'descricao': '', 'cartao': 'Porta Carga (Forno)'})
@@ -559,6 +900,7 @@ class PainelConverter:
         
         # Inversores Esteira - PADRÃO DESCOBERTO: 3 linhas (Forno, Positivo, Negativo)
         # IMPORTANTE: Apenas expande o PRIMEIRO item, ignorando duplicações vindas de descrições transformadas
+        groups.next('inversores_esteira')
         if if_e_list:
             item = if_e_list[0]  # Usa apenas o primeiro item real
             expanded.append({**item, 'descricao': '', 'cartao': 'Esteira (Forno)'})
@@ -567,6 +909,7 @@ class PainelConverter:
         
         # Elevadores (EL-X) -> Gerar SENS-EL-X automaticamente
         # 2 linhas cada: K-EL-X + Módulo de freio
+        groups.next('elevadores')
         for num in sorted(el_dict.keys(), key=lambda x: int(x)):
             items = el_dict[num]
             if items:
@@ -577,6 +920,7 @@ class PainelConverter:
                                'cartao': f'Módulo de freio do motor (EL-{num})', 'anilha_cartao': '', 'anilha_rele': ''})
         
         # Sensores Elevador - Caso já venham explícitos no HB (raro)
+        groups.next('sensores_elevador')
         for num in sorted(sens_el_dict.keys(), key=lambda x: int(x)):
             items = sens_el_dict[num]
             for item in items:
@@ -588,6 +932,7 @@ class PainelConverter:
         # Acionamento Reserva - PADRÃO DESCOBERTO
         # ACT-RES-1: 6 linhas (Acionamento Reserva 1-6)
         # ACT-RES-2: 2 linhas (Acionamento Reserva 7-8)
+        groups.next('acionamento_reserva')
         for num in sorted(act_res_dict.keys(), key=lambda x: int(x)):
             items = act_res_dict[num]
             if not items:
@@ -603,6 +948,7 @@ class PainelConverter:
                                    'cartao': f'Acionamento Reserva {i}'})
         
         # Inversor Reserva - PADRÃO DESCOBERTO: 3 linhas (base + POSITIVO + NEGATIVO)
+        groups.next('inversor_reserva')
         for num in sorted(if_res_dict.keys(), key=lambda x: int(x)):
             items = if_res_dict[num]
             for item in items:
@@ -611,12 +957,14 @@ class PainelConverter:
                 expanded.append({**item, 'descricao': '', 'cartao': f'Inversor Reserva {num} (NEGATIVO)'})
         
         # Válvula Gás - PADRÃO DESCOBERTO: 2 linhas (mesmo cartão duplicado)
+        groups.next('valvula_gas')
         for item in val_gas_list:
             cartao_base = item.get('cartao', 'Servo Gás Câmara 1')
             expanded.append({**item, 'descricao': '', 'cartao': cartao_base})
             expanded.append({**item, 'descricao': '', 'cartao': cartao_base})
         
         # Autorização Esteira - PADRÃO DESCOBERTO: 3 linhas (Autorização + Borne Saída + Sirene)
+        groups.next('autorizacao_esteira')
         for item in aut_est_list:
             expanded.append({**item, 'descricao': '', 'cartao': 'Autorização Esteira'})
             expanded.append({**item, 'descricao': '', 'cartao': 'Autorização Esteira Borne Saida', 'anilha_cartao': '', 'anilha_rele': ''})
@@ -624,6 +972,7 @@ class PainelConverter:
         
         # Ignição Câmara - PADRÃO DESCOBERTO: 2 linhas (Ignição + Reset)
         # Usa apenas PRIMEIRO item para evitar duplicação
+        groups.next('ignicao_camara')
         for num in sorted(ign_ca_dict.keys(), key=lambda x: int(x)):
             items = ign_ca_dict[num]
             if items:
@@ -632,11 +981,13 @@ class PainelConverter:
                 expanded.append({**item, 'nomenclatura': f'IGN-CA-{num}', 'descricao': '', 'cartao': f'Reset Ignição  Camara {num}'})
         
         # Fotocelula Atuadores - PADRÃO DESCOBERTO: 1 linha mantida
+        groups.next('fotocelula_atuadores')
         for item in ft_at_list:
             expanded.append({**item, 'descricao': '', 'cartao': 'Acionamento Contator da Fonte'})
         
         # Adiciona outros acionamentos (mantém TUDO, inclusive linhas vazias)
         # Apenas remove nomenclaturas específicas que são duplicatas de expansões
+        groups.next('outros')
         outros_limpos = [
             item for item in outros
             if item.get('nomenclatura') not in ['DESP', 'FDC-2']  # Remove apenas duplicatas conhecidas
@@ -646,53 +997,68 @@ class PainelConverter:
         return expanded
     
     def _validate_data(self, acionamentos: List[Dict], status: List[Dict]):
-        """Valida os dados processados"""
-        # Valida acionamentos
-        for item in acionamentos:
-            row = item.get('_row', 0)
-            
+        """Valida os dados processados (regras como máscaras sobre DataFrames)"""
+        import pandas as pd
+        
+        df_acio = pd.DataFrame(
+            acionamentos,
+            columns=['nomenclatura', 'tipo', 'descricao', 'cartao', 'cv', 'cabeamento', '_row']
+        )
+        df_status = pd.DataFrame(status, columns=['nomenclatura', 'descricao', '_row'])
+        
+        def preenchido(series: pd.Series) -> pd.Series:
+            return series.fillna('').astype(bool)
+        
+        def linhas(df: pd.DataFrame, mask: pd.Series):
+            return df.loc[mask, '_row'].fillna(0).astype(int).tolist()
+        
+        def nomenclaturas(df: pd.DataFrame, mask: pd.Series):
+            return df.loc[mask, 'nomenclatura'].astype(str).tolist()
+        
+        # Acionamentos
+        tem_cv = preenchido(df_acio['cv'])
+        regras_acio = [
             # Descrição obrigatória
-            if not item.get('descricao'):
-                self.report.add_error("Descrição vazia", row)
-            
+            ('DESCRICAO_VAZIA', self.report.ERROR, 'descricao',
+             ~preenchido(df_acio['descricao'])),
             # Motor sem CV
-            tipo = item.get('tipo', '').upper()
-            if 'MOTOR' in tipo and not item.get('cv'):
-                self.report.add_warning(
-                    f"Motor '{item.get('nomenclatura')}' sem CV definido", 
-                    row
-                )
-            
+            ('MOTOR_SEM_CV', self.report.WARNING, 'cv',
+             df_acio['tipo'].fillna('').astype(str).str.upper().str.contains('MOTOR') & ~tem_cv),
             # CV sem cabo
-            if item.get('cv') and not item.get('cabeamento'):
-                self.report.add_warning(
-                    f"'{item.get('nomenclatura')}' com CV mas sem cabo definido",
-                    row
-                )
-            
+            ('CV_SEM_CABO', self.report.WARNING, 'cabeamento',
+             tem_cv & ~preenchido(df_acio['cabeamento'])),
             # Cartão não identificado
-            if not item.get('cartao'):
-                self.report.add_warning(
-                    f"'{item.get('nomenclatura')}' sem cartão identificado",
-                    row
+            ('CARTAO_NAO_IDENTIFICADO', self.report.WARNING, 'cartao',
+             ~preenchido(df_acio['cartao'])),
+        ]
+        
+        for code, severity, campo, mask in regras_acio:
+            if mask.any():
+                self.report.add_findings(
+                    code, severity, linhas(df_acio, mask), campo,
+                    nomenclaturas(df_acio, mask)
                 )
         
-        # Valida status
-        for item in status:
-            row = item.get('_row', 0)
-            
-            if not item.get('descricao'):
-                self.report.add_error("Descrição vazia", row)
+        # Status
+        mask = ~preenchido(df_status['descricao'])
+        if mask.any():
+            self.report.add_findings(
+                'DESCRICAO_VAZIA', self.report.ERROR, linhas(df_status, mask), 'descricao'
+            )
         
         # Informações gerais
         self.report.add_info(f"Total de acionamentos: {len(acionamentos)}")
         self.report.add_info(f"Total de status: {len(status)}")
         
+        if self.mapping_store:
+            stats = self.mapping_store.get_stats()
+            self.report.add_info(f"Linhas por mapeamento conhecido: {stats['caminho_rapido']}")
+            self.report.add_info(f"Linhas avaliadas por regras: {stats['regras']}")
+        
         # Nomenclaturas únicas
-        noms = set()
-        for item in acionamentos + status:
-            if item.get('nomenclatura'):
-                noms.add(item['nomenclatura'])
+        noms = set(pd.unique(df_acio['nomenclatura'].dropna()))
+        noms.update(pd.unique(df_status['nomenclatura'].dropna()))
+        noms.discard('')
         self.report.add_info(f"Nomenclaturas únicas: {len(noms)}")
     
     def _extract_project_info(self) -> Dict:
@@ -719,8 +1085,464 @@ class PainelConverter:
         return info
 
 
-def main():
+def _add_project_arguments(parser: argparse.ArgumentParser):
+    """Argumentos de informações do projeto (conversão única e lote)"""
+    parser.add_argument(
+        '--cliente',
+        help='Nome do cliente',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--projeto',
+        help='Nome do projeto',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--local',
+        help='Local da instalação',
+        default=None
+    )
+
+
+def _project_info(args) -> Dict:
+    """Informações do projeto informadas na linha de comando"""
+    info_projeto = {}
+    if args.cliente:
+        info_projeto['cliente'] = args.cliente
+    if args.projeto:
+        info_projeto['nome_projeto'] = args.projeto
+    if args.local:
+        info_projeto['local'] = args.local
+    return info_projeto
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser, files: bool = True):
+    """
+    Argumentos da seção output (conversão única, lote e servidor)
+    
+    Args:
+        files: Inclui as opções que gravam arquivos ao lado da saída
+            (--formats, --incremental, --derived-fields parquet/csv/json);
+            o servidor converte em memória e não as aceita
+    """
+    parser.add_argument(
+        '--backend',
+        help='Backend de escrita do Excel (padrão: output.backend do patterns.yaml)',
+        choices=BACKENDS,
+        default=None
+    )
+    
+    parser.add_argument(
+        '--template',
+        help='Template .xlsx pré-formatado a ser preenchido (abas, estilos e linhas fixas)',
+        default=None
+    )
+    
+    if files:
+        parser.add_argument(
+            '--formats',
+            help='Exportações adicionais ao xlsx, separadas por vírgula: parquet,csv,json',
+            default=None
+        )
+    
+    parser.add_argument(
+        '--derived-fields',
+        metavar='DESTINO',
+        help=('Grava os campos derivados do C# (sheet = aba oculta, parquet, csv ou json)'
+              if files else 'Grava os campos derivados do C# (sheet = aba oculta)'),
+        choices=DERIVED_DESTINATIONS if files else ('sheet',),
+        default=None
+    )
+    
+    parser.add_argument(
+        '--output-profile',
+        help='Perfil de saída: fast (sem bordas, deflate 1), compact (menor arquivo) '
+             'ou pretty (padrão: output.profile do patterns.yaml)',
+        choices=list(OUTPUT_PROFILES),
+        default=None
+    )
+    
+    if files:
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Regrava só as abas alteradas desde a última geração (manifesto <saida>_manifest.json)'
+        )
+    else:
+        parser.set_defaults(formats=None, incremental=False)
+
+
+def _output_options(args) -> Dict:
+    """
+    Opções de saída da linha de comando, no formato de configure_output()
+    
+    Raises:
+        ValueError: formato de exportação desconhecido
+    """
+    from src.generator.columnar_export import parse_formats
+    
+    options = {}
+    if args.backend:
+        options['backend'] = args.backend
+    if args.template:
+        options['template'] = {'enabled': True, 'arquivo': args.template}
+    if args.formats:
+        options['exports'] = {'formats': parse_formats(args.formats)}
+    if args.derived_fields:
+        options['campos_derivados'] = {'enabled': True, 'destino': args.derived_fields}
+    if args.output_profile:
+        options['profile'] = args.output_profile
+    if args.incremental:
+        options['incremental'] = {'enabled': True}
+    return options
+
+
+def batch_main(argv: List[str]) -> int:
+    """Subcomando batch: converte vários arquivos HB com um pool de processos"""
+    parser = argparse.ArgumentParser(
+        prog='main.py batch',
+        description='Conversão em lote HB -> Painel CCM (pool de processos)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  # Todos os HB de um diretório, um processo por núcleo
+  python main.py batch entrada/ -o saida/
+  
+  # Glob, 4 processos, perfil de saída rápido
+  python main.py batch "projetos/**/HB*.xlsx" -o saida/ -j 4 --output-profile fast
+        """
+    )
+    
+    parser.add_argument(
+        'inputs',
+        nargs='+',
+        help='Arquivos HB, diretórios ou globs'
+    )
+    
+    parser.add_argument(
+        '-o', '--output-dir',
+        help='Diretório de saída (Painel_CCM_<arquivo>.xlsx e resumo_lote.json/.txt)',
+        default='saida_lote'
+    )
+    
+    parser.add_argument(
+        '-c', '--config',
+        help='Arquivo de configuração (.yaml)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-r', '--reference',
+        help='Arquivo de referência para aprendizado automático (.xlsx)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        help='Processos do pool (padrão: número de núcleos; 1 = sem pool)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--trace-out',
+        metavar='ARQUIVO',
+        help='Grava os spans do lote em trace-event JSON (chrome://tracing, Perfetto), '
+             'uma trilha por worker',
+        default=None
+    )
+    
+    _add_project_arguments(parser)
+    _add_output_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        output_options = _output_options(args)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
+        return 1
+    
+    from src.batch.batch_converter import BatchConverter, collect_inputs
+    
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("❌ Nenhum arquivo HB encontrado")
+        return 1
+    
+    batch = BatchConverter(
+        PainelConverter,
+        converter_kwargs={'config_path': args.config, 'reference_file': args.reference},
+        output_options=output_options,
+        workers=args.workers,
+        trace=bool(args.trace_out)
+    )
+    
+    print("\n" + "=" * 60)
+    print(f"LOTE HB -> PAINEL CCM: {len(files)} arquivo(s), "
+          f"{min(batch.workers, len(files))} processo(s)")
+    print("=" * 60)
+    
+    def progress(result):
+        status = "OK  " if result.success else "ERRO"
+        print(f"  [{status}] {result.input_file} ({result.seconds:.2f}s)")
+    
+    start = time.perf_counter()
+    recorder = TraceRecorder('main.py batch')
+    with recorder.recording(), stage('batch', rows_in=len(files)):
+        results = batch.run(files, args.output_dir, _project_info(args), on_result=progress)
+    summary = batch.write_summary(results, args.output_dir, time.perf_counter() - start)
+    
+    if args.trace_out:
+        write_trace(args.trace_out, recorder.trace_events()
+                    + [event for result in results for event in result.trace])
+        print(f"🧵 Trace salvo em: {args.trace_out}")
+    
+    failed = sum(1 for r in results if not r.success)
+    print(f"\n{'[OK]' if not failed else '[ERRO]'} {len(results) - failed}/{len(results)} "
+          f"arquivos convertidos em {time.perf_counter() - start:.2f}s")
+    print(f"📋 Resumo do lote: {summary['txt']}")
+    
+    return 0 if not failed else 1
+
+
+def watch_main(argv: List[str]) -> int:
+    """Subcomando watch: reconverte os HB de um diretório quando são alterados"""
+    parser = argparse.ArgumentParser(
+        prog='main.py watch',
+        description='Monitora um diretório e reconverte os HB alterados (pool de processos)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Arquivos salvos várias vezes em sequência são convertidos uma vez, depois de
+ficarem estáveis pelo tempo de --debounce; arquivos regravados sem mudança de
+conteúdo (mesmo hash) não são reconvertidos.
+
+Exemplos de uso:
+  # Painel_CCM_*.xlsx gerados na própria pasta
+  python main.py watch "//servidor/projetos/HB"
+  
+  # Destino separado, 2 processos
+  python main.py watch entrada/ -o saida/ -j 2 --debounce 5
+        """
+    )
+    
+    parser.add_argument(
+        'directory',
+        help='Diretório monitorado'
+    )
+    
+    parser.add_argument(
+        '-o', '--output-dir',
+        help='Diretório de saída (padrão: o diretório monitorado)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-c', '--config',
+        help='Arquivo de configuração (.yaml)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-r', '--reference',
+        help='Arquivo de referência para aprendizado automático (.xlsx)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        help='Processos do pool (padrão: número de núcleos)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=float,
+        help='Intervalo entre varreduras do diretório, em segundos (padrão: 1)',
+        default=1.0
+    )
+    
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        help='Segundos sem alterações antes de converter um arquivo (padrão: 2)',
+        default=2.0
+    )
+    
+    _add_project_arguments(parser)
+    _add_output_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        output_options = _output_options(args)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
+        return 1
+    
+    if not os.path.isdir(args.directory):
+        print(f"❌ Diretório não encontrado: {args.directory}")
+        return 1
+    
+    from src.batch.folder_watcher import FolderWatcher
+    
+    watcher = FolderWatcher(
+        PainelConverter,
+        args.directory,
+        output_dir=args.output_dir,
+        converter_kwargs={'config_path': args.config, 'reference_file': args.reference},
+        output_options=output_options,
+        workers=args.workers,
+        info_projeto=_project_info(args),
+        interval=args.interval,
+        debounce=args.debounce
+    )
+    
+    print(f"👀 Monitorando {args.directory} -> {watcher.output_dir} "
+          f"({watcher.workers} processo(s), Ctrl+C para encerrar)")
+    
+    def converted(result):
+        status = "OK  " if result.success else "ERRO"
+        print(f"  [{status}] {datetime.now():%H:%M:%S} {result.input_file} "
+              f"({result.seconds:.2f}s, {result.errors} erros, {result.warnings} avisos)")
+        if result.message:
+            print(f"         {result.message.splitlines()[-1]}")
+    
+    def unchanged(input_file):
+        print(f"  [=   ] {datetime.now():%H:%M:%S} {input_file} (conteúdo inalterado)")
+    
+    watcher.run(on_result=converted, on_skip=unchanged)
+    return 0
+
+
+def serve_main(argv: List[str]) -> int:
+    """Subcomando serve: servidor de conversão com conversores residentes"""
+    parser = argparse.ArgumentParser(
+        prog='main.py serve',
+        description='Servidor de conversão HB -> Painel CCM (HTTP local ou socket Unix)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Endpoints:
+  POST /convert?cliente=&projeto=&local=&arquivo=   corpo = xlsx HB
+       -> JSON com xlsx (base64), relatorio, erros, avisos, linhas e tempos
+  GET  /metrics   fila, jobs em andamento, latências (média/p50/p95/max)
+  GET  /health
+
+Exemplos de uso:
+  python main.py serve --port 8765 -j 4
+  curl --data-binary @HB.xlsx "http://127.0.0.1:8765/convert?arquivo=HB.xlsx"
+  
+  python main.py serve --unix-socket /tmp/painel.sock
+  curl --unix-socket /tmp/painel.sock http://localhost/metrics
+        """
+    )
+    
+    parser.add_argument(
+        '--host',
+        help='Endereço TCP (padrão: 127.0.0.1)',
+        default='127.0.0.1'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Porta TCP (padrão: 8765)',
+        default=8765
+    )
+    
+    parser.add_argument(
+        '--unix-socket',
+        metavar='CAMINHO',
+        help='Atende num socket Unix em vez de porta TCP',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-c', '--config',
+        help='Arquivo de configuração (.yaml)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-r', '--reference',
+        help='Arquivo de referência para aprendizado automático (.xlsx)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        help='Processos do pool (padrão: número de núcleos)',
+        default=None
+    )
+    
+    # Jobs convertidos em memória: sem exportações em arquivo nem escrita incremental
+    _add_output_arguments(parser, files=False)
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        output_options = _output_options(args)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
+        return 1
+    
+    from src.server.conversion_server import ConversionServer
+    
+    server = ConversionServer(
+        PainelConverter,
+        converter_kwargs={'config_path': args.config, 'reference_file': args.reference},
+        output_options=output_options,
+        workers=args.workers
+    )
+    
+    print(f"⏳ Inicializando {server.workers} worker(s)...")
+    server.warm_up()
+    
+    if args.unix_socket:
+        server.serve_unix(args.unix_socket)
+    else:
+        server.serve_tcp(args.host, args.port)
+    
+    return 0
+
+
+def _write_profile(profiler: ConversionProfiler, converter: PainelConverter, args):
+    """Grava e resume o perfil da conversão (--profile)"""
+    output_file = converter.metrics.meta.get('saida') or args.output or args.input_file
+    base = args.profile_out or f"{os.path.splitext(output_file)[0]}_profile"
+    files = profiler.write(base)
+    
+    print(f"🔬 Perfil ({profiler.mode}, {profiler.seconds:.2f}s) - funções com mais tempo próprio:")
+    for line in profiler.top_functions():
+        print(f"   {line}")
+    print(f"   pstats: {files['pstats']}")
+    print(f"   pilhas colapsadas (flamegraph): {files['collapsed']}")
+    
+    if args.profile_breakdown:
+        lines = profiler.breakdown_lines()
+        breakdown_path = f"{base}_componentes.txt"
+        with open(breakdown_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        print("🔬 Tempo por componente:")
+        for line in lines:
+            print(f"   {line}")
+        print(f"   {breakdown_path}")
+
+
+def main(argv: List[str] = None):
     """Função principal"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'batch':
+        return batch_main(argv[1:])
+    if argv and argv[0] == 'serve':
+        return serve_main(argv[1:])
+    if argv and argv[0] == 'watch':
+        return watch_main(argv[1:])
+    
     parser = argparse.ArgumentParser(
         description='Conversor HB -> Painel CCM - Sistema Adaptável v2.0',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -740,12 +1562,44 @@ Exemplos de uso:
   
   # Com informações do projeto
   python main.py input.xlsx --cliente "Nome Cliente" --projeto "Nome Projeto"
+  
+  # Com backend de escrita específico
+  python main.py input.xlsx --backend xlsxwriter
+  
+  # Métricas por etapa em JSON (também resumidas no _relatorio.txt)
+  python main.py input.xlsx --metrics-out metricas.json
+  
+  # Spans da conversão para chrome://tracing / Perfetto
+  python main.py input.xlsx --trace-out trace.json
+  
+  # Memória por etapa e maiores alocações no _relatorio.txt
+  python main.py input.xlsx --memory-report
+  
+  # Perfil da conversão (pstats + pilhas colapsadas para flamegraph)
+  python main.py input.xlsx --profile sampling --profile-breakdown
+  
+  # Exportar também Parquet e CSV (mesmas colunas do C#)
+  python main.py input.xlsx --formats parquet,csv
+  
+  # Gerar template e preencher a partir dele
+  python main.py --save-template config/template_painel.xlsx --output-profile fast
+  python main.py input.xlsx --template config/template_painel.xlsx
+  
+  # Conversão em lote (ver: python main.py batch --help)
+  python main.py batch entrada/ -o saida/
+  
+  # Servidor de conversão (ver: python main.py serve --help)
+  python main.py serve --port 8765
+  
+  # Reconversão automática dos HB alterados numa pasta (ver: python main.py watch --help)
+  python main.py watch entrada/
         """
     )
     
     parser.add_argument(
         'input_file',
-        help='Arquivo HB de entrada (.xlsx)'
+        nargs='?',
+        help='Arquivo HB de entrada (.xlsx); dispensável com --save-template'
     )
     
     parser.add_argument(
@@ -773,24 +1627,61 @@ Exemplos de uso:
     )
     
     parser.add_argument(
-        '--cliente',
-        help='Nome do cliente',
+        '--save-template',
+        metavar='ARQUIVO',
+        help='Grava um template com a formatação atual e sai',
         default=None
     )
     
     parser.add_argument(
-        '--projeto',
-        help='Nome do projeto',
+        '--metrics-out',
+        metavar='ARQUIVO',
+        help='Grava as métricas por etapa (tempo, CPU, linhas, linhas/s) em JSON',
         default=None
     )
     
     parser.add_argument(
-        '--local',
-        help='Local da instalação',
+        '--trace-out',
+        metavar='ARQUIVO',
+        help='Grava os spans da conversão em trace-event JSON (chrome://tracing, Perfetto)',
         default=None
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--memory-report',
+        action='store_true',
+        help='Registra a memória por etapa (pico e retida via tracemalloc, RSS) e os '
+             'maiores pontos de alocação no _relatorio.txt (conversão mais lenta)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        help='Perfil da conversão: cprofile (determinístico) ou sampling (amostragem, '
+             'menor overhead); grava <saida>_profile.pstats e _profile_collapsed.txt',
+        choices=PROFILE_MODES,
+        default=None
+    )
+    
+    parser.add_argument(
+        '--profile-out',
+        metavar='BASE',
+        help='Prefixo dos arquivos do perfil (padrão: <saida>_profile)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--profile-breakdown',
+        action='store_true',
+        help='Com --profile: tempo por componente (HBParser, transformadores, '
+             'expansão, gerador...) no console e em <base>_componentes.txt'
+    )
+    
+    _add_project_arguments(parser)
+    _add_output_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    if not args.input_file and (args.learn_only or not args.save_template):
+        parser.error('informe o arquivo HB de entrada (input_file)')
     
     # Modo somente aprendizado
     if args.learn_only:
@@ -809,21 +1700,58 @@ Exemplos de uso:
         print(f"   Os padrões serão aplicados automaticamente")
         return 0
     
-    # Prepara informações do projeto
-    info_projeto = {}
-    if args.cliente:
-        info_projeto['cliente'] = args.cliente
-    if args.projeto:
-        info_projeto['nome_projeto'] = args.projeto
-    if args.local:
-        info_projeto['local'] = args.local
+    try:
+        output_options = _output_options(args)
+    except ValueError as e:
+        print(f"❌ Erro: {e}")
+        return 1
     
-    # Executa conversão
-    converter = PainelConverter(
-        config_path=args.config,
-        reference_file=args.reference
-    )
+    # Spans da inicialização (aprendizado) e da conversão (--trace-out)
+    recorder = TraceRecorder('main.py')
+    with (recorder.recording() if args.trace_out else nullcontext()):
+        # Executa conversão
+        with stage('init'):
+            converter = PainelConverter(
+                config_path=args.config,
+                reference_file=args.reference
+            )
+        
+        if output_options:
+            converter.configure_output(**output_options)
+        
+        # Template com a formatação atual (perfil e seção formatting aplicados)
+        if args.save_template:
+            return 0 if converter.generator.save_template(args.save_template) else 1
+        
+        converter.memory_report = args.memory_report
+        
+        with stage('convert', os.path.basename(args.input_file)):
+            if args.profile:
+                profiler = ConversionProfiler(args.profile)
+                success = profiler.run(converter.convert, args.input_file, args.output,
+                                       _project_info(args))
+            else:
+                success = converter.convert(args.input_file, args.output, _project_info(args))
+    
+    if args.profile:
+        _write_profile(profiler, converter, args)
+    
+    if args.trace_out:
+        write_trace(args.trace_out, recorder.trace_events())
+        print(f"🧵 Trace salvo em: {args.trace_out}")
+    
+    if args.metrics_out:
+        converter.metrics.write_json(args.metrics_out)
+        print(f"⏱️  Métricas por etapa salvas em: {args.metrics_out}")
+    
+    peak = converter.memory.peak() if converter.memory else None
+    if peak is not None:
+        print(f"🧠 Pico de memória: {peak.peak / (1024 * 1024):.1f} MB em {peak.label}")
+    
+    return 0 if success else 1
+
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
 
 
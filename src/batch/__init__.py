@@ -0,0 +1,3 @@
+"""
+Módulo Batch - Conversão em lote com pool de processos
+"""
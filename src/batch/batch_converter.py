@@ -0,0 +1,319 @@
+"""
+Conversão em lote de arquivos HB
+Os arquivos (diretório, lista ou glob) são distribuídos num pool de
+processos; cada processo inicializa o PainelConverter uma única vez
+(configuração, regras compiladas, padrões aprendidos) e o reutiliza em
+todos os arquivos que recebe
+"""
+
+import contextlib
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.instrumentation.stage_metrics import stage
+from src.instrumentation.tracing import TraceRecorder
+
+
+# Extensões de arquivo HB aceitas ao varrer diretórios
+HB_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Prefixo dos arquivos gerados (ignorados ao varrer diretórios)
+OUTPUT_PREFIX = 'Painel_CCM_'
+
+# Linhas finais da saída de um arquivo com falha guardadas no resultado
+LOG_TAIL_LINES = 20
+
+
+@dataclass
+class FileResult:
+    """Resultado da conversão de um arquivo do lote"""
+    input_file: str
+    output_file: str
+    success: bool
+    seconds: float
+    errors: int = 0
+    warnings: int = 0
+    linhas: Dict[str, int] = field(default_factory=dict)
+    worker: int = 0
+    message: str = ''
+    # Eventos trace-event do worker (só com trace ativo; fora do resumo)
+    trace: List[Dict] = field(default_factory=list, repr=False)
+
+
+# Conversor do processo (criado uma vez pelo initializer do pool)
+_converter = None
+
+# Spans de cada conversão exportados no resultado (BatchConverter(trace=True))
+_trace = False
+
+
+def _init_worker(factory: Callable, converter_kwargs: Dict, output_options: Dict,
+                 trace: bool = False):
+    """Inicializa o conversor do processo (uma vez por worker)"""
+    global _converter, _trace
+    _trace = trace
+    with contextlib.redirect_stdout(io.StringIO()):
+        _converter = factory(**converter_kwargs)
+        if output_options:
+            _converter.configure_output(**output_options)
+
+
+def _run_job(input_file: str, output_file: str, convert: Callable[[], bool]) -> FileResult:
+    """Roda uma conversão com o conversor do processo (saída do console capturada)"""
+    log = io.StringIO()
+    start = time.perf_counter()
+    recorder = TraceRecorder(f'worker {os.getpid()}') if _trace else None
+
+    try:
+        with contextlib.redirect_stdout(log), \
+                (recorder.recording() if recorder else contextlib.nullcontext()), \
+                stage('convert_file', os.path.basename(input_file)):
+            success = convert()
+    except Exception as e:
+        success = False
+        print(f"❌ {type(e).__name__}: {e}", file=log)
+
+    result = FileResult(
+        input_file=input_file,
+        output_file=output_file,
+        success=bool(success),
+        seconds=time.perf_counter() - start,
+        errors=_converter.report.count(_converter.report.ERROR),
+        warnings=_converter.report.count(_converter.report.WARNING),
+        worker=os.getpid(),
+    )
+    if result.success:
+        result.linhas = {stat.name: stat.rows for stat in _converter.generator.sheet_stats}
+    else:
+        result.message = '\n'.join(log.getvalue().splitlines()[-LOG_TAIL_LINES:])
+    if recorder:
+        result.trace = recorder.trace_events()
+    return result
+
+
+def _convert_file(input_file: str, output_file: str, info_projeto: Dict) -> FileResult:
+    """Converte um arquivo com o conversor do processo"""
+    return _run_job(input_file, output_file,
+                    lambda: _converter.convert(input_file, output_file, dict(info_projeto)))
+
+
+def _convert_bytes(data: bytes, filename: str, info_projeto: Dict) -> Dict:
+    """
+    Converte um HB recebido em memória com o conversor do processo
+    (PainelConverter.convert_bytes, sem arquivos temporários)
+
+    Returns:
+        Dict com result (FileResult), xlsx (bytes ou None), relatorio (texto)
+        e started (instante em que o worker iniciou o job, time.time())
+    """
+    started = time.time()
+    name = os.path.basename(filename or '') or 'entrada.xlsx'
+    if not name.lower().endswith(HB_EXTENSIONS):
+        name += '.xlsx'
+
+    conversion = None
+
+    def convert() -> bool:
+        nonlocal conversion
+        conversion = _converter.convert_bytes(data, dict(info_projeto), filename=name)
+        return conversion.success
+
+    result = _run_job(name, os.path.basename(output_path(name, '')), convert)
+    return {
+        'result': result,
+        'xlsx': conversion.xlsx if conversion else None,
+        'relatorio': conversion.relatorio if conversion else '',
+        'started': started,
+    }
+
+
+def _ping() -> int:
+    """Job vazio (força a criação e inicialização dos workers)"""
+    return os.getpid()
+
+
+def collect_inputs(inputs: Iterable[str]) -> List[str]:
+    """
+    Arquivos HB a converter
+
+    Cada entrada pode ser um arquivo, um diretório (arquivos .xlsx/.xlsm do
+    diretório, exceto temporários do Excel e saídas Painel_CCM_*) ou um glob.
+    """
+    files: List[str] = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for name in sorted(os.listdir(entry)):
+                if (name.lower().endswith(HB_EXTENSIONS)
+                        and not name.startswith(('~$', OUTPUT_PREFIX))):
+                    files.append(os.path.join(entry, name))
+        elif glob.has_magic(entry):
+            files.extend(sorted(glob.glob(entry, recursive=True)))
+        else:
+            files.append(entry)
+
+    return list(dict.fromkeys(os.path.normpath(f) for f in files))
+
+
+def output_path(input_file: str, output_dir: str) -> str:
+    """Arquivo de saída de um HB do lote: <destino>/Painel_CCM_<nome>.xlsx"""
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    return os.path.join(output_dir, f'{OUTPUT_PREFIX}{stem}.xlsx')
+
+
+def output_paths(files: Iterable[str], output_dir: str,
+                 assigned: Dict[str, str] = None) -> Dict[str, str]:
+    """
+    Saídas de vários HB, sem dois arquivos gravando a mesma saída
+
+    output_path() usa só o nome do arquivo: HB de mesmo nome em diretórios
+    diferentes (ou a.xlsx e a.xlsm) cairiam na mesma saída. O primeiro da
+    lista fica com o nome padrão e os seguintes ganham sufixo (_2, _3, ...).
+
+    Args:
+        assigned: Saídas já atribuídas, mantidas como estão (monitoramento)
+
+    Returns:
+        Dict arquivo HB -> arquivo de saída
+    """
+    paths = dict(assigned or {})
+    used = {os.path.normcase(path) for path in paths.values()}
+    for input_file in files:
+        if input_file in paths:
+            continue
+        path = output_path(input_file, output_dir)
+        base, ext = os.path.splitext(path)
+        suffix = 1
+        while os.path.normcase(path) in used:
+            suffix += 1
+            path = f'{base}_{suffix}{ext}'
+        paths[input_file] = path
+        used.add(os.path.normcase(path))
+    return paths
+
+
+class BatchConverter:
+    """
+    Converte vários arquivos HB com um pool de processos
+
+    Args:
+        factory: Classe/função que cria o conversor (ex: PainelConverter)
+        converter_kwargs: Argumentos do conversor (config_path, reference_file)
+        output_options: Opções de saída aplicadas com configure_output()
+        workers: Processos do pool (1 = no próprio processo, sem pool)
+        trace: Devolve os spans de cada conversão em FileResult.trace
+    """
+
+    def __init__(self, factory: Callable, converter_kwargs: Dict = None,
+                 output_options: Dict = None, workers: Optional[int] = None,
+                 trace: bool = False):
+        self.factory = factory
+        self.converter_kwargs = converter_kwargs or {}
+        self.output_options = output_options or {}
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.trace = trace
+
+    def run(self, files: List[str], output_dir: str,
+            info_projeto: Dict = None,
+            on_result: Callable[[FileResult], None] = None) -> List[FileResult]:
+        """
+        Converte os arquivos (resultados na ordem da lista de entrada)
+
+        Args:
+            on_result: Chamado a cada arquivo concluído (ordem de conclusão)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        info_projeto = info_projeto or {}
+        outputs = output_paths(files, output_dir)
+        jobs = list(outputs.items())
+        workers = min(self.workers, len(jobs)) or 1
+
+        results: Dict[str, FileResult] = {}
+
+        if workers == 1:
+            _init_worker(self.factory, self.converter_kwargs, self.output_options, self.trace)
+            for input_file, output_file in jobs:
+                result = _convert_file(input_file, output_file, info_projeto)
+                results[input_file] = result
+                if on_result:
+                    on_result(result)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.factory, self.converter_kwargs, self.output_options, self.trace),
+            ) as pool:
+                futures = {
+                    pool.submit(_convert_file, input_file, output_file, info_projeto): input_file
+                    for input_file, output_file in jobs
+                }
+                for future in as_completed(futures):
+                    input_file = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:  # worker encerrado (ex: falta de memória)
+                        result = FileResult(input_file, outputs[input_file],
+                                            False, 0.0, message=f"{type(e).__name__}: {e}")
+                    results[input_file] = result
+                    if on_result:
+                        on_result(result)
+
+        return [results[f] for f in files]
+
+    def write_summary(self, results: List[FileResult], output_dir: str,
+                      seconds: float) -> Dict[str, str]:
+        """
+        Grava o resumo consolidado do lote (resumo_lote.json e resumo_lote.txt)
+
+        Returns:
+            Dict formato -> caminho do resumo
+        """
+        ok = [r for r in results if r.success]
+        workers = min(self.workers, len(results)) or 1
+        summary = {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'workers': workers,
+            'arquivos': len(results),
+            'sucesso': len(ok),
+            'falhas': len(results) - len(ok),
+            'tempo_total': round(seconds, 3),
+            'tempo_arquivos': round(sum(r.seconds for r in results), 3),
+            'resultados': [
+                {key: value for key, value in asdict(r).items() if key != 'trace'}
+                for r in results
+            ],
+        }
+
+        json_path = os.path.join(output_dir, 'resumo_lote.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        lines = [
+            "=" * 60,
+            "RESUMO DO LOTE",
+            "=" * 60,
+            f"Arquivos: {summary['arquivos']} "
+            f"({summary['sucesso']} convertidos, {summary['falhas']} com falha)",
+            f"Tempo total: {seconds:.2f}s com {workers} processo(s) "
+            f"(soma por arquivo: {summary['tempo_arquivos']:.2f}s)",
+            "",
+        ]
+        for r in results:
+            status = "OK  " if r.success else "ERRO"
+            lines.append(f"[{status}] {r.input_file} -> {r.output_file} "
+                         f"({r.seconds:.2f}s, {r.errors} erros, {r.warnings} avisos)")
+            if r.message:
+                lines.extend(f"       {line}" for line in r.message.splitlines())
+        lines.append("=" * 60)
+
+        txt_path = os.path.join(output_dir, 'resumo_lote.txt')
+        with open(txt_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+        return {'json': json_path, 'txt': txt_path}
@@ -0,0 +1,186 @@
+"""
+Monitoramento de diretório com reconversão incremental
+Varre o diretório periodicamente (funciona também em pastas de rede);
+um HB alterado só é convertido depois de ficar estável pelo tempo de
+debounce, e só se o hash do conteúdo mudou desde a última conversão.
+As conversões usam o pool de processos do lote, com cache de parsing
+compartilhado entre os workers (num diretório local e privado do usuário,
+nunca na pasta monitorada)
+"""
+
+import json
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.batch.batch_converter import (
+    FileResult,
+    _convert_file,
+    _init_worker,
+    collect_inputs,
+    output_paths,
+)
+from src.parser.parse_cache import default_cache_dir, file_digest
+
+
+# Estado do monitoramento (hash do último conteúdo convertido e saída de cada HB)
+WATCH_STATE_FILE = '.watch_state.json'
+
+
+class FolderWatcher:
+    """
+    Reconverte os HB de um diretório quando são alterados
+
+    Args:
+        factory: Classe/função que cria o conversor (ex: PainelConverter)
+        directory: Diretório monitorado
+        output_dir: Destino dos Painel_CCM_*.xlsx (padrão: o próprio diretório)
+        converter_kwargs: Argumentos do conversor (config_path, reference_file)
+        output_options: Opções de saída aplicadas com configure_output()
+        workers: Processos do pool (padrão: número de núcleos)
+        info_projeto: Informações do projeto aplicadas a todos os arquivos
+        interval: Intervalo entre varreduras (segundos)
+        debounce: Tempo sem alterações antes de converter (segundos)
+    """
+
+    def __init__(self, factory: Callable, directory: str, output_dir: str = None,
+                 converter_kwargs: Dict = None, output_options: Dict = None,
+                 workers: Optional[int] = None, info_projeto: Dict = None,
+                 interval: float = 1.0, debounce: float = 2.0):
+        self.directory = directory
+        self.output_dir = output_dir or directory
+        self.info_projeto = info_projeto or {}
+        self.interval = interval
+        self.debounce = debounce
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.state_path = os.path.join(self.output_dir, WATCH_STATE_FILE)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        converter_kwargs = {
+            **(converter_kwargs or {}),
+            'parse_cache': {'enabled': True,
+                            'diretorio': default_cache_dir()},
+        }
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(factory, converter_kwargs, output_options or {}),
+        )
+
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._pending: Dict[str, float] = {}
+        self._running: Dict[Future, Tuple[str, str, str]] = {}
+        state = self._load_state()
+        self._converted: Dict[str, str] = state.get('arquivos', {})
+        # Saída de cada HB (fixa enquanto o arquivo existir; ver output_paths)
+        self._outputs: Dict[str, str] = state.get('saidas', {})
+        self._first_scan = True
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump({'arquivos': self._converted, 'saidas': self._outputs},
+                      f, ensure_ascii=False, indent=2)
+
+    def _scan(self, now: float):
+        """Marca como pendentes os arquivos novos ou com tamanho/data alterados"""
+        files = set(collect_inputs([self.directory]))
+
+        for input_file in files:
+            try:
+                stat = os.stat(input_file)
+            except OSError:
+                continue
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            if self._stamps.get(input_file) != stamp:
+                self._stamps[input_file] = stamp
+                # Na primeira varredura os arquivos já estão estáveis
+                self._pending[input_file] = now - self.debounce if self._first_scan else now
+
+        for input_file in set(self._stamps) - files:
+            del self._stamps[input_file]
+            self._pending.pop(input_file, None)
+
+        # Arquivos novos ganham saída sem tomar a de outro HB de mesmo nome
+        self._outputs = output_paths(
+            sorted(files), self.output_dir,
+            {input_file: path for input_file, path in self._outputs.items() if input_file in files}
+        )
+        self._first_scan = False
+
+    def poll(self, now: float = None) -> Tuple[List[FileResult], List[str]]:
+        """
+        Uma varredura: agenda os arquivos estáveis e coleta as conversões concluídas
+
+        Returns:
+            (resultados concluídos, arquivos ignorados por conteúdo inalterado)
+        """
+        now = time.monotonic() if now is None else now
+        self._scan(now)
+
+        skipped = []
+        busy = {input_file for input_file, _, _ in self._running.values()}
+        for input_file, changed_at in list(self._pending.items()):
+            # Arquivo em conversão volta a ser avaliado quando ela terminar
+            if now - changed_at < self.debounce or input_file in busy:
+                continue
+            try:
+                digest = file_digest(input_file)
+            except OSError:  # ainda bloqueado pelo editor
+                continue
+            del self._pending[input_file]
+
+            output_file = self._outputs[input_file]
+            if self._converted.get(input_file) == digest and os.path.exists(output_file):
+                skipped.append(input_file)
+                continue
+
+            future = self.pool.submit(_convert_file, input_file, output_file, self.info_projeto)
+            self._running[future] = (input_file, output_file, digest)
+
+        results = []
+        for future in [f for f in self._running if f.done()]:
+            input_file, output_file, digest = self._running.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:  # worker encerrado (ex: falta de memória)
+                result = FileResult(input_file, output_file,
+                                    False, 0.0, message=f"{type(e).__name__}: {e}")
+            # Conteúdo com falha só é tentado de novo quando for alterado
+            self._converted[input_file] = digest
+            results.append(result)
+
+        if results:
+            self._save_state()
+
+        return results, skipped
+
+    def run(self, on_result: Callable[[FileResult], None] = None,
+            on_skip: Callable[[str], None] = None):
+        """Monitora até Ctrl+C"""
+        try:
+            while True:
+                results, skipped = self.poll()
+                for input_file in skipped:
+                    if on_skip:
+                        on_skip(input_file)
+                for result in results:
+                    if on_result:
+                        on_result(result)
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("\n⏹️  Monitoramento encerrado")
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Encerra o pool (conversões em andamento são concluídas)"""
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self._running.clear()
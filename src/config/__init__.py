@@ -0,0 +1,3 @@
+"""
+Módulo Config - Carregamento da configuração (patterns.yaml) com snapshot compilado
+"""
@@ -0,0 +1,118 @@
+"""
+Snapshot compilado da configuração
+O YAML é analisado uma vez e a configuração resultante fica gravada em
+pickle (config/.snapshot); as execuções seguintes carregam o pickle enquanto
+o YAML e os arquivos de padrões não mudarem (caminho, mtime e tamanho) e
+nem importam o PyYAML
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configuração padrão do conversor
+DEFAULT_CONFIG = os.path.join(_ROOT, 'config', 'patterns.yaml')
+
+# Diretório dos snapshots (um por arquivo de configuração); PAINEL_SNAPSHOT_DIR
+# troca o diretório (benchmarks sem mexer nos snapshots do usuário)
+SNAPSHOT_DIR = os.environ.get('PAINEL_SNAPSHOT_DIR') or os.path.join(_ROOT, 'config', '.snapshot')
+
+# Arquivos de padrões que também invalidam o snapshot
+PATTERN_FILES = (
+    os.path.join(_ROOT, 'config', 'aprendizado_config.yaml'),
+    os.path.join(_ROOT, 'data', 'padroes_eletricos.json'),
+)
+
+# Muda quando o formato do snapshot muda
+SNAPSHOT_VERSION = 1
+
+Fingerprint = List[Tuple[str, Optional[int], Optional[int]]]
+
+
+def _fingerprint(paths: Iterable[str]) -> Fingerprint:
+    """(caminho, mtime_ns, tamanho) de cada fonte (None se não existe)"""
+    sources = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            sources.append((path, None, None))
+            continue
+        sources.append((path, stat.st_mtime_ns, stat.st_size))
+    return sources
+
+
+def snapshot_path(config_path: str, directory: str = SNAPSHOT_DIR) -> str:
+    """Arquivo do snapshot de uma configuração"""
+    key = hashlib.sha1(os.path.abspath(config_path).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(directory, f'{key}.v{SNAPSHOT_VERSION}.pkl')
+
+
+def _parse_yaml(path: str) -> Dict:
+    import yaml
+
+    # Loader em C (libyaml) quando disponível: mesmo resultado do safe_load
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def _read_snapshot(path: str, sources: Fingerprint) -> Optional[Dict]:
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if (not isinstance(data, dict) or data.get('versao') != SNAPSHOT_VERSION
+            or data.get('fontes') != sources):
+        return None
+    return data['config']
+
+
+def _write_snapshot(path: str, sources: Fingerprint, config: Dict):
+    """Grava o snapshot (em silêncio se o diretório não é gravável)"""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump({'versao': SNAPSHOT_VERSION, 'fontes': sources, 'config': config},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_config(config_path: str = None, directory: Optional[str] = SNAPSHOT_DIR) -> Dict:
+    """
+    Carrega a configuração (config_path ou patterns.yaml padrão)
+
+    Args:
+        config_path: Arquivo YAML (ignorado se não existe, como antes)
+        directory: Diretório dos snapshots (None = sempre lê o YAML)
+
+    Returns:
+        Configuração ({} se não há arquivo)
+    """
+    path = config_path if config_path and os.path.exists(config_path) else DEFAULT_CONFIG
+    if not os.path.exists(path):
+        return {}
+    if directory is None:
+        return _parse_yaml(path)
+
+    # Fontes conferidas antes da leitura: se mudarem no meio, o próximo
+    # carregamento vê outro mtime e lê o YAML de novo
+    path = os.path.abspath(path)
+    sources = _fingerprint((path, *PATTERN_FILES))
+    snapshot = snapshot_path(path, directory)
+
+    config = _read_snapshot(snapshot, sources)
+    if config is None:
+        config = _parse_yaml(path)
+        _write_snapshot(snapshot, sources, config)
+    return config
@@ -0,0 +1,118 @@
+"""
+Exportação das abas em formatos colunares/legíveis por máquina
+Parquet, CSV e JSON gravados a partir das linhas em memória (SheetTable),
+com os mesmos nomes de coluna esperados pelo C#
+"""
+
+import csv
+import json
+import os
+from typing import Dict, Iterable, List
+
+from src.generator.output_options import EXPORT_FORMATS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional (Parquet)
+    pa = None
+    pq = None
+
+
+# Abas exportadas por padrão (chaves de build_tables)
+DEFAULT_TABLES = ('acionamento', 'reconhecimento', 'descricao')
+
+
+def export_path(output_path: str, key: str, fmt: str) -> str:
+    """Caminho do arquivo exportado: <saida>_<aba>.<formato>"""
+    base, _ = os.path.splitext(output_path)
+    return f'{base}_{key}.{fmt}'
+
+
+def parse_formats(value) -> List[str]:
+    """Normaliza lista de formatos ('csv,json' ou ['csv', 'json'])"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    formats = [str(f).strip().lower() for f in value if str(f).strip()]
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Formato(s) desconhecido(s): {', '.join(unknown)} "
+                         f"(disponíveis: {', '.join(EXPORT_FORMATS)})")
+    return list(dict.fromkeys(formats))
+
+
+def export_tables(tables: Dict, output_path: str, formats: Iterable[str],
+                  keys: Iterable[str] = DEFAULT_TABLES,
+                  csv_options: Dict = None) -> Dict[str, List[str]]:
+    """
+    Exporta as abas selecionadas em cada formato
+
+    Returns:
+        Dict formato -> arquivos gravados
+    """
+    written: Dict[str, List[str]] = {}
+
+    for fmt in formats:
+        if fmt == 'parquet' and pa is None:
+            print("⚠️  pyarrow não instalado, exportação Parquet ignorada")
+            continue
+
+        writer = _WRITERS[fmt]
+        for key in keys:
+            table = tables.get(key)
+            if table is None:
+                continue
+            path = export_path(output_path, key, fmt)
+            if fmt == 'csv':
+                writer(table, path, **(csv_options or {}))
+            else:
+                writer(table, path)
+            written.setdefault(fmt, []).append(path)
+
+    return written
+
+
+def write_csv(table, path: str, sep: str = ',', encoding: str = 'utf-8'):
+    """CSV com cabeçalho C#; None -> campo vazio"""
+    with open(path, 'w', newline='', encoding=encoding) as f:
+        writer = csv.writer(f, delimiter=sep)
+        writer.writerow(table.headers)
+        writer.writerows(
+            ['' if value is None else value for value in row] for row in table.rows
+        )
+
+
+def write_json(table, path: str):
+    """JSON: lista de registros {coluna C#: valor}"""
+    headers = list(table.headers)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([dict(zip(headers, row)) for row in table.rows], f,
+                  ensure_ascii=False, default=str)
+
+
+def write_parquet(table, path: str):
+    """Parquet colunar (colunas com tipos mistos gravadas como texto)"""
+    headers = list(table.headers)
+    if table.frame is not None:
+        columns = [table.frame[header] for header in headers]
+    else:
+        columns = list(zip(*table.rows)) if table.rows else [()] * len(headers)
+
+    arrays = []
+    for values in columns:
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else str(v) for v in values],
+                                   type=pa.string()))
+
+    pq.write_table(pa.Table.from_arrays(arrays, names=headers), path)
+
+
+_WRITERS = {
+    'parquet': write_parquet,
+    'csv': write_csv,
+    'json': write_json,
+}
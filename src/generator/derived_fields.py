@@ -0,0 +1,83 @@
+"""
+Campos derivados do C# pré-calculados
+Calcula uma vez, de forma vetorizada, o que o ProjetosEletricosAutomacao
+recalcula a cada carga (GetNumeroCartao, GetSecaoCartao,
+GetNumeroSaidaCartao, IsDigital/IsAnalogic, classificação de página)
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+from src.parser import codigos
+
+
+DERIVED_HEADERS = [
+    'ABA', 'LINHA', 'NOMENCLATURA', 'DESCRICAO', 'ANILHA-CARTAO',
+    'NUMERO-CARTAO', 'SECAO-CARTAO', 'NUMERO-SAIDA', 'NUMERO-SAIDA-CARTAO',
+    'IS-DIGITAL', 'IS-ANALOGIC', 'CONEXAO-DIRETA', 'PAGINA',
+]
+
+# Abas com ANILHA-CARTAO/CARTAO (chave de build_tables -> rótulo na coluna ABA)
+SOURCE_TABLES = {
+    'acionamento': 'Acionamento',
+    'reconhecimento': 'Reconhecimento',
+}
+
+
+def derive_frame(table, aba: str) -> pd.DataFrame:
+    """
+    Campos derivados de uma aba (uma linha por linha da aba, na mesma ordem)
+
+    LINHA é a linha no Excel gerado (cabeçalho = 1).
+    """
+    df = table.frame if table.frame is not None else pd.DataFrame(table.rows, columns=table.headers)
+    text = {
+        col: df[col].fillna('').astype(str) if col in df.columns else pd.Series('', index=df.index)
+        for col in ('NOMENCLATURA', 'DESCRICAO', 'ANILHA-CARTAO', 'CARTAO')
+    }
+
+    anilhas = codigos.anilhas_series(text['ANILHA-CARTAO'])
+    cartoes = codigos.cartoes_series(text['CARTAO'])
+
+    numero_cartao = anilhas['numero_cartao'].where(anilhas['numero_cartao_valido'], '')
+    saida = anilhas['numero_saida'].astype('Int64')
+
+    # GetNumeroSaidaCartao depende do par (cartão, saída): formata só pares distintos
+    pares = pd.MultiIndex.from_arrays([text['CARTAO'], saida])
+    codes, uniques = pd.factorize(pares, sort=False)
+    formatted = pd.Series([
+        codigos.numero_saida_cartao(cartao, None if pd.isna(n) else int(n))
+        for cartao, n in uniques
+    ], dtype=object)
+    saida_cartao = formatted.take(codes)
+    saida_cartao.index = df.index
+
+    return pd.DataFrame({
+        'ABA': aba,
+        'LINHA': df.index + 2,
+        'NOMENCLATURA': text['NOMENCLATURA'],
+        'DESCRICAO': text['DESCRICAO'],
+        'ANILHA-CARTAO': text['ANILHA-CARTAO'],
+        'NUMERO-CARTAO': numero_cartao,
+        'SECAO-CARTAO': anilhas['secao'].astype('Int64'),
+        'NUMERO-SAIDA': saida,
+        'NUMERO-SAIDA-CARTAO': saida_cartao,
+        'IS-DIGITAL': cartoes['digital'],
+        'IS-ANALOGIC': cartoes['analogico'],
+        'CONEXAO-DIRETA': cartoes['conexao_direta'],
+        'PAGINA': codigos.paginas_series(text['NOMENCLATURA']),
+    }, columns=DERIVED_HEADERS)
+
+
+def derive_rows(tables: Dict) -> List[list]:
+    """Linhas da tabela de campos derivados (Acionamento + Reconhecimento)"""
+    frames = [
+        derive_frame(tables[key], aba)
+        for key, aba in SOURCE_TABLES.items() if key in tables
+    ]
+    if not frames:
+        return []
+
+    df = pd.concat(frames, ignore_index=True).astype(object)
+    return df.where(df.notna(), None).values.tolist()
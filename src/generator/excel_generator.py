@@ -3,14 +3,56 @@ Gerador de Excel no formato Painel CCM
 Responsável por criar o arquivo de saída formatado
 """
 
+import os
+import time
+import zipfile
+import numpy as np
+import openpyxl
 import pandas as pd
-from openpyxl import Workbook
+from copy import copy
+from io import BytesIO
+from itertools import chain
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
-from openpyxl.utils.dataframe import dataframe_to_rows
-from typing import Dict, List, Optional
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._writer import WorksheetWriter
+from openpyxl.writer.excel import ExcelWriter
+from typing import (
+    BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple,
+    Union
+)
 from dataclasses import dataclass
 from datetime import datetime
 
+from src.generator import columnar_export, derived_fields, incremental, xlsxwriter_backend
+from src.generator.frame_rows import FrameRows
+from src.generator.output_options import (
+    BACKENDS,
+    DEFAULT_PROFILE,
+    DERIVED_DESTINATIONS,
+    OUTPUT_PROFILES,
+)
+from src.generator.spreadsheetml_writer import SpreadsheetMLWriter
+from src.instrumentation.stage_metrics import stage
+
+
+# Destino da gravação: caminho do xlsx ou arquivo binário em memória (BytesIO)
+Output = Union[str, BinaryIO]
+
+# Versão (major.minor) do openpyxl em que os atalhos sobre atributos internos
+# (ExcelFormatter.cell_factory, _MemoryExcelWriter) foram conferidos
+_OPENPYXL_TESTED = (3, 1)
+
+
+def _openpyxl_tested() -> bool:
+    try:
+        version = tuple(int(part) for part in openpyxl.__version__.split('.')[:2])
+    except ValueError:
+        return False
+    return version == _OPENPYXL_TESTED
+
 
 @dataclass
 class ColumnConfig:
@@ -21,32 +63,42 @@ class ColumnConfig:
 
 
 class ExcelFormatter:
-    """Formatador de estilos do Excel"""
+    """
+    Formatador de estilos do Excel
     
-    def __init__(self, config: Dict = None):
+    Os estilos header_style/data_style são NamedStyles montados a partir da
+    seção `formatting:` do patterns.yaml (sobre os padrões abaixo), registrados
+    uma vez por workbook e aplicados às células pelo nome. O perfil de
+    saída pode remover as bordas por célula (perfil fast).
+    """
+    
+    HEADER_STYLE = 'header_style'
+    DATA_STYLE = 'data_style'
+    
+    # Formatação padrão (sobrescrita pela seção formatting: do patterns.yaml)
+    DEFAULT_FORMATTING = {
+        'header': {
+            'font': {'bold': True, 'color': 'FFFFFF', 'size': 11},
+            'fill': {'color': '366092'},
+            'alignment': {'horizontal': 'center', 'vertical': 'center', 'wrap_text': True},
+            'border': {'style': 'thin', 'color': '000000'},
+        },
+        'data': {
+            'font': {'size': 10},
+            'alignment': {'vertical': 'center'},
+            'border': {'style': 'thin', 'color': '000000'},
+        },
+    }
+    
+    def __init__(self, config: Dict = None, profile: str = DEFAULT_PROFILE):
         self.config = config or {}
+        self.profile = OUTPUT_PROFILES.get(profile, OUTPUT_PROFILES[DEFAULT_PROFILE])
         
-        # Estilos padrão
-        self.header_style = NamedStyle(name='header_style')
-        self.header_style.font = Font(bold=True, color='FFFFFF', size=11)
-        self.header_style.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        self.header_style.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        self.header_style.border = Border(
-            left=Side(style='thin', color='000000'),
-            right=Side(style='thin', color='000000'),
-            top=Side(style='thin', color='000000'),
-            bottom=Side(style='thin', color='000000')
-        )
-        
-        self.data_style = NamedStyle(name='data_style')
-        self.data_style.font = Font(size=10)
-        self.data_style.alignment = Alignment(vertical='center')
-        self.data_style.border = Border(
-            left=Side(style='thin', color='000000'),
-            right=Side(style='thin', color='000000'),
-            top=Side(style='thin', color='000000'),
-            bottom=Side(style='thin', color='000000')
-        )
+        # Estilos padrão (especificação mantida para backends fora do openpyxl)
+        self.header_spec = self._style_spec('header')
+        self.data_spec = self._style_spec('data')
+        self.header_style = self._build_style(self.HEADER_STYLE, self.header_spec)
+        self.data_style = self._build_style(self.DATA_STYLE, self.data_spec)
         
         # Larguras padrão de colunas
         self.column_widths = {
@@ -66,41 +118,110 @@ class ExcelFormatter:
             'INFORMACAO': 20,
             'VALOR': 50,
         }
+        self.column_widths.update({
+            str(col).upper(): width
+            for col, width in self.config.get('column_widths', {}).items()
+        })
+    
+    def _style_spec(self, section: str) -> Dict:
+        """Especificação de um estilo: padrão + seção do patterns.yaml (por atributo)"""
+        spec = {key: dict(value) for key, value in self.DEFAULT_FORMATTING[section].items()}
+        for key, value in (self.config.get(section) or {}).items():
+            spec.setdefault(key, {}).update(value or {})
+        if not self.profile.get('borders', True):
+            spec.pop('border', None)
+        return spec
+    
+    @staticmethod
+    def _build_style(name: str, spec: Dict) -> NamedStyle:
+        """Monta um NamedStyle a partir da especificação (font, fill, alignment, border)"""
+        style = NamedStyle(name=name)
+        
+        if 'font' in spec:
+            style.font = Font(**spec['font'])
+        if spec.get('fill', {}).get('color'):
+            color = spec['fill']['color']
+            style.fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+        if 'alignment' in spec:
+            style.alignment = Alignment(**spec['alignment'])
+        if spec.get('border', {}).get('style'):
+            side = Side(style=spec['border']['style'], color=spec['border'].get('color', '000000'))
+            style.border = Border(left=side, right=side, top=side, bottom=side)
+        
+        return style
+    
+    def register_styles(self, wb):
+        """Registra os NamedStyles no workbook (uma vez por workbook)"""
+        for style in (self.header_style, self.data_style):
+            if style.name not in wb.named_styles:
+                wb.add_named_style(copy(style))
     
     def apply_header_format(self, ws, row_num: int = 1):
         """Aplica formatação aos cabeçalhos"""
+        self.register_styles(ws.parent)
         for cell in ws[row_num]:
-            cell.font = self.header_style.font
-            cell.fill = self.header_style.fill
-            cell.alignment = self.header_style.alignment
-            cell.border = self.header_style.border
+            cell.style = self.HEADER_STYLE
     
     def apply_data_format(self, ws, start_row: int = 2):
         """Aplica formatação às células de dados"""
+        self.register_styles(ws.parent)
         for row in ws.iter_rows(min_row=start_row, max_row=ws.max_row):
             for cell in row:
-                cell.font = self.data_style.font
-                cell.alignment = self.data_style.alignment
-                cell.border = self.data_style.border
+                cell.style = self.DATA_STYLE
     
     def adjust_column_widths(self, ws, columns: List[str] = None):
         """Ajusta largura das colunas"""
         for idx, col in enumerate(ws.columns, 1):
             col_letter = col[0].column_letter
             header_value = ws.cell(row=1, column=idx).value
+            ws.column_dimensions[col_letter].width = self.column_width(
+                header_value, (cell.value for cell in col)
+            )
+    
+    def column_width(self, header, values: Iterable = ()) -> int:
+        """
+        Largura de uma coluna: configurada pelo cabeçalho ou calculada pelo conteúdo
+        
+        Os valores só são percorridos quando o cabeçalho não tem largura configurada.
+        """
+        if header and str(header).upper() in self.column_widths:
+            return self.column_widths[str(header).upper()]
+        
+        max_length = 0
+        for value in values:
+            if value:
+                max_length = max(max_length, len(str(value)))
+        return min(max_length + 2, 50)
+    
+    def cell_factory(self, ws, kind: str = 'data') -> Callable[[object], Cell]:
+        """
+        Fábrica de WriteOnlyCells pré-estilizadas para abas write-only
+        
+        Na versão conferida do openpyxl (_OPENPYXL_TESTED) o estilo
+        (header/data) é resolvido uma única vez por aba e cada célula apenas
+        reaproveita o índice de estilo já registrado (menos da metade do
+        tempo por célula); nas demais, cada célula recebe o NamedStyle pelo
+        nome.
+        """
+        self.register_styles(ws.parent)
+        style = self.HEADER_STYLE if kind == 'header' else self.DATA_STYLE
+        
+        if not _openpyxl_tested():
+            def make_named(value) -> Cell:
+                cell = WriteOnlyCell(ws, value)
+                cell.style = style
+                return cell
             
-            # Usa largura configurada ou calcula automaticamente
-            if header_value and str(header_value).upper() in self.column_widths:
-                width = self.column_widths[str(header_value).upper()]
-            else:
-                # Calcula baseado no conteúdo
-                max_length = 0
-                for cell in col:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                width = min(max_length + 2, 50)
-            
-            ws.column_dimensions[col_letter].width = width
+            return make_named
+        
+        prototype = WriteOnlyCell(ws)
+        prototype.style = style
+        style_array = prototype._style
+        
+        def make(value) -> Cell:
+            return Cell(ws, row=1, column=1, value=value, style_array=style_array)
+        
+        return make
     
     def set_row_height(self, ws, height: int = 20):
         """Define altura das linhas"""
@@ -108,14 +229,150 @@ class ExcelFormatter:
             ws.row_dimensions[row_num].height = height
 
 
+@dataclass
+class SheetTable:
+    """Conteúdo de uma aba de saída (cabeçalhos + linhas em memória)"""
+    name: str
+    headers: List[str]
+    rows: List[list]
+    hidden: bool = False
+    
+    @property
+    def frame(self) -> Optional[pd.DataFrame]:
+        """DataFrame da aba colunar (None quando as linhas são listas)"""
+        return self.rows.frame if isinstance(self.rows, FrameRows) else None
+
+
+class _MemoryExcelWriter(ExcelWriter):
+    """
+    ExcelWriter que serializa as abas em BytesIO: o do openpyxl grava o XML
+    de cada aba num arquivo temporário antes de copiá-lo para o zip
+    
+    Reproduz ExcelWriter.write_worksheet sobre atributos internos do
+    openpyxl; só é usado na versão conferida (_OPENPYXL_TESTED) e apenas
+    pelo template em memória (os backends openpyxl/streaming dão lugar ao
+    native).
+    """
+    
+    def write_worksheet(self, ws):
+        ws._drawing = SpreadsheetDrawing()
+        ws._drawing.charts = ws._charts
+        ws._drawing.images = ws._images
+        writer = WorksheetWriter(ws, out=BytesIO())
+        writer.write()
+        
+        ws._rels = writer._rels
+        self._archive.writestr(ws.path[1:], writer.read())
+        self.manifest.append(ws)
+
+
+class SheetStats(NamedTuple):
+    """Estatísticas de gravação de uma aba"""
+    name: str
+    rows: int
+    seconds: float
+    bytes: int       # tamanho comprimido no xlsx
+    xml_bytes: int   # XML da aba sem compressão
+
+
 class PainelExcelGenerator:
     """Gerador principal do Excel no formato Painel CCM"""
     
+    # Cabeçalhos - EXATAMENTE como C# espera (sem acentos, ANILHA-RELE, FUSIVEL)
+    DESCRICAO_HEADERS = ['NOMENCLATURA', 'DESCRICAO']
+    ACIONAMENTO_HEADERS = [
+        'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO', 
+        'ANILHA-CARTAO', 'ANILHA-RELE', 'RELE', 'CAVALO',
+        'BORNE', 'CABEAMENTO', 'FUSIVEL'
+    ]
+    RECONHECIMENTO_HEADERS = [
+        'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO',
+        'ANILHA-CARTAO', 'BORNE', 'FUSIVEL'
+    ]
+    INFO_ESPECIAIS_HEADERS = ['INFORMACAO', 'VALOR']
+    
+    # Campos dos dicionários de acionamento/status, na ordem das colunas C#
+    ACIONAMENTO_FIELDS = [
+        'nomenclatura', 'tipo', 'descricao', 'cartao',
+        'anilha_cartao', 'anilha_rele', 'rele', 'cv',
+        'borne', 'cabeamento', 'fusivel'
+    ]
+    RECONHECIMENTO_FIELDS = [
+        'nomenclatura', 'tipo', 'descricao', 'cartao',
+        'anilha_cartao', 'borne', 'fusivel'
+    ]
+    
+    # Itens especiais do projeto (páginas fixas)
+    ITENS_ESPECIAIS = [
+        ('CAPA', 'Capa'),
+        ('E-VISAO', 'E-VISAO'),
+        ('I-VISAO', 'I-VISAO'),
+        ('P-NOMENCLATURA', 'P-NOMENCLATURA'),
+        ('COMANDO-1', 'COMANDO-1'),
+        ('COMANDO-2', 'COMANDO-2'),
+        ('COMANDO-3', 'COMANDO-3'),
+        ('COMANDO-4', 'COMANDO-4'),
+    ]
+    
+    # Backends de escrita disponíveis (descritos em output_options)
+    BACKENDS = BACKENDS
+    
     def __init__(self, config: Dict = None):
         self.config = config or {}
-        self.formatter = ExcelFormatter(config.get('formatting', {}))
+        
+        self.profile = self.config.get('profile', DEFAULT_PROFILE)
+        if self.profile not in OUTPUT_PROFILES:
+            print(f"⚠️  Perfil de saída '{self.profile}' desconhecido, usando {DEFAULT_PROFILE}")
+            self.profile = DEFAULT_PROFILE
+        self.profile_options = OUTPUT_PROFILES[self.profile]
+        
+        self.formatter = ExcelFormatter(self.config.get('formatting', {}), self.profile)
         self.wb: Optional[Workbook] = None
         self.painel_id: str = "1A"
+        self._derived_table: Optional[SheetTable] = None
+        
+        self.backend = self.config.get('backend', 'openpyxl')
+        if self.backend not in self.BACKENDS:
+            print(f"⚠️  Backend '{self.backend}' desconhecido, usando openpyxl")
+            self.backend = 'openpyxl'
+        
+        if self.backend == 'xlsxwriter' and not xlsxwriter_backend.is_available():
+            print("⚠️  xlsxwriter não instalado, usando backend streaming")
+            self.backend = 'streaming'
+        
+        # Template pré-formatado (abas, estilos, larguras e linhas fixas)
+        template = self.config.get('template') or {}
+        self.template_path: Optional[str] = (
+            template.get('arquivo') if template.get('enabled', True) else None
+        )
+        
+        # Regeneração incremental (manifesto de hashes por aba ao lado da saída)
+        self.incremental: bool = bool((self.config.get('incremental') or {}).get('enabled', False))
+        self.incremental_stats: Dict[str, List[str]] = {}
+        
+        # Última gravação foi para um buffer (sem arquivos em disco)
+        self.in_memory = False
+        
+        # Estatísticas da última gravação (bytes e tempo por aba)
+        self.sheet_stats: List[SheetStats] = []
+        self.write_seconds: float = 0.0
+        self.write_bytes: int = 0
+    
+    @property
+    def writer_name(self) -> str:
+        """
+        Forma de escrita em uso (template, incremental ou backend)
+        
+        Em memória não há xlsx anterior para a escrita incremental, e os
+        backends openpyxl e streaming (o openpyxl grava o XML das abas em
+        arquivos temporários) dão lugar ao native, que grava as mesmas
+        células direto no zip.
+        """
+        if self.template_path:
+            return 'template'
+        if self.in_memory:
+            return 'native' if self.backend in ('openpyxl', 'streaming') else self.backend
+        return 'incremental' if self.incremental else self.backend
     
     def generate(self, 
                  acionamentos: List[Dict],
@@ -134,53 +391,478 @@ class PainelExcelGenerator:
         Returns:
             True se gerado com sucesso
         """
+        tables = self.build_tables(acionamentos, status, info_projeto)
+        return self.write(tables, output_path)
+    
+    def build_tables(self,
+                     acionamentos: List[Dict],
+                     status: List[Dict],
+                     info_projeto: Dict) -> Dict[str, SheetTable]:
+        """
+        Monta o conteúdo das abas em memória, na ordem de saída
+        
+        Com output.columnar, Acionamento e Reconhecimento são tabelas
+        colunares (DataFrame em FrameRows) em vez de listas de linhas.
+        
+        Returns:
+            Dict ordenado: 'descricao', 'acionamento', 'reconhecimento', 'info_especiais'
+        """
+        self.painel_id = info_projeto.get('painel', '1A')
+        
+        if self.config.get('columnar', False):
+            acionamento_rows = FrameRows(self._acionamento_frame(acionamentos))
+            reconhecimento_rows = FrameRows(self._reconhecimento_frame(status))
+        else:
+            acionamento_rows = self._acionamento_rows(acionamentos)
+            reconhecimento_rows = self._reconhecimento_rows(status)
+        
+        return {
+            'descricao': SheetTable(
+                f'Descrição de Projeto CCM-{self.painel_id}',
+                self.DESCRICAO_HEADERS,
+                self._descricao_rows(acionamentos, status)
+            ),
+            'acionamento': SheetTable(
+                f'Acionamento CCM-{self.painel_id}',
+                self.ACIONAMENTO_HEADERS,
+                acionamento_rows
+            ),
+            'reconhecimento': SheetTable(
+                f'Reconhecimento CCM-{self.painel_id}',
+                self.RECONHECIMENTO_HEADERS,
+                reconhecimento_rows
+            ),
+            'info_especiais': SheetTable(
+                f'Informações Especiais CCM-{self.painel_id}',
+                self.INFO_ESPECIAIS_HEADERS,
+                self._info_especiais_rows(info_projeto)
+            ),
+        }
+    
+    def write(self, tables: Dict[str, SheetTable], output_path: Output) -> bool:
+        """
+        Grava as abas montadas por build_tables() no arquivo de saída
+        
+        Args:
+            output_path: Caminho do xlsx ou buffer binário (ex: BytesIO)
+        
+        Returns:
+            True se gerado com sucesso
+        """
+        self.in_memory = not isinstance(output_path, str)
+        self.incremental_stats = {}
         try:
-            self.wb = Workbook()
-            self.painel_id = info_projeto.get('painel', '1A')
-            
-            # Remove aba padrão
+            start = time.perf_counter()
+            seconds = self._write_tables(tables, output_path)
+            self._record_stats(tables, output_path, seconds, time.perf_counter() - start)
+        except Exception as e:
+            print(f"❌ Erro ao gerar arquivo: {e}")
+            return False
+        
+        detail = ''
+        if self.template_path:
+            detail = f" (template: {self.template_path})"
+        elif self.incremental_stats:
+            detail = (f" ({len(self.incremental_stats['reescritas'])} abas reescritas, "
+                      f"{len(self.incremental_stats['reaproveitadas'])} reaproveitadas)")
+        target = f"em memória ({self.writer_name})" if self.in_memory else output_path
+        print(f"✅ Arquivo gerado com sucesso: {target}{detail}")
+        return True
+    
+    def _write_tables(self, tables: Dict[str, SheetTable], output_path: Output) -> List[float]:
+        """
+        Grava as abas com a forma de escrita configurada
+        
+        Returns:
+            Tempo de gravação de cada aba (segundos, na ordem das abas)
+        """
+        writer_name = self.writer_name
+        if writer_name == 'template':
+            return self._write_from_template(tables, output_path)
+        
+        if writer_name == 'incremental':
+            return self._write_incremental(tables, output_path)
+        
+        if writer_name == 'xlsxwriter':
+            backend = xlsxwriter_backend.XlsxWriterBackend(self.formatter)
+            backend.write(tables, output_path)
+            return backend.sheet_seconds
+        
+        if writer_name == 'native':
+            native = self.config.get('native', {})
+            writer = SpreadsheetMLWriter(
+                self.formatter,
+                shared_strings=self.profile_options.get(
+                    'shared_strings', native.get('shared_strings', True)),
+                compresslevel=self.profile_options.get(
+                    'compresslevel', native.get('compresslevel', 1))
+            )
+            writer.write(tables, output_path)
+            return writer.sheet_seconds
+        
+        streaming = writer_name == 'streaming'
+        self.wb = Workbook(write_only=streaming)
+        
+        # Remove aba padrão (write-only não cria aba padrão)
+        if not streaming:
             default_sheet = self.wb.active
             self.wb.remove(default_sheet)
+        
+        # Cria as abas na ordem correta
+        seconds = []
+        for table in tables.values():
+            start = time.perf_counter()
+            with stage('generate_sheet', table.name, rows_in=len(table.rows)):
+                if streaming:
+                    self._stream_sheet(table)
+                else:
+                    self._write_sheet(table)
+            seconds.append(time.perf_counter() - start)
+        
+        # Salva o arquivo
+        self._save_workbook(output_path)
+        return seconds
+    
+    def _save_workbook(self, output_path: Output):
+        """Salva o workbook openpyxl com o nível de compressão do perfil"""
+        compresslevel = self.profile_options.get('compresslevel')
+        if compresslevel is None and not self.in_memory:
+            self.wb.save(output_path)
+            return
+        
+        writer = ExcelWriter
+        if self.in_memory:
+            if _openpyxl_tested():
+                writer = _MemoryExcelWriter
+            else:
+                print(f"⚠️  openpyxl {openpyxl.__version__} não conferido para gravação em "
+                      f"memória: o XML das abas passa por arquivos temporários")
+        
+        archive = zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED,
+                                  allowZip64=True, compresslevel=compresslevel)
+        writer(self.wb, archive).save()
+    
+    def _record_stats(self, tables: Dict[str, SheetTable], output_path: Output,
+                      seconds: List[float], total: float):
+        """Bytes (comprimidos e XML) e tempo de cada aba gravada"""
+        with zipfile.ZipFile(output_path) as zf:
+            parts = {info.filename: info for info in zf.infolist()}
+        
+        self.sheet_stats = []
+        for idx, table in enumerate(tables.values(), 1):
+            info = parts.get(f'xl/worksheets/sheet{idx}.xml')
+            self.sheet_stats.append(SheetStats(
+                name=table.name,
+                rows=len(table.rows),
+                seconds=seconds[idx - 1] if idx <= len(seconds) else 0.0,
+                bytes=info.compress_size if info else 0,
+                xml_bytes=info.file_size if info else 0,
+            ))
+        
+        self.write_seconds = total
+        if self.in_memory:
+            self.write_bytes = output_path.seek(0, os.SEEK_END)
+        else:
+            self.write_bytes = os.path.getsize(output_path)
+    
+    def stats_summary(self) -> List[str]:
+        """Resumo da última gravação (uma linha por aba) para o relatório"""
+        if not self.sheet_stats:
+            return []
+        
+        pacote = self.write_seconds - sum(stat.seconds for stat in self.sheet_stats)
+        lines = [
+            f"Gravação ({self.writer_name}, perfil {self.profile}): "
+            f"{self.write_bytes / 1024:.1f} KB em {self.write_seconds:.2f}s "
+            f"(pacote/estilos: {max(pacote, 0.0):.2f}s)"
+        ]
+        for stat in self.sheet_stats:
+            lines.append(
+                f"{stat.name}: {stat.rows} linhas, {stat.bytes / 1024:.1f} KB "
+                f"(XML {stat.xml_bytes / 1024:.1f} KB), {stat.seconds:.2f}s"
+            )
+        return lines
+    
+    def _write_sheet(self, table: SheetTable):
+        """Cria uma aba com cabeçalhos, dados e formatação"""
+        ws = self.wb.create_sheet(table.name)
+        if table.hidden:
+            ws.sheet_state = 'hidden'
+        
+        ws.append(table.headers)
+        for row in table.rows:
+            ws.append(row)
+        
+        # Formatação
+        self.formatter.apply_header_format(ws)
+        self.formatter.apply_data_format(ws)
+        self.formatter.adjust_column_widths(ws)
+    
+    def _stream_sheet(self, table: SheetTable):
+        """
+        Grava uma aba write-only: cada célula é criada já formatada e escrita uma vez
+        
+        Larguras vão antes das linhas no XML, então são definidas na criação
+        da aba (o conteúdo só é percorrido para colunas sem largura configurada).
+        """
+        ws = self.wb.create_sheet(table.name)
+        if table.hidden:
+            ws.sheet_state = 'hidden'
+        
+        for idx, header in enumerate(table.headers):
+            values = (row[idx] for row in chain([table.headers], table.rows))
+            ws.column_dimensions[get_column_letter(idx + 1)].width = (
+                self.formatter.column_width(header, values)
+            )
+        
+        header_cell = self.formatter.cell_factory(ws, 'header')
+        data_cell = self.formatter.cell_factory(ws, 'data')
+        
+        ws.append([header_cell(value) for value in table.headers])
+        for row in table.rows:
+            ws.append([data_cell(value) for value in row])
+    
+    def _write_incremental(self, tables: Dict[str, SheetTable], output_path: str) -> List[float]:
+        """
+        Grava só as abas alteradas desde a última geração
+        
+        O hash de cada aba é calculado das linhas em memória e comparado com
+        o manifesto da geração anterior; abas inalteradas têm o XML copiado
+        do xlsx anterior. Usa o escritor native com strings inline, para que
+        o XML de cada aba seja autocontido.
+        """
+        compresslevel = self.profile_options.get(
+            'compresslevel', self.config.get('native', {}).get('compresslevel', 1))
+        signature = incremental.writer_signature(self.formatter, compresslevel)
+        hashes = incremental.table_hashes(tables)
+        reuse = incremental.reusable_parts(
+            tables, incremental.load_manifest(output_path, signature), hashes
+        )
+        
+        # Grava ao lado e substitui: o arquivo anterior é a origem das abas copiadas
+        tmp_path = output_path + '.tmp'
+        writer = SpreadsheetMLWriter(self.formatter, shared_strings=False,
+                                     compresslevel=compresslevel)
+        try:
+            writer.write(tables, tmp_path, reuse=reuse, source=output_path)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        incremental.save_manifest(output_path, signature,
+                                  incremental.sheet_entries(tables, hashes))
+        
+        self.incremental_stats = {
+            'reescritas': [table.name for key, table in tables.items() if key not in reuse],
+            'reaproveitadas': [table.name for key, table in tables.items() if key in reuse],
+        }
+        return writer.sheet_seconds
+    
+    # Destinos dos campos derivados: aba oculta no xlsx ou arquivo ao lado
+    DERIVED_DESTINATIONS = DERIVED_DESTINATIONS
+    
+    def add_derived_fields(self, tables: Dict[str, SheetTable]) -> Optional[SheetTable]:
+        """
+        Calcula os campos derivados do C# (output.campos_derivados)
+        
+        Com destino 'sheet' a tabela é incluída em tables como aba oculta;
+        nos demais destinos é gravada por export().
+        
+        Returns:
+            Tabela de campos derivados (None se desativado)
+        """
+        config = self.config.get('campos_derivados', {})
+        if not config.get('enabled', False):
+            return None
+        
+        table = SheetTable(
+            f'Campos Derivados CCM-{self.painel_id}',
+            derived_fields.DERIVED_HEADERS,
+            derived_fields.derive_rows(tables),
+            hidden=True
+        )
+        
+        if config.get('destino', 'sheet') == 'sheet':
+            tables['campos_derivados'] = table
+        else:
+            self._derived_table = table
+        
+        print(f"      [OK] Campos derivados C#: {len(table.rows)} linhas "
+              f"({config.get('destino', 'sheet')})")
+        return table
+    
+    def export(self, tables: Dict[str, SheetTable], output_path: Output,
+               formats: Sequence[str] = None) -> Dict[str, List[str]]:
+        """
+        Exporta as abas em Parquet/CSV/JSON ao lado do xlsx (mesmas linhas em memória),
+        além dos campos derivados quando o destino deles é um arquivo
+        
+        Args:
+            formats: Formatos (padrão: output.exports.formats do patterns.yaml)
+        
+        Returns:
+            Dict formato -> arquivos gravados (vazio quando a saída é um buffer)
+        """
+        exports = self.config.get('exports', {})
+        formats = columnar_export.parse_formats(
+            formats if formats is not None else exports.get('formats')
+        )
+        
+        # Campos derivados gravados em arquivo (destino != 'sheet')
+        derived, self._derived_table = self._derived_table, None
+        
+        if not isinstance(output_path, str):
+            if formats or derived is not None:
+                print("⚠️  Exportações em arquivo ignoradas na conversão em memória")
+            return {}
+        
+        written = {}
+        try:
+            if formats:
+                written = columnar_export.export_tables(
+                    tables, output_path, formats,
+                    keys=exports.get('tabelas', columnar_export.DEFAULT_TABLES),
+                    csv_options=exports.get('csv')
+                )
+            if derived is not None:
+                fmt = self.config['campos_derivados']['destino']
+                for path in columnar_export.export_tables(
+                    {'campos_derivados': derived}, output_path, [fmt],
+                    keys=['campos_derivados'], csv_options=exports.get('csv')
+                ).get(fmt, []):
+                    written.setdefault(fmt, []).append(path)
+        except Exception as e:
+            print(f"❌ Erro ao exportar: {e}")
+            return {}
+        
+        for fmt, paths in written.items():
+            print(f"✅ Exportado ({fmt}): {', '.join(paths)}")
+        return written
+    
+    # ------------------------------------------------------------------
+    # Template
+    # ------------------------------------------------------------------
+    
+    # Conteúdo dos templates já lidos: caminho -> (mtime, bytes)
+    _template_cache: Dict[str, Tuple[float, bytes]] = {}
+    
+    @classmethod
+    def _template_bytes(cls, path: str) -> bytes:
+        """Conteúdo do template (lido do disco uma vez, relido se modificado)"""
+        key = os.path.abspath(path)
+        mtime = os.path.getmtime(key)
+        
+        cached = cls._template_cache.get(key)
+        if cached is None or cached[0] != mtime:
+            with open(key, 'rb') as f:
+                cached = cls._template_cache[key] = (mtime, f.read())
+        
+        return cached[1]
+    
+    def _write_from_template(self, tables: Dict[str, SheetTable], output_path: Output) -> List[float]:
+        """
+        Preenche uma cópia do template com as abas montadas
+        
+        As abas do template correspondem, na ordem, às abas visíveis de build_tables().
+        Linhas fixas do template (ex: CAPA, COMANDO-1..4, chaves de Informações
+        Especiais) são reconhecidas pela primeira coluna e só têm as células
+        vazias preenchidas; as demais linhas são acrescentadas com data_style.
+        """
+        self.wb = load_workbook(BytesIO(self._template_bytes(self.template_path)))
+        
+        visible = [table for table in tables.values() if not table.hidden]
+        if len(self.wb.worksheets) < len(visible):
+            raise ValueError(
+                f"Template {self.template_path} tem {len(self.wb.worksheets)} abas "
+                f"(esperado: {len(visible)})"
+            )
+        
+        self.formatter.register_styles(self.wb)
+        
+        seconds = {}
+        for ws, table in zip(self.wb.worksheets, visible):
+            start = time.perf_counter()
+            with stage('generate_sheet', table.name, rows_in=len(table.rows)):
+                ws.title = table.name
+                self._fill_sheet(ws, table)
+            seconds[table.name] = time.perf_counter() - start
+        
+        # Abas ocultas (ex: campos derivados) não fazem parte do template
+        for table in tables.values():
+            if table.hidden:
+                start = time.perf_counter()
+                with stage('generate_sheet', table.name, rows_in=len(table.rows)):
+                    self._write_sheet(table)
+                seconds[table.name] = time.perf_counter() - start
+        
+        self._save_workbook(output_path)
+        return [seconds.get(table.name, 0.0) for table in tables.values()]
+    
+    def _fill_sheet(self, ws, table: SheetTable):
+        """Preenche uma aba do template (cabeçalhos devem ser os esperados pelo C#)"""
+        headers = [cell.value for cell in ws[1]][:len(table.headers)]
+        if headers != list(table.headers):
+            raise ValueError(
+                f"Template: cabeçalhos da aba '{table.name}' diferem do esperado "
+                f"({headers} != {table.headers})"
+            )
+        
+        # Linhas fixas do template, indexadas pela primeira coluna
+        fixed = {}
+        for (cell,) in ws.iter_rows(min_row=2, max_col=1):
+            if cell.value not in (None, ''):
+                fixed.setdefault(str(cell.value), cell.row)
+        
+        next_row = ws.max_row + 1
+        for values in table.rows:
+            row_num = fixed.get(str(values[0])) if values and values[0] not in (None, '') else None
             
-            # Cria as abas na ordem correta
-            self._create_descricao_sheet(acionamentos, status, info_projeto.get('paginas_referencia'))
-            self._create_acionamento_sheet(acionamentos)
-            self._create_reconhecimento_sheet(status)
-            self._create_info_especiais_sheet(info_projeto)
+            if row_num is not None:
+                for col, value in enumerate(values, 1):
+                    cell = ws.cell(row=row_num, column=col)
+                    if cell.value in (None, '') and value not in (None, ''):
+                        cell.value = value
+                continue
             
-            # Salva o arquivo
+            for col, value in enumerate(values, 1):
+                cell = ws.cell(row=next_row, column=col, value=value)
+                cell.style = self.formatter.DATA_STYLE
+            next_row += 1
+    
+    def save_template(self, output_path: str) -> bool:
+        """
+        Grava um template com as abas, estilos, larguras e linhas fixas atuais
+        
+        As abas são renomeadas para o painel de cada geração; Informações
+        Especiais traz apenas as chaves (valores preenchidos a cada geração).
+        """
+        painel = self.painel_id
+        tables = [
+            SheetTable(f'Descrição de Projeto CCM-{painel}', self.DESCRICAO_HEADERS,
+                       [[nome, descricao] for nome, descricao in self.ITENS_ESPECIAIS]),
+            SheetTable(f'Acionamento CCM-{painel}', self.ACIONAMENTO_HEADERS, []),
+            SheetTable(f'Reconhecimento CCM-{painel}', self.RECONHECIMENTO_HEADERS, []),
+            SheetTable(f'Informações Especiais CCM-{painel}', self.INFO_ESPECIAIS_HEADERS,
+                       [[key, None] for key, _ in self._info_especiais_rows({})]),
+        ]
+        
+        try:
+            self.wb = Workbook()
+            self.wb.remove(self.wb.active)
+            for table in tables:
+                self._write_sheet(table)
             self.wb.save(output_path)
-            print(f"✅ Arquivo gerado com sucesso: {output_path}")
+            print(f"✅ Template gerado: {output_path}")
             return True
-            
         except Exception as e:
-            print(f"❌ Erro ao gerar arquivo: {e}")
+            print(f"❌ Erro ao gerar template: {e}")
             return False
     
-    def _create_descricao_sheet(self, acionamentos: List[Dict], status: List[Dict], 
-                                   paginas_referencia: Dict[str, int] = None):
-        """Cria aba de Descrição do Projeto"""
-        ws = self.wb.create_sheet(f'Descrição de Projeto CCM-{self.painel_id}')
-        
-        # Cabeçalhos - C# espera exatamente estes nomes
-        headers = ['NOMENCLATURA', 'DESCRICAO']
-        ws.append(headers)
-        
-        # Itens especiais do projeto (páginas fixas)
-        itens_especiais = [
-            ('CAPA', 'Capa'),
-            ('E-VISAO', 'E-VISAO'),
-            ('I-VISAO', 'I-VISAO'),
-            ('P-NOMENCLATURA', 'P-NOMENCLATURA'),
-            ('COMANDO-1', 'COMANDO-1'),
-            ('COMANDO-2', 'COMANDO-2'),
-            ('COMANDO-3', 'COMANDO-3'),
-            ('COMANDO-4', 'COMANDO-4'),
-        ]
-        
+    def _descricao_rows(self, acionamentos: List[Dict], status: List[Dict]) -> List[list]:
+        """Linhas da aba de Descrição do Projeto"""
         # Adiciona itens especiais primeiro
-        for nome, descricao in itens_especiais:
-            ws.append([nome, descricao])
+        rows = [[nome, descricao] for nome, descricao in self.ITENS_ESPECIAIS]
         
         # Coleta nomenclaturas únicas de acionamentos e status
         nomenclaturas = {}
@@ -194,34 +876,21 @@ class PainelExcelGenerator:
         
         # Adiciona nomenclaturas (ordenadas)
         for nom in sorted(nomenclaturas.keys()):
-            descricao = nomenclaturas[nom]
-            ws.append([nom, descricao])
+            rows.append([nom, nomenclaturas[nom]])
         
-        # Formatação
-        self.formatter.apply_header_format(ws)
-        self.formatter.apply_data_format(ws)
-        self.formatter.adjust_column_widths(ws)
+        return rows
     
-    def _create_acionamento_sheet(self, acionamentos: List[Dict]):
-        """Cria aba de Acionamento"""
-        ws = self.wb.create_sheet(f'Acionamento CCM-{self.painel_id}')
-        
-        # Cabeçalhos - EXATAMENTE como C# espera (sem acentos, ANILHA-RELE, FUSIVEL)
-        headers = [
-            'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO', 
-            'ANILHA-CARTAO', 'ANILHA-RELE', 'RELE', 'CAVALO',
-            'BORNE', 'CABEAMENTO', 'FUSIVEL'
-        ]
-        ws.append(headers)
+    def _acionamento_rows(self, acionamentos: List[Dict]) -> List[list]:
+        """Linhas da aba de Acionamento"""
+        rows = []
         
-        # Dados
         for item in acionamentos:
             # CV: converter para número ou deixar vazio (não "")
             cv_val = item.get('cv')
             if cv_val is None or cv_val == '' or (isinstance(cv_val, float) and pd.isna(cv_val)):
                 cv_val = None
             
-            row = [
+            rows.append([
                 item.get('nomenclatura', ''),
                 item.get('tipo') if item.get('tipo') else None,  # TIPO vazio se não definido
                 item.get('descricao', ''),
@@ -233,28 +902,14 @@ class PainelExcelGenerator:
                 item.get('borne', ''),
                 item.get('cabeamento') if item.get('cabeamento') else None,
                 item.get('fusivel', ''),
-            ]
-            ws.append(row)
+            ])
         
-        # Formatação
-        self.formatter.apply_header_format(ws)
-        self.formatter.apply_data_format(ws)
-        self.formatter.adjust_column_widths(ws)
+        return rows
     
-    def _create_reconhecimento_sheet(self, status: List[Dict]):
-        """Cria aba de Reconhecimento (Status/DI)"""
-        ws = self.wb.create_sheet(f'Reconhecimento CCM-{self.painel_id}')
-        
-        # Cabeçalhos - EXATAMENTE como C# espera (sem acentos)
-        headers = [
-            'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO',
-            'ANILHA-CARTAO', 'BORNE', 'FUSIVEL'
-        ]
-        ws.append(headers)
-        
-        # Dados
-        for item in status:
-            row = [
+    def _reconhecimento_rows(self, status: List[Dict]) -> List[list]:
+        """Linhas da aba de Reconhecimento (Status/DI)"""
+        return [
+            [
                 item.get('nomenclatura', ''),
                 item.get('tipo') if item.get('tipo') and item.get('tipo') != 'STATUS' else None,
                 item.get('descricao', ''),
@@ -263,66 +918,167 @@ class PainelExcelGenerator:
                 item.get('borne', ''),
                 item.get('fusivel', ''),
             ]
-            ws.append(row)
-        
-        # Formatação
-        self.formatter.apply_header_format(ws)
-        self.formatter.apply_data_format(ws)
-        self.formatter.adjust_column_widths(ws)
+            for item in status
+        ]
+    
+    # ------------------------------------------------------------------
+    # Abas colunares
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _records_frame(records: List[Dict], fields: List[str]) -> pd.DataFrame:
+        """DataFrame com os campos na ordem das colunas (campo ausente -> '')"""
+        df = pd.DataFrame(records, columns=fields)
+        return df.where(df.notna(), '').astype(object)
     
-    def _create_info_especiais_sheet(self, info_projeto: Dict):
-        """Cria aba de Informações Especiais"""
-        ws = self.wb.create_sheet(f'Informações Especiais CCM-{self.painel_id}')
-        
-        # Cabeçalhos
-        headers = ['INFORMACAO', 'VALOR']
-        ws.append(headers)
-        
-        # Informações padrão
-        info_items = [
-            ('local', info_projeto.get('local', '')),
-            ('cliente', info_projeto.get('cliente', '')),
-            ('nomeprojeto', info_projeto.get('nome_projeto', '')),
-            ('desenhado', info_projeto.get('desenhado', 'Automático')),
-            ('data', datetime.now().strftime('%d/%m/%Y')),
-            ('conferido', info_projeto.get('conferido', '')),
-            ('projeto_pagina', f"Sistema de Acionamento - Painel Centro de Controle de Motores - CCM-{self.painel_id}"),
+    @staticmethod
+    def _none_if_empty(series: pd.Series, mask: pd.Series = None) -> pd.Series:
+        """Valores vazios/falsos (e a máscara opcional) -> None"""
+        empty = ~series.astype(bool)
+        if mask is not None:
+            empty |= mask
+        return series.where(~empty, None)
+    
+    @staticmethod
+    def _numeric_or_none(series: pd.Series) -> pd.Series:
+        """
+        CV como coluna numérica (vazio -> NaN) quando todos os valores são números;
+        com algum texto, mantém os valores originais (vazio -> None)
+        """
+        empty = series.isna() | (series == '')
+        numeric = pd.to_numeric(series.where(~empty, np.nan), errors='coerce')
+        if numeric.notna().sum() == (~empty).sum():
+            return numeric.astype(float)
+        return series.where(~empty, None)
+    
+    def _acionamento_frame(self, acionamentos: List[Dict]) -> pd.DataFrame:
+        """Aba de Acionamento como tabela colunar (mesmos valores de _acionamento_rows)"""
+        df = self._records_frame(acionamentos, self.ACIONAMENTO_FIELDS)
+        df['tipo'] = self._none_if_empty(df['tipo'])
+        df['cabeamento'] = self._none_if_empty(df['cabeamento'])
+        df['cv'] = self._numeric_or_none(df['cv'])
+        df.columns = self.ACIONAMENTO_HEADERS
+        return df
+    
+    def _reconhecimento_frame(self, status: List[Dict]) -> pd.DataFrame:
+        """Aba de Reconhecimento como tabela colunar (mesmos valores de _reconhecimento_rows)"""
+        df = self._records_frame(status, self.RECONHECIMENTO_FIELDS)
+        df['tipo'] = self._none_if_empty(df['tipo'], mask=df['tipo'] == 'STATUS')
+        df.columns = self.RECONHECIMENTO_HEADERS
+        return df
+    
+    def _info_especiais_rows(self, info_projeto: Dict) -> List[list]:
+        """Linhas da aba de Informações Especiais"""
+        return [
+            ['local', info_projeto.get('local', '')],
+            ['cliente', info_projeto.get('cliente', '')],
+            ['nomeprojeto', info_projeto.get('nome_projeto', '')],
+            ['desenhado', info_projeto.get('desenhado', 'Automático')],
+            ['data', datetime.now().strftime('%d/%m/%Y')],
+            ['conferido', info_projeto.get('conferido', '')],
+            ['projeto_pagina', f"Sistema de Acionamento - Painel Centro de Controle de Motores - CCM-{self.painel_id}"],
         ]
-        
-        for key, value in info_items:
-            ws.append([key, value])
-        
-        # Formatação
-        self.formatter.apply_header_format(ws)
-        self.formatter.apply_data_format(ws)
-        self.formatter.adjust_column_widths(ws)
+
+
+class Finding(NamedTuple):
+    """Ocorrência de validação em formato compacto"""
+    code: str
+    severity: str
+    row: Optional[int]
+    field: Optional[str]
+    subject: str = ""
 
 
 class ValidationReport:
-    """Gerador de relatório de validação"""
+    """
+    Gerador de relatório de validação
+    
+    Ocorrências são guardadas como registros (código, severidade, linha, campo)
+    e só viram texto em get_summary(), quando o relatório é renderizado.
+    """
+    
+    ERROR = 'error'
+    WARNING = 'warning'
+    
+    # Código -> modelo da mensagem ({subject} = valor associado à ocorrência)
+    MESSAGES = {
+        'MENSAGEM': "{subject}",
+        'DESCRICAO_VAZIA': "Descrição vazia",
+        'MOTOR_SEM_CV': "Motor '{subject}' sem CV definido",
+        'CV_SEM_CABO': "'{subject}' com CV mas sem cabo definido",
+        'CARTAO_NAO_IDENTIFICADO': "'{subject}' sem cartão identificado",
+        'CSHARP': "[C#] {subject}",
+    }
     
     def __init__(self):
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
+        # Lotes: (código, severidade, campo, linhas, subjects)
+        self._batches: List[Tuple[str, str, Optional[str], List, Optional[List]]] = []
+        self.counts: Dict[str, int] = {}
         self.info: List[str] = []
     
+    def add_findings(self, code: str, severity: str, rows: Sequence,
+                     field: str = None, subjects: Sequence = None):
+        """
+        Adiciona um lote de ocorrências de um mesmo código
+        
+        Args:
+            code: Código da ocorrência (chave de MESSAGES)
+            severity: ValidationReport.ERROR ou ValidationReport.WARNING
+            rows: Linhas de origem (uma por ocorrência)
+            field: Campo validado
+            subjects: Valores usados na mensagem (opcional, um por ocorrência)
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        
+        subjects = list(subjects) if subjects is not None else None
+        self._batches.append((code, severity, field, rows, subjects))
+        self.counts[code] = self.counts.get(code, 0) + len(rows)
+    
     def add_error(self, message: str, row: int = None):
         """Adiciona um erro"""
-        prefix = f"[Linha {row}] " if row else ""
-        self.errors.append(f"{prefix}{message}")
+        self.add_findings('MENSAGEM', self.ERROR, [row], subjects=[message])
     
     def add_warning(self, message: str, row: int = None):
         """Adiciona um aviso"""
-        prefix = f"[Linha {row}] " if row else ""
-        self.warnings.append(f"{prefix}{message}")
+        self.add_findings('MENSAGEM', self.WARNING, [row], subjects=[message])
     
     def add_info(self, message: str):
         """Adiciona uma informação"""
         self.info.append(message)
     
+    def iter_findings(self, severity: str = None) -> Iterator[Finding]:
+        """Itera sobre as ocorrências registradas (opcionalmente filtradas)"""
+        for code, sev, field, rows, subjects in self._batches:
+            if severity and sev != severity:
+                continue
+            for idx, row in enumerate(rows):
+                yield Finding(code, sev, row, field, subjects[idx] if subjects else "")
+    
+    def count(self, severity: str) -> int:
+        """Total de ocorrências de uma severidade"""
+        return sum(len(rows) for _, sev, _, rows, _ in self._batches if sev == severity)
+    
+    def format_finding(self, finding: Finding) -> str:
+        """Formata uma ocorrência como texto"""
+        template = self.MESSAGES.get(finding.code, finding.code)
+        prefix = f"[Linha {finding.row}] " if finding.row else ""
+        return prefix + template.format(subject=finding.subject)
+    
+    @property
+    def errors(self) -> List[str]:
+        """Erros formatados"""
+        return [self.format_finding(f) for f in self.iter_findings(self.ERROR)]
+    
+    @property
+    def warnings(self) -> List[str]:
+        """Avisos formatados"""
+        return [self.format_finding(f) for f in self.iter_findings(self.WARNING)]
+    
     def has_errors(self) -> bool:
         """Verifica se há erros"""
-        return len(self.errors) > 0
+        return self.count(self.ERROR) > 0
     
     def get_summary(self) -> str:
         """Retorna resumo do relatório"""
@@ -332,22 +1088,30 @@ class ValidationReport:
             "=" * 60,
         ]
         
-        if self.errors:
-            lines.append(f"\n❌ ERROS ({len(self.errors)}):")
+        n_errors = self.count(self.ERROR)
+        n_warnings = self.count(self.WARNING)
+        
+        if n_errors:
+            lines.append(f"\n❌ ERROS ({n_errors}):")
             for err in self.errors:
                 lines.append(f"   • {err}")
         
-        if self.warnings:
-            lines.append(f"\n⚠️  AVISOS ({len(self.warnings)}):")
+        if n_warnings:
+            lines.append(f"\n⚠️  AVISOS ({n_warnings}):")
             for warn in self.warnings:
                 lines.append(f"   • {warn}")
         
+        if self.counts:
+            lines.append("\n📊 OCORRÊNCIAS POR CÓDIGO:")
+            for code, total in sorted(self.counts.items(), key=lambda kv: -kv[1]):
+                lines.append(f"   • {code}: {total}")
+        
         if self.info:
             lines.append(f"\nℹ️  INFORMAÇÕES ({len(self.info)}):")
             for inf in self.info:
                 lines.append(f"   • {inf}")
         
-        if not self.errors and not self.warnings:
+        if not n_errors and not n_warnings:
             lines.append("\n✅ Todos os dados validados com sucesso!")
         
         lines.append("\n" + "=" * 60)
@@ -0,0 +1,44 @@
+"""
+Linhas de aba sobre um DataFrame (tabela colunar)
+As colunas ficam nos arrays do DataFrame; escritores com caminho colunar
+(SpreadsheetML nativo, validador, exportações) leem os arrays direto e os
+demais recebem linhas materializadas em blocos, só quando iteram
+"""
+
+from collections.abc import Sequence
+from typing import Iterator, List
+
+import pandas as pd
+
+
+# Linhas materializadas por bloco na iteração
+CHUNK_ROWS = 10000
+
+
+class FrameRows(Sequence):
+    """
+    Sequência de linhas (listas na ordem das colunas) sobre um DataFrame
+
+    Células vazias (NaN/None) viram None nas linhas materializadas,
+    como nas abas montadas linha a linha.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame.reset_index(drop=True)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._materialize(self.frame.iloc[index])
+        return self._materialize(self.frame.iloc[[index]])[0]
+
+    def __iter__(self) -> Iterator[list]:
+        for start in range(0, len(self.frame), CHUNK_ROWS):
+            yield from self._materialize(self.frame.iloc[start:start + CHUNK_ROWS])
+
+    @staticmethod
+    def _materialize(block: pd.DataFrame) -> List[list]:
+        values = block.astype(object)
+        return values.where(block.notna(), None).values.tolist()
@@ -0,0 +1,141 @@
+"""
+Regeneração incremental do xlsx
+Manifesto com o hash do conteúdo de cada aba, gravado ao lado da saída;
+na execução seguinte só as abas alteradas são serializadas e as demais têm
+o XML copiado do arquivo anterior, no nível do zip
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict
+
+import pandas as pd
+
+
+MANIFEST_VERSION = 1
+
+# Linhas serializadas por atualização do hash
+_CHUNK_ROWS = 1000
+
+
+def manifest_path(output_path: str) -> str:
+    """Caminho do manifesto: <saida>_manifest.json"""
+    base, _ = os.path.splitext(output_path)
+    return f'{base}_manifest.json'
+
+
+def writer_signature(formatter, compresslevel: int) -> str:
+    """
+    Assinatura do que não está nas linhas mas muda o XML das abas
+    (estilos, larguras configuradas, forma de escrita)
+
+    Manifesto com assinatura diferente invalida todas as abas.
+    """
+    payload = json.dumps({
+        'version': MANIFEST_VERSION,
+        'writer': 'native-inline',
+        'header': formatter.header_spec,
+        'data': formatter.data_spec,
+        'column_widths': formatter.column_widths,
+        'compresslevel': compresslevel,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def table_hash(table, selected: bool = False) -> str:
+    """Hash do conteúdo de uma aba (nome, visibilidade, cabeçalhos e linhas)"""
+    digest = hashlib.sha256()
+    digest.update(repr((table.name, table.hidden, selected, list(table.headers))).encode('utf-8'))
+
+    # Aba colunar: hash vetorizado por linha, sem materializar as linhas
+    if table.frame is not None:
+        row_hashes = pd.util.hash_pandas_object(table.frame, index=False)
+        digest.update(row_hashes.to_numpy().tobytes())
+        digest.update(repr(table.frame.dtypes.tolist()).encode('utf-8'))
+        return digest.hexdigest()
+
+    chunk = []
+    for row in table.rows:
+        chunk.append(repr(row))
+        if len(chunk) >= _CHUNK_ROWS:
+            digest.update('\n'.join(chunk).encode('utf-8'))
+            chunk = []
+    if chunk:
+        digest.update('\n'.join(chunk).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def _file_stamp(path: str) -> Dict:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_manifest(output_path: str, signature: str) -> Dict[str, Dict]:
+    """
+    Abas do manifesto anterior que ainda descrevem o arquivo em disco
+
+    Retorna vazio se não há manifesto, se o arquivo de saída foi alterado
+    depois da geração (ex: salvo pelo Excel) ou se a assinatura mudou.
+    """
+    path = manifest_path(output_path)
+    if not os.path.exists(path) or not os.path.exists(output_path):
+        return {}
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if (manifest.get('version') != MANIFEST_VERSION
+            or manifest.get('signature') != signature
+            or manifest.get('arquivo') != _file_stamp(output_path)):
+        return {}
+
+    return manifest.get('abas', {})
+
+
+def save_manifest(output_path: str, signature: str, sheets: Dict[str, Dict]):
+    """Grava o manifesto do arquivo recém-gerado"""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'signature': signature,
+        'arquivo': _file_stamp(output_path),
+        'abas': sheets,
+    }
+    with open(manifest_path(output_path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def reusable_parts(tables: Dict, previous: Dict[str, Dict],
+                   hashes: Dict[str, str]) -> Dict[str, str]:
+    """Abas inalteradas: chave da aba -> parte do zip anterior com o mesmo conteúdo"""
+    reuse = {}
+    for key in tables:
+        entry = previous.get(key)
+        if entry and entry.get('hash') == hashes[key] and entry.get('parte'):
+            reuse[key] = entry['parte']
+    return reuse
+
+
+def sheet_entries(tables: Dict, hashes: Dict[str, str]) -> Dict[str, Dict]:
+    """Entradas do manifesto (na ordem das abas: sheet1.xml, sheet2.xml, ...)"""
+    return {
+        key: {
+            'nome': table.name,
+            'hash': hashes[key],
+            'parte': f'xl/worksheets/sheet{idx}.xml',
+        }
+        for idx, (key, table) in enumerate(tables.items(), 1)
+    }
+
+
+def table_hashes(tables: Dict) -> Dict[str, str]:
+    """Hash de cada aba (a primeira é a selecionada no workbook)"""
+    return {
+        key: table_hash(table, selected=idx == 1)
+        for idx, (key, table) in enumerate(tables.items(), 1)
+    }
+
@@ -0,0 +1,30 @@
+"""
+Opções da seção output aceitas pelo gerador e pela linha de comando
+Sem dependências: a CLI monta os argumentos (--help, erros de argumento)
+sem carregar pandas/openpyxl
+"""
+
+
+# Perfis de saída (output.profile / --output-profile)
+# - fast: sem bordas por célula, deflate nível 1 (gravação mais rápida)
+# - compact: estilos e strings compartilhados, compressão máxima (menor arquivo)
+# - pretty: formatação completa e compressão padrão de cada backend
+OUTPUT_PROFILES = {
+    'fast': {'borders': False, 'compresslevel': 1},
+    'compact': {'borders': True, 'compresslevel': 9, 'shared_strings': True},
+    'pretty': {'borders': True},
+}
+DEFAULT_PROFILE = 'pretty'
+
+# Backends de escrita disponíveis
+# - openpyxl: workbook completo em memória, formatação aplicada depois
+# - streaming: workbook write-only, células pré-estilizadas gravadas uma vez
+# - xlsxwriter: xlsxwriter em modo constant_memory (dependência opcional)
+# - native: XML das abas gravado direto no zip (SpreadsheetMLWriter)
+BACKENDS = ('openpyxl', 'streaming', 'xlsxwriter', 'native')
+
+# Formatos das exportações adicionais (columnar_export)
+EXPORT_FORMATS = ('parquet', 'csv', 'json')
+
+# Destinos dos campos derivados: aba oculta ou arquivo exportado
+DERIVED_DESTINATIONS = ('sheet',) + EXPORT_FORMATS
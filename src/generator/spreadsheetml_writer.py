@@ -0,0 +1,482 @@
+"""
+Escritor SpreadsheetML nativo (xlsx mínimo)
+O layout de saída é fixo (abas, cabeçalhos e dois estilos conhecidos), então
+o XML das abas é gerado diretamente no zip, com índices de estilo
+pré-calculados e tabela de strings compartilhadas
+"""
+
+import math
+import re
+import shutil
+import time
+import zipfile
+from contextlib import nullcontext
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+from src.generator.frame_rows import FrameRows
+from src.instrumentation.stage_metrics import stage
+
+
+# Índices de estilo (cellXfs) gravados em styles.xml
+XF_DEFAULT = 0
+XF_HEADER = 1
+XF_DATA = 2
+
+# Bloco de cópia de partes reaproveitadas de um xlsx anterior
+COPY_BUFFER = 1 << 20
+
+# Linhas serializadas por bloco no caminho colunar (DataFrame)
+FRAME_CHUNK_ROWS = 50000
+
+# Caracteres de controle não permitidos em XML 1.0
+_ILLEGAL_XML_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{shared_strings}{sheets}'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+)
+
+# Equivalência de estilos de borda (mesmos nomes no openpyxl e no OOXML)
+_BORDER_SIDES = ('left', 'right', 'top', 'bottom')
+
+
+def _argb(color) -> str:
+    """Cor RRGGBB/AARRGGBB -> AARRGGBB"""
+    color = str(color).lstrip('#').upper()
+    return color if len(color) == 8 else 'FF' + color[-6:]
+
+
+class SpreadsheetMLWriter:
+    """
+    Gera o xlsx escrevendo o XML das abas diretamente no zip
+
+    - Estilos: três cellXfs fixos (padrão, cabeçalho, dados) montados a partir
+      das especificações do ExcelFormatter
+    - Strings: tabela compartilhada (sharedStrings.xml) ou inline por célula
+      (abas autocontidas, úteis para reaproveitar partes do zip)
+    - Linhas: qualquer iterável (lista em memória ou gerador de expansão);
+      cada linha é serializada e gravada uma única vez
+    - Abas colunares (FrameRows): células montadas por coluna a partir dos
+      arrays do DataFrame, sem materializar linhas
+    """
+
+    def __init__(self, formatter, shared_strings: bool = True, compresslevel: int = 1):
+        self.formatter = formatter
+        self.shared_strings = shared_strings
+        self.compresslevel = compresslevel
+
+        self._strings: Dict[str, int] = {}
+        self._string_refs = 0
+
+        # Tempo de gravação de cada aba da última escrita (na ordem das abas)
+        self.sheet_seconds: List[float] = []
+
+    def write(self, tables: Dict, output_path: str,
+              reuse: Dict[str, str] = None, source: str = None):
+        """
+        Grava as abas na ordem do dicionário
+
+        Args:
+            reuse: Chave da aba -> parte (xl/worksheets/sheetN.xml) do xlsx
+                   `source` copiada sem serializar as linhas (só com strings
+                   inline, em que o XML da aba é autocontido)
+            source: xlsx anterior de onde as partes são copiadas
+        """
+        self._strings = {}
+        self._string_refs = 0
+        self.sheet_seconds = []
+
+        reuse = reuse or {}
+        if reuse and self.shared_strings:
+            raise ValueError("Reaproveitar abas requer strings inline (shared_strings=False)")
+
+        keys = list(tables)
+        tables = list(tables.values())
+
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED,
+                             compresslevel=self.compresslevel) as zf, \
+                (zipfile.ZipFile(source) if reuse else nullcontext()) as previous:
+            for idx, (key, table) in enumerate(zip(keys, tables), 1):
+                start = time.perf_counter()
+                with stage('reuse_sheet' if key in reuse else 'generate_sheet', table.name,
+                           rows_in=len(table.rows)), \
+                        zf.open(f'xl/worksheets/sheet{idx}.xml', 'w') as f:
+                    if key in reuse:
+                        with previous.open(reuse[key]) as part:
+                            shutil.copyfileobj(part, f, COPY_BUFFER)
+                    else:
+                        self.write_sheet(f, table, selected=idx == 1)
+                self.sheet_seconds.append(time.perf_counter() - start)
+
+            zf.writestr('[Content_Types].xml', self._content_types(len(tables)))
+            zf.writestr('_rels/.rels', _ROOT_RELS)
+            zf.writestr('xl/workbook.xml', self._workbook(
+                [t.name for t in tables], [t.hidden for t in tables]
+            ))
+            zf.writestr('xl/_rels/workbook.xml.rels', self._workbook_rels(len(tables)))
+            zf.writestr('xl/styles.xml', self._styles())
+            if self.shared_strings:
+                zf.writestr('xl/sharedStrings.xml', self._shared_strings())
+
+    # ------------------------------------------------------------------
+    # Abas
+    # ------------------------------------------------------------------
+
+    def write_sheet(self, f, table, selected: bool = False):
+        """Serializa uma aba (cabeçalho + linhas) no arquivo binário f"""
+        headers = list(table.headers)
+        rows = table.rows
+        letters = [get_column_letter(i) for i in range(1, len(headers) + 1)]
+
+        parts = [_SHEET_HEAD]
+        if isinstance(rows, Sequence) and headers:
+            parts.append(f'<dimension ref="A1:{letters[-1]}{len(rows) + 1}"/>')
+        parts.append(
+            '<sheetViews><sheetView workbookViewId="0"'
+            + (' tabSelected="1"' if selected else '') + '/></sheetViews>'
+            '<sheetFormatPr defaultRowHeight="15"/>'
+        )
+        parts.append(self._cols(headers, rows))
+        parts.append('<sheetData>')
+        f.write(''.join(parts).encode('utf-8'))
+
+        f.write(self._row_xml(1, headers, letters, XF_HEADER).encode('utf-8'))
+
+        if isinstance(rows, FrameRows):
+            self._write_frame(f, rows.frame, letters, XF_DATA)
+        else:
+            buffer: List[str] = []
+            for row_num, row in enumerate(rows, 2):
+                buffer.append(self._row_xml(row_num, row, letters, XF_DATA))
+                if len(buffer) >= 1000:
+                    f.write(''.join(buffer).encode('utf-8'))
+                    buffer = []
+            if buffer:
+                f.write(''.join(buffer).encode('utf-8'))
+
+        f.write(
+            '</sheetData>'
+            '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+            '</worksheet>'.encode('utf-8')
+        )
+
+    def _cols(self, headers: List[str], rows: Iterable) -> str:
+        """Larguras de coluna (conteúdo só é lido para colunas sem largura configurada)"""
+        cols = []
+        for idx, header in enumerate(headers):
+            if isinstance(rows, FrameRows):
+                values = chain([header], rows.frame.iloc[:, idx].dropna())
+            elif isinstance(rows, Sequence):
+                values = (row[idx] for row in chain([headers], rows))
+            else:
+                values = (header,)
+            width = self.formatter.column_width(header, values)
+            cols.append(f'<col min="{idx + 1}" max="{idx + 1}" width="{width}" customWidth="1"/>')
+        return '<cols>' + ''.join(cols) + '</cols>' if cols else ''
+
+    def _row_xml(self, row_num: int, values, letters: List[str], style: int) -> str:
+        """Serializa uma linha; células vazias mantêm o estilo (como no openpyxl)"""
+        cells = [
+            f'<c r="{letter}{row_num}{self._cell_tail(value, style)}'
+            for letter, value in zip(letters, values)
+        ]
+        return f'<row r="{row_num}">' + ''.join(cells) + '</row>'
+
+    def _cell_tail(self, value, style: int) -> str:
+        """
+        Célula serializada a partir do fim da referência ('" s="2" t="s"><v>0</v></c>')
+
+        A referência fica de fora para que o mesmo valor serializado sirva
+        a qualquer linha (caminho colunar).
+        """
+        if value is None or value == '':
+            return f'" s="{style}"/>'
+        if isinstance(value, str):
+            return self._string_tail(value, style)
+        if isinstance(value, bool):
+            return f'" s="{style}" t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, int):
+            return f'" s="{style}"><v>{value}</v></c>'
+        if isinstance(value, float):
+            return self._number_tail(value, style)
+        return self._other_tail(value, style)
+
+    def _string_tail(self, value: str, style: int) -> str:
+        """Célula de texto (compartilhada ou inline)"""
+        if self.shared_strings:
+            self._string_refs += 1
+            return f'" s="{style}" t="s"><v>{self._string_index(value)}</v></c>'
+
+        return f'" s="{style}" t="inlineStr"><is>{self._text_element(value)}</is></c>'
+
+    @staticmethod
+    def _number_tail(value: float, style: int) -> str:
+        """Célula numérica (inteiros sem '.0', como o openpyxl; NaN/inf vazios)"""
+        if not math.isfinite(value):
+            return f'" s="{style}"/>'
+        if value.is_integer() and abs(value) < 1e15:
+            return f'" s="{style}"><v>{int(value)}</v></c>'
+        return f'" s="{style}"><v>{value!r}</v></c>'
+
+    def _string_index(self, value: str) -> int:
+        """Índice na tabela de strings compartilhadas (inclui se ausente)"""
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._strings)
+        return index
+
+    def _other_tail(self, value, style: int) -> str:
+        """Tipos numéricos externos (numpy) viram número; demais, texto"""
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return self._string_tail(str(value), style)
+        return self._number_tail(number, style)
+
+    # ------------------------------------------------------------------
+    # Caminho colunar
+    # ------------------------------------------------------------------
+
+    def _write_frame(self, f, frame: pd.DataFrame, letters: List[str], style: int):
+        """
+        Serializa as linhas de um DataFrame por blocos de colunas
+
+        Cada coluna é fatorada (pd.factorize) e cada valor distinto é
+        serializado uma única vez; as células da coluna são os valores
+        serializados indexados pelos códigos (NaN/None -> célula vazia).
+        A linha é montada por um único format com as referências.
+        """
+        row_format = (
+            '<row r="{0}">'
+            + ''.join(f'<c r="{letter}{{0}}{{{idx}}}' for idx, letter in enumerate(letters, 1))
+            + '</row>'
+        ).format
+
+        for start in range(0, len(frame), FRAME_CHUNK_ROWS):
+            block = frame.iloc[start:start + FRAME_CHUNK_ROWS]
+            tails = [self._column_tails(column, style) for _, column in block.items()]
+            row_nums = range(start + 2, start + 2 + len(block))
+
+            f.write(''.join([row_format(*cells) for cells in zip(row_nums, *tails)]).encode('utf-8'))
+
+    def _column_tails(self, column: pd.Series, style: int) -> np.ndarray:
+        """Células serializadas de uma coluna (sem referência, uma por linha)"""
+        values = column.to_numpy()
+
+        if values.dtype.kind == 'O' and \
+                pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+            # Tipos mistos (1 == True == 1.0 na fatoração): célula a célula
+            return np.array([self._cell_tail(value if pd.notna(value) else None, style)
+                             for value in values], dtype=object)
+
+        codes, uniques = pd.factorize(values, sort=False)
+        uniques = uniques.tolist()
+        tails = [self._cell_tail(value, style) for value in uniques]
+        tails.append(f'" s="{style}"/>')  # código -1: NaN/None
+
+        if self.shared_strings:
+            # _string_tail contou uma referência por valor distinto; conta as demais
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            self._string_refs += int(sum(
+                count - 1 for value, count in zip(uniques, counts)
+                if isinstance(value, str) and value != ''
+            ))
+
+        return np.array(tails, dtype=object)[codes]
+
+    @staticmethod
+    def _text_element(value: str) -> str:
+        """Elemento <t> com escape XML (preserva espaços nas bordas)"""
+        text = escape(_ILLEGAL_XML_RE.sub('', value))
+        if text != text.strip():
+            return f'<t xml:space="preserve">{text}</t>'
+        return f'<t>{text}</t>'
+
+    # ------------------------------------------------------------------
+    # Partes do pacote
+    # ------------------------------------------------------------------
+
+    def _content_types(self, n_sheets: int) -> str:
+        sheets = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, n_sheets + 1)
+        )
+        shared = (
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            if self.shared_strings else ''
+        )
+        return _CONTENT_TYPES.format(shared_strings=shared, sheets=sheets)
+
+    @staticmethod
+    def _workbook(names: List[str], hidden: List[bool]) -> str:
+        sheets = ''.join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}"'
+            + (' state="hidden"' if is_hidden else '')
+            + f' r:id="rId{i}"/>'
+            for i, (name, is_hidden) in enumerate(zip(names, hidden), 1)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<bookViews><workbookView activeTab="0"/></bookViews>'
+            f'<sheets>{sheets}</sheets>'
+            '</workbook>'
+        )
+
+    def _workbook_rels(self, n_sheets: int) -> str:
+        rels = [
+            f'<Relationship Id="rId{i}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, n_sheets + 1)
+        ]
+        rels.append(
+            f'<Relationship Id="rId{n_sheets + 1}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/>'
+        )
+        if self.shared_strings:
+            rels.append(
+                f'<Relationship Id="rId{n_sheets + 2}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+                'Target="sharedStrings.xml"/>'
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + ''.join(rels) + '</Relationships>'
+        )
+
+    def _shared_strings(self) -> str:
+        items = ''.join(f'<si>{self._text_element(s)}</si>' for s in self._strings)
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{self._string_refs}" uniqueCount="{len(self._strings)}">'
+            f'{items}</sst>'
+        )
+
+    def _styles(self) -> str:
+        """styles.xml com os estilos padrão, cabeçalho (XF_HEADER) e dados (XF_DATA)"""
+        header = self.formatter.header_spec
+        data = self.formatter.data_spec
+
+        fonts = [
+            '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>',
+            self._font(header.get('font', {})),
+            self._font(data.get('font', {})),
+        ]
+        fills = [
+            '<fill><patternFill patternType="none"/></fill>',
+            '<fill><patternFill patternType="gray125"/></fill>',
+        ]
+        borders = ['<border><left/><right/><top/><bottom/><diagonal/></border>']
+
+        xfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>']
+        for font_id, spec in ((1, header), (2, data)):
+            fill_id = 0
+            if spec.get('fill', {}).get('color'):
+                fills.append(self._fill(spec['fill']['color']))
+                fill_id = len(fills) - 1
+
+            border_id = 0
+            if spec.get('border', {}).get('style'):
+                borders.append(self._border(spec['border']))
+                border_id = len(borders) - 1
+
+            alignment = self._alignment(spec.get('alignment', {}))
+            xfs.append(
+                f'<xf numFmtId="0" fontId="{font_id}" fillId="{fill_id}" borderId="{border_id}" '
+                'xfId="0" applyFont="1"'
+                + (' applyFill="1"' if fill_id else '')
+                + (' applyBorder="1"' if border_id else '')
+                + (f' applyAlignment="1">{alignment}</xf>' if alignment else '/>')
+            )
+
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'<fonts count="{len(fonts)}">{"".join(fonts)}</fonts>'
+            f'<fills count="{len(fills)}">{"".join(fills)}</fills>'
+            f'<borders count="{len(borders)}">{"".join(borders)}</borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            f'<cellXfs count="{len(xfs)}">{"".join(xfs)}</cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>'
+        )
+
+    @staticmethod
+    def _font(spec: Dict) -> str:
+        parts = []
+        if spec.get('bold'):
+            parts.append('<b/>')
+        if spec.get('italic'):
+            parts.append('<i/>')
+        parts.append(f'<sz val="{spec.get("size", 11)}"/>')
+        if spec.get('color'):
+            parts.append(f'<color rgb="{_argb(spec["color"])}"/>')
+        parts.append(f'<name val={quoteattr(str(spec.get("name", "Calibri")))}/>')
+        parts.append('<family val="2"/>')
+        return '<font>' + ''.join(parts) + '</font>'
+
+    @staticmethod
+    def _fill(color) -> str:
+        argb = _argb(color)
+        return (
+            '<fill><patternFill patternType="solid">'
+            f'<fgColor rgb="{argb}"/><bgColor rgb="{argb}"/>'
+            '</patternFill></fill>'
+        )
+
+    @staticmethod
+    def _border(spec: Dict) -> str:
+        style = spec['style']
+        color = _argb(spec.get('color', '000000'))
+        sides = ''.join(
+            f'<{side} style="{style}"><color rgb="{color}"/></{side}>'
+            for side in _BORDER_SIDES
+        )
+        return f'<border>{sides}<diagonal/></border>'
+
+    @staticmethod
+    def _alignment(spec: Dict) -> Optional[str]:
+        attrs = []
+        if spec.get('horizontal'):
+            attrs.append(f'horizontal="{spec["horizontal"]}"')
+        if spec.get('vertical'):
+            attrs.append(f'vertical="{spec["vertical"]}"')
+        if spec.get('wrap_text'):
+            attrs.append('wrapText="1"')
+        return f'<alignment {" ".join(attrs)}/>' if attrs else None
@@ -0,0 +1,132 @@
+"""
+Backend de escrita via xlsxwriter (modo constant_memory)
+Grava as mesmas abas, cabeçalhos e formatos do PainelExcelGenerator
+linha a linha, sem manter o workbook em memória
+"""
+
+import time
+from itertools import chain
+from typing import Dict, List
+
+from src.instrumentation.stage_metrics import stage
+
+try:
+    import xlsxwriter
+except ImportError:  # dependência opcional
+    xlsxwriter = None
+
+
+# Estilos de borda openpyxl -> índice xlsxwriter
+BORDER_STYLES = {
+    'thin': 1, 'medium': 2, 'dashed': 3, 'dotted': 4, 'thick': 5,
+    'double': 6, 'hair': 7, 'mediumDashed': 8, 'dashDot': 9,
+    'mediumDashDot': 10, 'dashDotDot': 11, 'mediumDashDotDot': 12,
+    'slantDashDot': 13,
+}
+
+# Alinhamento vertical openpyxl -> xlsxwriter
+VERTICAL_ALIGN = {
+    'top': 'top', 'center': 'vcenter', 'bottom': 'bottom',
+    'justify': 'vjustify', 'distributed': 'vdistributed',
+}
+
+
+def is_available() -> bool:
+    """Indica se o xlsxwriter está instalado"""
+    return xlsxwriter is not None
+
+
+def format_properties(spec: Dict) -> Dict:
+    """
+    Converte uma especificação de estilo do ExcelFormatter (font, fill,
+    alignment, border) em propriedades de formato do xlsxwriter
+    """
+    props = {}
+
+    font = spec.get('font', {})
+    if font.get('bold'):
+        props['bold'] = True
+    if font.get('italic'):
+        props['italic'] = True
+    if font.get('color'):
+        props['font_color'] = '#' + str(font['color'])[-6:]
+    if font.get('size'):
+        props['font_size'] = font['size']
+    if font.get('name'):
+        props['font_name'] = font['name']
+
+    fill = spec.get('fill', {})
+    if fill.get('color'):
+        props['pattern'] = 1
+        props['bg_color'] = '#' + str(fill['color'])[-6:]
+
+    alignment = spec.get('alignment', {})
+    if alignment.get('horizontal'):
+        props['align'] = alignment['horizontal']
+    if alignment.get('vertical'):
+        props['valign'] = VERTICAL_ALIGN.get(alignment['vertical'], alignment['vertical'])
+    if alignment.get('wrap_text'):
+        props['text_wrap'] = True
+
+    border = spec.get('border', {})
+    if border.get('style'):
+        props['border'] = BORDER_STYLES.get(border['style'], 1)
+        props['border_color'] = '#' + str(border.get('color', '000000'))[-6:]
+
+    return props
+
+
+class XlsxWriterBackend:
+    """
+    Grava as abas (SheetTable) com xlsxwriter em modo constant_memory
+
+    Cada linha é escrita e descartada em seguida; larguras e formatos vêm
+    do mesmo ExcelFormatter usado pelos backends openpyxl. O nível de
+    compressão do zip é o do próprio xlsxwriter (não configurável).
+    """
+
+    def __init__(self, formatter):
+        if xlsxwriter is None:
+            raise ImportError("xlsxwriter não instalado (pip install XlsxWriter)")
+        self.formatter = formatter
+
+        # Tempo de gravação de cada aba da última escrita (na ordem das abas)
+        self.sheet_seconds: List[float] = []
+
+    def write(self, tables: Dict, output_path):
+        """
+        Grava as abas na ordem do dicionário
+
+        Para um buffer (ex: BytesIO) usa in_memory: o constant_memory grava
+        cada aba num arquivo temporário
+        """
+        in_memory = not isinstance(output_path, str)
+        workbook = xlsxwriter.Workbook(output_path, {
+            'constant_memory': not in_memory,
+            'in_memory': in_memory,
+            'strings_to_urls': False,
+        })
+
+        self.sheet_seconds = []
+
+        try:
+            header_format = workbook.add_format(format_properties(self.formatter.header_spec))
+            data_format = workbook.add_format(format_properties(self.formatter.data_spec))
+
+            for table in tables.values():
+                start = time.perf_counter()
+                with stage('generate_sheet', table.name, rows_in=len(table.rows)):
+                    ws = workbook.add_worksheet(table.name)
+                    if table.hidden:
+                        ws.hide()
+
+                    for idx, header in enumerate(table.headers):
+                        values = (row[idx] for row in chain([table.headers], table.rows))
+                        ws.set_column(idx, idx, self.formatter.column_width(header, values))
+
+                    ws.write_row(0, 0, table.headers, header_format)
+                    for row_idx, row in enumerate(table.rows, 1):
+                        ws.write_row(row_idx, 0, row, data_format)
+                self.sheet_seconds.append(time.perf_counter() - start)
+        finally:
+            workbook.close()
@@ -0,0 +1,3 @@
+"""
+Módulo Instrumentation - Métricas de desempenho da conversão
+"""
@@ -0,0 +1,307 @@
+"""
+Memória por etapa da conversão
+Observador de stage() que registra, para cada etapa, o pico de memória
+alocada pelo Python (tracemalloc) durante a etapa, a memória retida ao final
+e o RSS do processo (amostrado em segundo plano), além dos maiores pontos de
+alocação vivos ao final da etapa de topo com mais memória alocada
+"""
+
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.instrumentation.stage_metrics import StageRecord, add_observer, remove_observer
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+# Frames guardados por alocação: cada frame a mais encarece bastante o
+# parsing (openpyxl aloca muito); com python -X tracemalloc=N o rastreamento
+# já ativo é reaproveitado e as alocações externas mostram o chamador no
+# código do conversor
+TRACEMALLOC_FRAMES = 1
+
+# Intervalo entre amostras de RSS (segundos)
+RSS_INTERVAL = 0.01
+
+# Subetapas que alocaram menos que isso ficam fora do resumo
+SUMMARY_MIN_SUBSTAGE_BYTES = 1024 * 1024
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MB = 1024 * 1024
+
+
+def _rss_reader() -> Optional[Callable[[], int]]:
+    """Leitor do RSS do processo (psutil ou /proc; None se indisponível)"""
+    if PSUTIL_AVAILABLE:
+        process = psutil.Process()
+        return lambda: process.memory_info().rss
+
+    def read_statm() -> int:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    try:
+        read_statm()
+    except (AttributeError, ValueError, OSError):  # sem /proc (ex: Windows, macOS)
+        return None
+    return read_statm
+
+
+def _format_mb(size: float) -> str:
+    return f"{size / MB:.1f} MB"
+
+
+def _format_delta(size: float) -> str:
+    return f"{'+' if size >= 0 else '-'}{abs(size) / MB:.1f} MB"
+
+
+def _short_path(filename: str) -> str:
+    path = filename.replace('\\', '/')
+    if 'site-packages/' in path:
+        return path.split('site-packages/', 1)[1]
+    if '/lib/python3' in path:  # biblioteca padrão
+        return path.split('/lib/python3', 1)[1].split('/', 1)[-1]
+    if os.path.abspath(filename).startswith(_ROOT):
+        return os.path.relpath(filename, _ROOT).replace('\\', '/')
+    return path
+
+
+def _format_size(size: float) -> str:
+    if size < MB:
+        return f"{size / 1024:.1f} KB"
+    return _format_mb(size)
+
+
+def _ignored(filename: str) -> bool:
+    """Alocações do próprio rastreamento ou do mecanismo de import"""
+    return (filename in (tracemalloc.__file__, __file__, '<unknown>')
+            or filename.startswith('<frozen importlib'))
+
+
+def _in_repo(filename: str) -> bool:
+    path = os.path.abspath(filename)
+    return path.startswith(_ROOT) and 'site-packages' not in path
+
+
+@dataclass
+class MemoryRecord:
+    """Memória de uma etapa (bytes)"""
+    label: str
+    depth: int
+    start: int
+    end: int = 0
+    peak: int = 0
+    rss_end: Optional[int] = None
+    rss_peak: Optional[int] = None
+    finished: bool = False
+    # Em andamento quando o resumo foi montado: o pico inclui o próprio
+    # resumo (statistics() do snapshot), fora de MemoryTracker.peak()
+    summarized: bool = False
+
+    @property
+    def retained(self) -> int:
+        """Memória alocada na etapa que continuou viva ao final"""
+        return self.end - self.start
+
+
+class _RSSSampler(threading.Thread):
+    """Amostra o RSS do processo guardando o máximo desde o último reset"""
+
+    def __init__(self, read: Callable[[], int], interval: float):
+        super().__init__(name='painel-rss', daemon=True)
+        self.read = read
+        self.interval = interval
+        self.peak = read()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, self.read())
+
+    def reset(self) -> int:
+        """Máximo da janela que termina agora (a próxima começa no RSS atual)"""
+        current = self.read()
+        peak, self.peak = max(self.peak, current), current
+        return peak
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class MemoryTracker:
+    """
+    Memória por etapa do processo (observador de stage())
+
+    O pico do tracemalloc é global; a cada início/fim de etapa o pico da
+    janela anterior é repassado às etapas abertas e zerado, assim etapas
+    aninhadas não perdem o pico umas das outras.
+
+    Args:
+        top_sites: Pontos de alocação listados no resumo
+        rss_interval: Intervalo entre amostras de RSS (segundos)
+    """
+
+    def __init__(self, top_sites: int = 10, rss_interval: float = RSS_INTERVAL):
+        self.top_sites = top_sites
+        self.rss_interval = rss_interval
+        self.records: List[MemoryRecord] = []
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.snapshot_stage = ''
+        self._snapshot_size = 0
+        self._open: Dict[int, MemoryRecord] = {}
+        self._sampler: Optional[_RSSSampler] = None
+        self._read_rss: Optional[Callable[[], int]] = None
+
+    @contextmanager
+    def recording(self) -> Iterator['MemoryTracker']:
+        """Mede a memória das etapas do processo enquanto o bloco executa"""
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        self._read_rss = _rss_reader()
+        if self._read_rss is None:
+            print("⚠️  RSS indisponível (instale psutil: pip install psutil); "
+                  "só tracemalloc")
+        else:
+            self._sampler = _RSSSampler(self._read_rss, self.rss_interval)
+            self._sampler.start()
+
+        tracemalloc.reset_peak()
+        add_observer(self)
+        try:
+            yield self
+        finally:
+            remove_observer(self)
+            if self._sampler is not None:
+                self._sampler.stop()
+                self._sampler = None
+            if started:
+                tracemalloc.stop()
+
+    def _close_window(self):
+        """Repassa o pico da janela que termina às etapas abertas"""
+        peak = tracemalloc.get_traced_memory()[1]
+        rss_peak = self._sampler.reset() if self._sampler is not None else None
+        for record in self._open.values():
+            record.peak = max(record.peak, peak)
+            if rss_peak is not None:
+                record.rss_peak = max(record.rss_peak or 0, rss_peak)
+        tracemalloc.reset_peak()
+
+    def stage_started(self, record: StageRecord):
+        self._close_window()
+        current = tracemalloc.get_traced_memory()[0]
+        memory = MemoryRecord(record.label, len(self._open), current, peak=current)
+        self.records.append(memory)
+        self._open[id(record)] = memory
+
+    def stage_finished(self, record: StageRecord):
+        if id(record) not in self._open:
+            return
+        self._close_window()
+        memory = self._open.pop(id(record))
+        memory.end = tracemalloc.get_traced_memory()[0]
+        memory.finished = True
+        if self._read_rss is not None:
+            memory.rss_end = self._read_rss()
+
+        # Snapshot ao final da etapa de topo com mais memória viva (resumido
+        # só no relatório: o resumo com o tracemalloc ativo custa caro)
+        if memory.depth == 0 and memory.end > self._snapshot_size:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_stage = memory.label
+            self._snapshot_size = memory.end
+
+    # ------------------------------------------------------------------
+    # Resumo
+    # ------------------------------------------------------------------
+
+    def peak(self) -> Optional[MemoryRecord]:
+        """Etapa de topo com o maior pico (sem as que contêm o resumo)"""
+        top = [record for record in self.records
+               if record.finished and record.depth == 0 and not record.summarized]
+        return max(top, key=lambda record: record.peak) if top else None
+
+    def top_allocations(self) -> List[str]:
+        """
+        Maiores pontos de alocação vivos no snapshot (uma linha por ponto),
+        com a linha do conversor que levou à alocação quando ela é externa
+        """
+        if self.snapshot is None:
+            return []
+
+        # Agrupado por (ponto, chamador no repositório)
+        sites: Dict[Tuple, List[int]] = {}
+        for stat in self.snapshot.statistics('traceback'):
+            # Pilha do tracemalloc: do frame mais antigo ao mais recente
+            frames = list(reversed(stat.traceback))
+            if any(_ignored(frame.filename) for frame in frames):
+                continue
+            site = frames[0]
+            caller = None
+            if not _in_repo(site.filename):
+                caller = next((frame for frame in frames if _in_repo(frame.filename)), None)
+            key = (site.filename, site.lineno,
+                   caller.filename if caller else None, caller.lineno if caller else None)
+            total = sites.setdefault(key, [0, 0])
+            total[0] += stat.size
+            total[1] += stat.count
+
+        lines = []
+        ranked = sorted(sites.items(), key=lambda kv: -kv[1][0])[:self.top_sites]
+        for (filename, lineno, caller_file, caller_line), (size, count) in ranked:
+            text = f"{_format_size(size)} em {count} blocos: {_short_path(filename)}:{lineno}"
+            if caller_file:
+                text += f" (via {_short_path(caller_file)}:{caller_line})"
+            lines.append(text)
+        return lines
+
+    def summary_lines(self) -> List[str]:
+        """
+        Resumo para o relatório (uma linha por etapa, subetapas que alocaram
+        menos de SUMMARY_MIN_SUBSTAGE_BYTES omitidas) e maiores alocações
+        """
+        finished = [record for record in self.records if record.finished]
+        if not finished:
+            return []
+        for record in self._open.values():
+            record.summarized = True
+
+        header = "🧠 MEMÓRIA POR ETAPA (tracemalloc"
+        peak = self.peak()
+        if peak is not None:
+            header += f"; pico {_format_mb(peak.peak)} em {peak.label}"
+        rss_peaks = [record.rss_peak for record in finished if record.rss_peak is not None]
+        if rss_peaks:
+            header += f"; RSS pico {_format_mb(max(rss_peaks))}"
+        lines = [header + "):"]
+
+        for record in finished:
+            if record.depth and record.peak - record.start < SUMMARY_MIN_SUBSTAGE_BYTES:
+                continue
+            text = (f"{record.label}: pico {_format_mb(record.peak)} "
+                    f"({_format_delta(record.peak - record.start)}), "
+                    f"retido {_format_delta(record.retained)}")
+            if record.rss_end is not None:
+                text += f", RSS {_format_mb(record.rss_end)}"
+                if record.rss_peak is not None:
+                    text += f" (pico {_format_mb(record.rss_peak)})"
+            lines.append(f"{'   ' * (record.depth + 1)}• {text}")
+
+        allocations = self.top_allocations()
+        if allocations:
+            lines.append("")
+            lines.append(f"   Maiores alocações vivas ao final de {self.snapshot_stage}:")
+            lines.extend(f"   • {line}" for line in allocations)
+        return lines
@@ -0,0 +1,282 @@
+"""
+Profiling da conversão
+Perfil de PainelConverter.convert por cProfile (determinístico) ou por
+amostragem da pilha da thread principal (menor overhead). Nos dois modos
+grava um .pstats (pstats/snakeviz) e as pilhas colapsadas no formato do
+flamegraph.pl / speedscope / inferno (frame;frame;frame microssegundos)
+"""
+
+import cProfile
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+PROFILE_MODES = ('cprofile', 'sampling')
+
+# Intervalo entre amostras no modo sampling (segundos)
+SAMPLING_INTERVAL = 0.001
+
+# Ramos do grafo de chamadas do cProfile abaixo desta fração do total
+# não são expandidos nas pilhas colapsadas
+MIN_BRANCH_FRACTION = 0.0005
+
+MAX_STACK_DEPTH = 128
+
+# Função no formato das chaves do pstats: (arquivo, linha, nome)
+FrameKey = Tuple[str, int, str]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _in_package(key: FrameKey, package: str) -> bool:
+    return f'/src/{package}/' in key[0].replace('\\', '/')
+
+
+# Componentes da quebra por componente: a pilha é atribuída ao componente
+# do frame mais externo que casa (ex: pandas chamado pelo HBParser = HBParser)
+COMPONENTS: List[Tuple[str, Callable[[FrameKey], bool]]] = [
+    ('HBParser', lambda key: _in_package(key, 'parser')),
+    ('Transformadores', lambda key: _in_package(key, 'transformer')
+        or key[2] in ('_transform_acionamentos', '_transform_status')),
+    ('Expansão', lambda key: key[2] == '_expand_acionamentos'),
+    ('Validação', lambda key: _in_package(key, 'validator')
+        or key[2] in ('_validate_data', '_validate_csharp', '_verify_output')),
+    ('PainelExcelGenerator', lambda key: _in_package(key, 'generator')),
+    ('Aprendizado', lambda key: _in_package(key, 'learning') or _in_package(key, 'aprendizado')),
+]
+
+OTHER_COMPONENT = 'Outros'
+
+
+def frame_label(key: FrameKey) -> str:
+    """Nome legível de uma função: nome (caminho:linha)"""
+    filename, lineno, name = key
+    if filename == '~':  # builtin do cProfile
+        return name.replace(';', ',')
+
+    path = filename.replace('\\', '/')
+    if 'site-packages/' in path:
+        path = path.split('site-packages/', 1)[1]
+    elif '/lib/python3' in path:  # biblioteca padrão
+        path = path.split('/lib/python3', 1)[1].split('/', 1)[-1]
+    elif os.path.abspath(filename).startswith(_ROOT):
+        path = os.path.relpath(filename, _ROOT).replace('\\', '/')
+    return f'{name} ({path}:{lineno})'.replace(';', ',')
+
+
+def classify_stack(stack: Tuple[FrameKey, ...]) -> str:
+    """Componente de uma pilha (frame mais externo que casa)"""
+    for key in stack:
+        for component, matches in COMPONENTS:
+            if matches(key):
+                return component
+    return OTHER_COMPONENT
+
+
+class _StackSampler(threading.Thread):
+    """Amostra a pilha de uma thread abaixo de um frame (segundos por pilha)"""
+
+    def __init__(self, thread_id: int, stop_frame, interval: float):
+        super().__init__(name='painel-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.stop_frame = stop_frame
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.stop_frame:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+
+            # Fora do escopo (pilha não passa pelo frame de início)
+            if frame is None or not stack:
+                continue
+            self.samples[tuple(reversed(stack))] += elapsed
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class ConversionProfiler:
+    """
+    Perfil de uma chamada (ex: PainelConverter.convert)
+
+    Args:
+        mode: 'cprofile' ou 'sampling'
+        interval: Intervalo entre amostras no modo sampling (segundos)
+    """
+
+    def __init__(self, mode: str = 'cprofile', interval: float = SAMPLING_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Modo de profiling desconhecido: {mode} "
+                             f"(disponíveis: {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.interval = interval
+        self.seconds = 0.0
+        self._profile: Optional[cProfile.Profile] = None
+        self._samples: Counter = Counter()
+
+    def run(self, func: Callable, *args, **kwargs):
+        """Executa func sob o profiler e retorna o resultado dela"""
+        start = time.perf_counter()
+        try:
+            if self.mode == 'cprofile':
+                self._profile = cProfile.Profile()
+                return self._profile.runcall(func, *args, **kwargs)
+
+            sampler = _StackSampler(threading.get_ident(), sys._getframe(), self.interval)
+            sampler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sampler.stop()
+                self._samples = sampler.samples
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    # ------------------------------------------------------------------
+    # Pilhas e estatísticas
+    # ------------------------------------------------------------------
+
+    def stacks(self) -> Dict[Tuple[FrameKey, ...], float]:
+        """Segundos próprios por pilha (raiz -> folha)"""
+        if self.mode == 'sampling':
+            return dict(self._samples)
+        return self._cprofile_stacks()
+
+    def _cprofile_stacks(self) -> Dict[Tuple[FrameKey, ...], float]:
+        """
+        Pilhas reconstruídas do grafo de chamadas do cProfile
+
+        O cProfile guarda só arestas chamador -> chamado; o tempo de cada
+        função é repartido entre os caminhos na proporção do tempo
+        acumulado de cada aresta.
+        """
+        stats = pstats.Stats(self._profile).stats
+        children: Dict[FrameKey, Dict[FrameKey, float]] = defaultdict(dict)
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, edge in callers.items():
+                children[caller][func] = edge[3]
+
+        roots = [func for func, entry in stats.items() if not entry[4]]
+        total = sum(stats[func][3] for func in roots) or 1.0
+        min_time = total * MIN_BRANCH_FRACTION
+        result: Dict[Tuple[FrameKey, ...], float] = defaultdict(float)
+
+        def walk(func: FrameKey, path: Tuple[FrameKey, ...], budget: float):
+            cumulative = stats[func][3]
+            scale = budget / cumulative if cumulative > 0 else 0.0
+            path = path + (func,)
+            own = stats[func][2] * scale
+
+            for child, edge_time in children.get(func, {}).items():
+                child_budget = edge_time * scale
+                # Recursão: o tempo já está no ramo mais externo
+                if child in path:
+                    continue
+                # Ramo pequeno (ou pilha muito funda) fica no chamador
+                if len(path) >= MAX_STACK_DEPTH or child_budget < min_time:
+                    own += child_budget
+                    continue
+                walk(child, path, child_budget)
+
+            if own > 0:
+                result[path] += own
+
+        for root in roots:
+            walk(root, (), stats[root][3])
+        return dict(result)
+
+    def _sampling_stats(self) -> Dict:
+        """Estatísticas no formato do pstats a partir das amostras"""
+        stats: Dict[FrameKey, list] = {}
+        for stack, seconds in self._samples.items():
+            seen = set()
+            for depth, func in enumerate(stack):
+                entry = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+                if func not in seen:
+                    seen.add(func)
+                    entry[0] += 1
+                    entry[1] += 1
+                    entry[3] += seconds
+                if depth:
+                    caller = entry[4].setdefault(stack[depth - 1], [0, 0, 0.0, 0.0])
+                    caller[0] += 1
+                    caller[1] += 1
+                    caller[3] += seconds
+                    if depth == len(stack) - 1:
+                        caller[2] += seconds
+            stats[stack[-1]][2] += seconds
+
+        return {
+            func: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers.items()})
+            for func, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Saídas
+    # ------------------------------------------------------------------
+
+    def write(self, base_path: str) -> Dict[str, str]:
+        """
+        Grava <base>.pstats e <base>_collapsed.txt
+
+        Returns:
+            Dict tipo -> caminho
+        """
+        pstats_path = f'{base_path}.pstats'
+        if self.mode == 'cprofile':
+            self._profile.dump_stats(pstats_path)
+        else:
+            with open(pstats_path, 'wb') as f:
+                marshal.dump(self._sampling_stats(), f)
+
+        collapsed_path = f'{base_path}_collapsed.txt'
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, seconds in sorted(self.stacks().items()):
+                micros = int(round(seconds * 1e6))
+                if micros:
+                    f.write(';'.join(frame_label(key) for key in stack) + f' {micros}\n')
+
+        return {'pstats': pstats_path, 'collapsed': collapsed_path}
+
+    def top_functions(self, limit: int = 10) -> List[str]:
+        """Funções com mais tempo próprio (uma linha por função)"""
+        own: Dict[FrameKey, float] = defaultdict(float)
+        for stack, seconds in self.stacks().items():
+            own[stack[-1]] += seconds
+        total = sum(own.values()) or 1.0
+        ranked = sorted(own.items(), key=lambda kv: -kv[1])[:limit]
+        return [f"{seconds:8.3f}s {100 * seconds / total:5.1f}%  {frame_label(key)}"
+                for key, seconds in ranked]
+
+    def component_breakdown(self) -> List[Tuple[str, float]]:
+        """Tempo por componente (HBParser, transformadores, expansão, gerador...)"""
+        totals: Dict[str, float] = defaultdict(float)
+        for stack, seconds in self.stacks().items():
+            totals[classify_stack(stack)] += seconds
+        order = [name for name, _ in COMPONENTS] + [OTHER_COMPONENT]
+        return [(name, totals[name]) for name in order if totals.get(name)]
+
+    def breakdown_lines(self) -> List[str]:
+        """Quebra por componente formatada (uma linha por componente)"""
+        breakdown = self.component_breakdown()
+        total = sum(seconds for _, seconds in breakdown) or 1.0
+        return [f"{name:<22} {seconds:8.3f}s {100 * seconds / total:5.1f}%"
+                for name, seconds in breakdown]
@@ -0,0 +1,242 @@
+"""
+Métricas por etapa da conversão
+Tempo de parede, tempo de CPU e linhas de entrada/saída de cada etapa (e
+subetapa, ex: cada aba) de PainelConverter.convert. Os módulos marcam as
+etapas com stage(); sem gravação ativa nem observadores (ex: exportador de
+trace) o custo é só o do with
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+
+# Subetapas mais rápidas que isso ficam fora do resumo do relatório (não do JSON)
+SUMMARY_MIN_SUBSTAGE = 0.001
+
+
+@dataclass
+class StageRecord:
+    """Uma etapa medida"""
+    name: str
+    item: str = ''
+    parent: str = ''
+    depth: int = 0
+    wall: float = 0.0
+    cpu: Optional[float] = None
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        """Nome da etapa com o item (ex: parse_sheet[Acionamento])"""
+        return f'{self.name}[{self.item}]' if self.item else self.name
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        """Vazão em linhas de saída (ou de entrada) por segundo de parede"""
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        if rows is None or self.wall <= 0:
+            return None
+        return rows / self.wall
+
+    def to_dict(self) -> Dict:
+        rate = self.rows_per_second
+        return {
+            'etapa': self.name,
+            'item': self.item,
+            'pai': self.parent,
+            'tempo': round(self.wall, 6),
+            'cpu': round(self.cpu, 6) if self.cpu is not None else None,
+            'linhas_entrada': self.rows_in,
+            'linhas_saida': self.rows_out,
+            'linhas_por_segundo': round(rate, 1) if rate is not None else None,
+        }
+
+
+class StageMetrics:
+    """Etapas de uma conversão, na ordem em que começaram"""
+
+    def __init__(self):
+        self.records: List[StageRecord] = []
+        self.meta: Dict = {}
+        self._stack: List[StageRecord] = []
+        self._start_wall: Optional[float] = None
+        self._start_cpu: Optional[float] = None
+        self._end_wall: Optional[float] = None
+        self._end_cpu: Optional[float] = None
+
+    @contextmanager
+    def recording(self) -> Iterator['StageMetrics']:
+        """Ativa este registro para as chamadas a stage() da thread (ou tarefa)"""
+        token = _active.set(self)
+        self._start_wall, self._start_cpu = time.perf_counter(), time.process_time()
+        self._end_wall = self._end_cpu = None
+        try:
+            yield self
+        finally:
+            self._end_wall, self._end_cpu = time.perf_counter(), time.process_time()
+            _active.reset(token)
+
+    @contextmanager
+    def stage(self, name: str, item: str = '', rows_in: int = None) -> Iterator[StageRecord]:
+        """Mede o bloco como uma etapa (filha da etapa em andamento)"""
+        record = self._new_record(name, item, rows_in)
+        self._stack.append(record)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall
+            record.cpu = time.process_time() - cpu
+            self._stack.pop()
+
+    def _new_record(self, name: str, item: str, rows_in: Optional[int]) -> StageRecord:
+        parent = self._stack[-1].label if self._stack else ''
+        record = StageRecord(name, item, parent, len(self._stack), rows_in=rows_in)
+        self.records.append(record)
+        return record
+
+    def totals(self) -> Dict[str, float]:
+        """Tempo de parede e de CPU desde o início da gravação"""
+        if self._start_wall is None:
+            return {'tempo': 0.0, 'cpu': 0.0}
+        end_wall = self._end_wall if self._end_wall is not None else time.perf_counter()
+        end_cpu = self._end_cpu if self._end_cpu is not None else time.process_time()
+        return {'tempo': end_wall - self._start_wall, 'cpu': end_cpu - self._start_cpu}
+
+    def to_dict(self) -> Dict:
+        totals = self.totals()
+        return {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            **self.meta,
+            'total': {key: round(value, 6) for key, value in totals.items()},
+            'etapas': [record.to_dict() for record in self.records],
+        }
+
+    def write_json(self, path: str):
+        """Grava as métricas em JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def summary_lines(self) -> List[str]:
+        """
+        Resumo para o relatório (uma linha por etapa, subetapas indentadas;
+        subetapas abaixo de SUMMARY_MIN_SUBSTAGE omitidas)
+        """
+        if not self.records:
+            return []
+
+        totals = self.totals()
+        lines = [f"⏱️  DESEMPENHO POR ETAPA (total {totals['tempo']:.2f}s, "
+                 f"CPU {totals['cpu']:.2f}s):"]
+        for record in self.records:
+            # Etapa ainda em andamento (ex: a própria gravação do relatório)
+            if any(record is running for running in self._stack):
+                continue
+            if record.depth and record.wall < SUMMARY_MIN_SUBSTAGE:
+                continue
+            text = f"{record.label}: {record.wall:.3f}s"
+            if record.cpu is not None:
+                text += f" (CPU {record.cpu:.3f}s)"
+            if record.rows_in is not None and record.rows_out is not None:
+                text += f", {record.rows_in} -> {record.rows_out} linhas"
+            elif record.rows_out is not None or record.rows_in is not None:
+                rows = record.rows_out if record.rows_out is not None else record.rows_in
+                text += f", {rows} linhas"
+            if record.rows_per_second is not None:
+                # Sem separador de milhar: o ponto já é o decimal dos segundos
+                text += f", {record.rows_per_second:.0f} linhas/s"
+            lines.append(f"{'   ' * (record.depth + 1)}• {text}")
+        return lines
+
+
+# Registro ativo (StageMetrics.recording); por contexto, assim conversões em
+# threads diferentes do mesmo processo não misturam as etapas
+_active: ContextVar[Optional[StageMetrics]] = ContextVar('stage_metrics', default=None)
+
+# Observadores das etapas do processo: stage_started(record) e
+# stage_finished(record), chamados com ou sem registro ativo
+_observers: List = []
+
+
+def add_observer(observer):
+    _observers.append(observer)
+
+
+def remove_observer(observer):
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+@contextmanager
+def _observed(record: StageRecord) -> Iterator[None]:
+    if not _observers:
+        yield
+        return
+    observers = list(_observers)
+    for observer in observers:
+        observer.stage_started(record)
+    try:
+        yield
+    finally:
+        for observer in reversed(observers):
+            observer.stage_finished(record)
+
+
+@contextmanager
+def stage(name: str, item: str = '', rows_in: int = None) -> Iterator[StageRecord]:
+    """
+    Marca uma etapa no registro ativo (e nos observadores)
+
+    Sem registro ativo o bloco roda sem medição; o StageRecord devolvido
+    aceita rows_out do mesmo jeito.
+    """
+    active = _active.get()
+    if active is None:
+        record = StageRecord(name, item, rows_in=rows_in)
+        with _observed(record):
+            yield record
+        return
+    with active.stage(name, item, rows_in) as record, _observed(record):
+        yield record
+
+
+class StageSections:
+    """
+    Trechos sequenciais de uma função longa como etapas irmãs, sem bloco
+    with por trecho: next() encerra o trecho anterior e abre o seguinte
+
+    Uso (o with encerra o último trecho, inclusive se houver exceção):
+        with StageSections('expand_group') as sections:
+            sections.next('atuadores')
+            ...
+            sections.next('pistoes')
+            ...
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._current = None
+        self.record: Optional[StageRecord] = None
+
+    def __enter__(self) -> 'StageSections':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc_type, exc, tb)
+
+    def next(self, item: str, rows_in: int = None) -> StageRecord:
+        self.close()
+        self._current = stage(self.name, item, rows_in)
+        self.record = self._current.__enter__()
+        return self.record
+
+    def close(self, exc_type=None, exc=None, tb=None):
+        if self._current is not None:
+            current, self._current = self._current, None
+            current.__exit__(exc_type, exc, tb)
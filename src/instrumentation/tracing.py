@@ -0,0 +1,107 @@
+"""
+Exportação de spans em Chrome trace-event JSON
+As etapas marcadas com stage() viram eventos completos ("ph": "X"),
+visualizáveis em chrome://tracing ou no Perfetto (ui.perfetto.dev). Cada
+processo (ex: workers do lote) aparece como uma trilha própria
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+
+from src.instrumentation.stage_metrics import StageRecord, add_observer, remove_observer
+
+
+class TraceRecorder:
+    """
+    Spans das etapas do processo (observador de stage())
+
+    Os tempos são em microssegundos desde a época, comparáveis entre
+    processos da mesma máquina.
+
+    Args:
+        process_name: Nome da trilha do processo no visualizador
+    """
+
+    def __init__(self, process_name: str = None):
+        self.pid = os.getpid()
+        self.process_name = process_name or f'processo {self.pid}'
+        self.events: List[Dict] = []
+        self._open: Dict[int, float] = {}
+        # Relógio de alta resolução ancorado na época
+        self._epoch_offset = time.time() - time.perf_counter()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() + self._epoch_offset) * 1e6
+
+    @contextmanager
+    def recording(self) -> Iterator['TraceRecorder']:
+        """Registra as etapas do processo enquanto o bloco executa"""
+        add_observer(self)
+        try:
+            yield self
+        finally:
+            remove_observer(self)
+
+    def stage_started(self, record: StageRecord):
+        self._open[id(record)] = self._now_us()
+
+    def stage_finished(self, record: StageRecord):
+        start = self._open.pop(id(record), None)
+        if start is None:
+            return
+
+        args = {}
+        if record.item:
+            args['item'] = record.item
+        if record.rows_in is not None:
+            args['linhas_entrada'] = record.rows_in
+        if record.rows_out is not None:
+            args['linhas_saida'] = record.rows_out
+
+        self.events.append({
+            'name': record.label,
+            'cat': record.name,
+            'ph': 'X',
+            'ts': round(start, 1),
+            'dur': round(self._now_us() - start, 1),
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def metadata_events(self) -> List[Dict]:
+        """Nome da trilha do processo (evento de metadados)"""
+        return [{
+            'name': 'process_name',
+            'ph': 'M',
+            'pid': self.pid,
+            'tid': 0,
+            'args': {'name': self.process_name},
+        }]
+
+    def trace_events(self) -> List[Dict]:
+        """Eventos do processo, com os metadados da trilha"""
+        return self.metadata_events() + self.events
+
+
+def write_trace(path: str, events: Iterable[Dict]):
+    """Grava eventos (de um ou vários processos) em trace-event JSON"""
+    events = list(events)
+
+    # Um nome de trilha por processo (workers reaproveitados repetem o nome)
+    seen = set()
+    unique = []
+    for event in events:
+        if event.get('ph') == 'M':
+            key = (event['pid'], event['name'])
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(event)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': unique, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
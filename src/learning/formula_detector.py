@@ -6,6 +6,8 @@ import re
 from typing import List, Dict, Optional, Tuple
 import pandas as pd
 
+from src.parser.codigos import formatar_borne
+
 
 class FormulaDetector:
     """Detecta fórmulas matemáticas em transformações de dados"""
@@ -197,7 +199,7 @@ class PatternApplier:
                 base = pattern.get('base', 0)
                 result_num = base + num
                 
-                return f'x{result_num}{suffix}'
+                return formatar_borne(result_num, suffix)
         
         return None
     
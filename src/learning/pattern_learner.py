@@ -8,6 +8,9 @@ from typing import Dict, List, Tuple, Any
 from collections import defaultdict
 import yaml
 
+from src.parser.codigos import ANILHA_LEARN_RE, BORNE_LEARN_RE
+from src.instrumentation.stage_metrics import stage
+
 
 class PatternLearner:
     """Aprende padrões de transformação comparando HB original com Excel de referência"""
@@ -29,16 +32,22 @@ class PatternLearner:
         print("🧠 Iniciando aprendizado automático...")
         
         # Carregar arquivos
-        hb_df = self._load_hb(hb_path)
-        ref_acio = pd.read_excel(reference_path, sheet_name='Acionamento CCM-1A')
-        ref_desc = pd.read_excel(reference_path, sheet_name='Descrição de Projeto CCM-1A')
+        with stage('learn_load'):
+            hb_df = self._load_hb(hb_path)
+            ref_acio = pd.read_excel(reference_path, sheet_name='Acionamento CCM-1A')
+            ref_desc = pd.read_excel(reference_path, sheet_name='Descrição de Projeto CCM-1A')
         
         # Aprender diferentes tipos de padrões
-        self._learn_nomenclature_transforms(hb_df, ref_acio)
-        self._learn_anilha_patterns(hb_df, ref_acio)
-        self._learn_borne_patterns(ref_acio)
-        self._learn_expansion_rules(hb_df, ref_acio)
-        self._learn_field_formulas(ref_acio)
+        with stage('learn', 'nomenclatura'):
+            self._learn_nomenclature_transforms(hb_df, ref_acio)
+        with stage('learn', 'anilha'):
+            self._learn_anilha_patterns(hb_df, ref_acio)
+        with stage('learn', 'borne'):
+            self._learn_borne_patterns(ref_acio)
+        with stage('learn', 'expansao'):
+            self._learn_expansion_rules(hb_df, ref_acio)
+        with stage('learn', 'formulas'):
+            self._learn_field_formulas(ref_acio)
         
         patterns = {
             'nomenclature_transforms': self.nomenclature_transforms,
@@ -119,7 +128,7 @@ class PatternLearner:
                 continue
             
             # Extrair padrão numérico
-            match = re.search(r'(\d+A)-([A-Z]+)-(\d+)\.(\d+)', str(anilha_ref))
+            match = ANILHA_LEARN_RE.search(str(anilha_ref))
             if match:
                 pattern = {
                     'nomenclature_pattern': self._normalize_pattern(nom_ref),
@@ -141,7 +150,7 @@ class PatternLearner:
         # Detectar fórmula matemática (ex: x{19+N}A)
         borne_nums = []
         for borne in bornes:
-            match = re.search(r'x(\d+)([A-Z])', str(borne))
+            match = BORNE_LEARN_RE.search(str(borne))
             if match:
                 borne_nums.append((int(match.group(1)), match.group(2)))
         
@@ -0,0 +1,277 @@
+"""
+Decomposição de códigos de campo: ANILHA, CARTAO e BORNE
+Parsers pré-compilados compartilhados por parser, transformadores,
+aprendizado, expansão e validador C#
+
+Exemplos:
+- ANILHA: 1A-CT-13.1  -> painel 1A, tipo CT, cartão 13, saída 1
+- CARTAO: 16-DO-P05   -> 16 pontos, tipo DO, sufixo P05
+- BORNE:  x20A        -> número 20, sufixo A
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
+import pandas as pd
+
+
+# Formato de ANILHA aceito pelo C# ({PAINEL}-{TIPO}-{NUMERO}.{SAIDA})
+ANILHA_PATTERN = r'\d[A-Z]-[A-Z]+-\d+\.\d+'
+ANILHA_RE = re.compile(ANILHA_PATTERN)
+
+# Formato de BORNE aceito pelo C#
+BORNE_PATTERN = r'x(\d+)([A-Z]?)'
+BORNE_RE = re.compile(BORNE_PATTERN)
+
+# Padrões procurados pelo PatternLearner nos Excel de referência (busca, não
+# validação): painel terminado em A com qualquer número de dígitos e BORNE
+# sempre com letra (x20AB conta como x20A; x20 não entra na fórmula)
+ANILHA_LEARN_RE = re.compile(r'(\d+A)-([A-Z]+)-(\d+)\.(\d+)')
+BORNE_LEARN_RE = re.compile(r'x(\d+)([A-Z])')
+
+# Decomposição genérica de CARTAO ({QUANTIDADE}-{TIPO}-{SUFIXO})
+CARTAO_RE = re.compile(r'(\d+)-([A-Z]+)-([A-Z0-9]+)')
+
+# Padrões de CARTAO reconhecidos pelo C#
+VALID_CARTAO_PATTERNS = [
+    r'^\d+-DO-P\d+$',      # 16-DO-P05
+    r'^\d+-DI-[A-Z]+$',    # 20-DI-PF, 20-DI-PCNT
+    r'^\d+-AO-[A-Z0-9]+$', # 8-AO-U2
+    r'^\d+-AIO-[A-Z0-9]+$' # 8-AIO-U2
+]
+VALID_CARTAO_RE = re.compile('|'.join(VALID_CARTAO_PATTERNS))
+
+# Padrões de CARTAO que indicam conexão direta (não têm ANILHA-CARTAO)
+DIRECT_CONNECTION_PATTERNS = [
+    r'Borne\s+Rele',
+    r'Borne\s+0V',
+    r'Módulo\s+de\s+freio',
+    r'K-EL-\d+',  # Contatores diretos de elevador
+]
+DIRECT_CONNECTION_RE = re.compile('|'.join(DIRECT_CONNECTION_PATTERNS), re.IGNORECASE)
+
+# Tamanho do cache compartilhado de códigos já decompostos
+CACHE_SIZE = 2 ** 16
+
+# Saídas por seção de cartão e número máximo de saídas
+SAIDAS_POR_SECAO = 4
+MAX_SAIDAS = 20
+
+
+class Anilha(NamedTuple):
+    """ANILHA-CARTAO decomposta como no C# (split por '-', última parte por '.')"""
+    texto: str
+    painel: str
+    tipo: str
+    numero_cartao: str
+    numero_cartao_valido: bool
+    numero_saida: Optional[int]
+    secao: Optional[int]
+    partes: int
+    tem_ponto: bool
+    formato_valido: bool
+
+
+class Cartao(NamedTuple):
+    """CARTAO decomposto (digital/analogico como IsDigital()/IsAnalogic() do C#)"""
+    texto: str
+    quantidade: Optional[int]
+    tipo: str
+    sufixo: str
+    valido: bool
+    conexao_direta: bool
+    digital: bool
+    analogico: bool
+
+
+class Borne(NamedTuple):
+    """BORNE decomposto"""
+    texto: str
+    numero: Optional[int]
+    sufixo: str
+    valido: bool
+
+
+def secao_cartao(numero_saida: Optional[int]) -> Optional[int]:
+    """Seção do cartão para a saída (1-4 -> 1, 5-8 -> 2, ..., 17-20 -> 5)"""
+    if numero_saida is None or not 1 <= numero_saida <= MAX_SAIDAS:
+        return None
+    return (numero_saida - 1) // SAIDAS_POR_SECAO + 1
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_anilha(texto: str) -> Anilha:
+    """Decompõe uma ANILHA-CARTAO (resultado compartilhado via cache)"""
+    partes = texto.split('-')
+    ultima = partes[-1]
+    tem_ponto = '.' in ultima
+    numero_cartao = ultima.split('.')[0]
+    numero_saida = ultima.split('.')[-1]
+    saida = int(numero_saida) if tem_ponto and numero_saida.isdigit() else None
+    tres_partes = len(partes) >= 3
+
+    return Anilha(
+        texto=texto,
+        painel=partes[0] if tres_partes else '',
+        tipo=partes[1] if tres_partes else '',
+        numero_cartao=numero_cartao if tem_ponto else '',
+        numero_cartao_valido=numero_cartao.isdigit(),
+        numero_saida=saida,
+        secao=secao_cartao(saida),
+        partes=len(partes),
+        tem_ponto=tem_ponto,
+        formato_valido=ANILHA_RE.fullmatch(texto) is not None,
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_cartao(texto: str) -> Cartao:
+    """Decompõe um CARTAO (resultado compartilhado via cache)"""
+    match = CARTAO_RE.fullmatch(texto)
+    analogico = 'AO' in texto or 'AIO' in texto
+
+    return Cartao(
+        texto=texto,
+        quantidade=int(match.group(1)) if match else None,
+        tipo=match.group(2) if match else '',
+        sufixo=match.group(3) if match else '',
+        valido=VALID_CARTAO_RE.match(texto) is not None,
+        conexao_direta=DIRECT_CONNECTION_RE.search(texto) is not None,
+        digital=bool(texto) and not analogico,
+        analogico=analogico,
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_borne(texto: str) -> Borne:
+    """Decompõe um BORNE (resultado compartilhado via cache)"""
+    match = BORNE_RE.fullmatch(texto)
+
+    return Borne(
+        texto=texto,
+        numero=int(match.group(1)) if match else None,
+        sufixo=match.group(2) if match else '',
+        valido=match is not None,
+    )
+
+
+def numero_saida_cartao(cartao: str, saida: Optional[int]) -> str:
+    """
+    Saída formatada como GetNumeroSaidaCartao() do C#
+
+    - Digital (16-DO, 20-DI): zero à esquerda (01, 02, ...)
+    - AO: ímpar = N+, par = -  (1 = 1+, 2 = -)
+    - AIO: 1=1+, 2=1-, 3=2+, 4=2-, ... ; a partir de 13: ímpar = N+, par = -
+      (13 = 1+, 14 = -)
+    """
+    if saida is None or not cartao:
+        return ''
+
+    if 'AIO' in cartao:
+        if saida <= 12:
+            return f'{(saida + 1) // 2}+' if saida % 2 else f'{saida // 2}-'
+        return f'{(saida - 11) // 2}+' if saida % 2 else '-'
+    if 'AO' in cartao:
+        return f'{saida}+' if saida % 2 else '-'
+    return f'{saida:02d}'
+
+
+# Classificação de página do C# (IsAtuadorPage, IsSoftStarterPage, ...)
+# pela NOMENCLATURA; a primeira regra que casa define a página
+PAGINA_PATTERNS = [
+    ('CONTATOR_ATUADOR', r'^K-AT-\d+[AF]$'),
+    ('ATUADOR', r'^AT-\d+$'),
+    ('SOFT_STARTER', r'SS-'),
+    ('INVERSOR', r'IF-|INV-'),
+    ('FREIO_ELEVADOR', r'^FR-EL-\d+$'),
+    ('ELEVADOR', r'^EL-\d+$'),
+    ('FONTE_ATUADOR', r'^FDC-\d+$'),
+    ('COMANDO', r'COMANDO'),
+    ('REVERSAO', r'CAR'),
+]
+_PAGINA_RES = [(pagina, re.compile(pattern)) for pagina, pattern in PAGINA_PATTERNS]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def classificar_pagina(nomenclatura: str) -> str:
+    """Página C# da nomenclatura (vazio se nenhum método específico reconhece)"""
+    for pagina, regex in _PAGINA_RES:
+        if regex.search(nomenclatura):
+            return pagina
+    return ''
+
+
+def formatar_anilha(painel: str, tipo: str, numero, saida) -> str:
+    """Monta ANILHA-CARTAO no formato C# (ex: 1A-AT-3.1)"""
+    return f'{painel}-{tipo}-{numero}.{saida}'
+
+
+def formatar_borne(numero, sufixo: str = '') -> str:
+    """Monta BORNE no formato C# (ex: x20A)"""
+    return f'x{numero}{sufixo}'
+
+
+# ----------------------------------------------------------------------
+# Variantes vetorizadas
+# ----------------------------------------------------------------------
+
+def _texto(values: Iterable) -> pd.Series:
+    """Converte valores para texto (NaN/None -> vazio)"""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    return series.fillna('').astype(str)
+
+
+def _parse_series(values: Iterable, parser, campos, numericos=()) -> pd.DataFrame:
+    """
+    Aplica o parser apenas aos valores distintos e expande para todas as linhas
+
+    Colunas de HB/Excel repetem poucos códigos em muitas linhas;
+    pd.factorize reduz o trabalho a um parse por valor distinto.
+    """
+    texto = _texto(values)
+    codes, uniques = pd.factorize(texto, sort=False)
+    parsed = pd.DataFrame([parser(u) for u in uniques], columns=campos)
+    for campo in numericos:
+        parsed[campo] = pd.to_numeric(parsed[campo], errors='coerce')
+    result = parsed.take(codes)
+    result.index = texto.index
+    return result
+
+
+def anilhas_series(values: Iterable) -> pd.DataFrame:
+    """Decompõe uma coluna de ANILHA-CARTAO (uma linha por valor, mesmo índice)"""
+    return _parse_series(values, parse_anilha, Anilha._fields,
+                         numericos=('numero_saida', 'secao'))
+
+
+def cartoes_series(values: Iterable) -> pd.DataFrame:
+    """Decompõe uma coluna de CARTAO (uma linha por valor, mesmo índice)"""
+    return _parse_series(values, parse_cartao, Cartao._fields,
+                         numericos=('quantidade',))
+
+
+def bornes_series(values: Iterable) -> pd.DataFrame:
+    """Decompõe uma coluna de BORNE (uma linha por valor, mesmo índice)"""
+    return _parse_series(values, parse_borne, Borne._fields,
+                         numericos=('numero',))
+
+
+def paginas_series(values: Iterable) -> pd.Series:
+    """Classifica uma coluna de NOMENCLATURA (mesmo índice)"""
+    texto = _texto(values)
+    codes, uniques = pd.factorize(texto, sort=False)
+    paginas = pd.Series([classificar_pagina(u) for u in uniques], dtype=object)
+    result = paginas.take(codes)
+    result.index = texto.index
+    return result
+
+
+def cache_info() -> dict:
+    """Estatísticas do cache compartilhado (por tipo de código)"""
+    return {
+        'anilha': parse_anilha.cache_info(),
+        'cartao': parse_cartao.cache_info(),
+        'borne': parse_borne.cache_info(),
+        'pagina': classificar_pagina.cache_info(),
+    }
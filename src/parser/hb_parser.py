@@ -5,10 +5,14 @@ Responsável por ler e extrair dados do arquivo Excel de origem
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Any
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
 import re
 
+from src.instrumentation.stage_metrics import stage
+from src.parser.parse_cache import ParseCache, bytes_digest, file_digest
+
 
 @dataclass
 class IOPoint:
@@ -60,28 +64,65 @@ class HBParser:
         'cv', 'potencia', 'borne'
     ]
     
-    def __init__(self, filepath: str, config: Dict = None):
-        self.filepath = filepath
+    def __init__(self, filepath: Union[str, bytes, BinaryIO], config: Dict = None,
+                 cache: Optional[ParseCache] = None, name: str = ''):
+        """
+        Args:
+            filepath: Caminho do HB ou conteúdo em memória (bytes ou arquivo binário)
+            config: Configuração (patterns.yaml)
+            cache: Cache das abas decodificadas
+            name: Nome do arquivo quando o conteúdo está em memória
+        """
+        if isinstance(filepath, str):
+            self.filepath, self._source = filepath, None
+        else:
+            self.filepath, self._source = name, filepath
         self.config = config or {}
+        self.cache = cache
         self.excel_file: Optional[pd.ExcelFile] = None
+        self.sheet_names: List[str] = []
+        self.cache_hit = False
+        self.load_error = ''
+        self._digest: Optional[str] = None
+        self._cached_sheets: Optional[Dict[str, Tuple[int, pd.DataFrame]]] = None
         self.sheets: Dict[str, SheetData] = {}
         self.pecas_lookup: Dict[float, str] = {}
         self.borne_lookup: Dict[str, Dict] = {}
         self.painel_id: str = ""
         
     def load(self) -> bool:
-        """Carrega o arquivo Excel"""
+        """Carrega o arquivo Excel (ou as abas já decodificadas, do cache)"""
         try:
-            self.excel_file = pd.ExcelFile(self.filepath)
+            data = self._read_source()
+            if self.cache is not None:
+                self._digest = file_digest(self.filepath) if data is None else bytes_digest(data)
+                cached = self.cache.get(self._digest)
+                if cached is not None:
+                    self.sheet_names, self._cached_sheets = cached
+                    self.cache_hit = True
+                    self._detect_painel_id()
+                    return True
+            
+            self.excel_file = pd.ExcelFile(self.filepath if data is None else BytesIO(data))
+            self.sheet_names = list(self.excel_file.sheet_names)
             self._detect_painel_id()
             return True
         except Exception as e:
+            self.load_error = str(e) or type(e).__name__
             print(f"Erro ao carregar arquivo: {e}")
             return False
     
+    def _read_source(self) -> Optional[bytes]:
+        """Conteúdo em memória (None quando a entrada é um caminho)"""
+        if self._source is None:
+            return None
+        if not isinstance(self._source, (bytes, bytearray, memoryview)):
+            self._source = self._source.read()
+        return bytes(self._source)
+    
     def _detect_painel_id(self):
         """Detecta o ID do painel a partir do nome das abas"""
-        for sheet_name in self.excel_file.sheet_names:
+        for sheet_name in self.sheet_names:
             # Procura padrões como "1A", "1B", "2A" no nome da aba
             match = re.search(r'(\d+[A-Z])', sheet_name.upper())
             if match:
@@ -93,17 +134,29 @@ class HBParser:
     
     def parse_all_sheets(self) -> Dict[str, SheetData]:
         """Parseia todas as abas relevantes do arquivo"""
-        if not self.excel_file:
+        if not self.excel_file and self._cached_sheets is None:
             raise ValueError("Arquivo não carregado. Execute load() primeiro.")
         
-        for sheet_name in self.excel_file.sheet_names:
+        for sheet_name in self.sheet_names:
             sheet_type = self._identify_sheet_type(sheet_name)
             
             if sheet_type:
-                sheet_data = self._parse_sheet(sheet_name, sheet_type)
+                with stage('parse_sheet', sheet_name) as record:
+                    if self._cached_sheets is not None:
+                        sheet_data = self._cached_sheet(sheet_name, sheet_type)
+                    else:
+                        sheet_data = self._parse_sheet(sheet_name, sheet_type)
+                    record.rows_out = len(sheet_data.data) if sheet_data else 0
                 if sheet_data:
                     self.sheets[sheet_name] = sheet_data
         
+        # Guarda as abas decodificadas para a próxima leitura do mesmo conteúdo
+        if self.cache is not None and self._cached_sheets is None:
+            self.cache.put(self._digest, (
+                self.sheet_names,
+                {name: (sheet.header_row, sheet.data.copy()) for name, sheet in self.sheets.items()},
+            ))
+        
         # Processa tabela de peças primeiro (para lookup de cabos)
         self._build_pecas_lookup()
         
@@ -171,6 +224,18 @@ class HBParser:
             print(f"Erro ao parsear aba '{sheet_name}': {e}")
             return None
     
+    def _cached_sheet(self, sheet_name: str, sheet_type: str) -> Optional[SheetData]:
+        """Aba a partir do cache (cópia do DataFrame, o cache não é alterado)"""
+        if sheet_name not in self._cached_sheets:
+            return None
+        header_row, df = self._cached_sheets[sheet_name]
+        return SheetData(
+            name=sheet_name,
+            tipo=sheet_type,
+            header_row=header_row,
+            data=df.copy()
+        )
+    
     def _clean_column_name(self, col_name) -> str:
         """Limpa e padroniza nome de coluna"""
         if pd.isna(col_name):
@@ -243,7 +308,9 @@ class HBParser:
         """Processa todas as abas e extrai pontos de I/O"""
         for sheet_name, sheet_data in self.sheets.items():
             if sheet_data.tipo in ['acionamento', 'status', 'analogico']:
-                points = self._extract_io_points(sheet_data)
+                with stage('extract_points', sheet_name, rows_in=len(sheet_data.data)) as record:
+                    points = self._extract_io_points(sheet_data)
+                    record.rows_out = len(points)
                 sheet_data.points = points
     
     def _extract_io_points(self, sheet_data: SheetData) -> List[IOPoint]:
@@ -0,0 +1,165 @@
+"""
+Cache de parsing de arquivos HB
+Guarda as abas já decodificadas do Excel (linha de cabeçalho e DataFrame),
+indexadas pelo hash do conteúdo do arquivo; um HB já visto não paga de novo
+a leitura do xlsx. Em memória (LRU por processo) e, opcionalmente, em disco
+(compartilhado entre processos do pool)
+
+As entradas em disco são pickles: o diretório tem de ser privado do usuário
+(nunca a pasta monitorada ou um compartilhamento de rede), senão quem grava
+nele executa código no conversor. Diretórios de outro usuário ou graváveis
+por outros são recusados e o cache fica só em memória.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+# Muda quando o formato das entradas ou o parsing das abas muda
+CACHE_VERSION = 1
+
+# Permissões do diretório e das entradas em disco (só o usuário)
+_DIR_MODE = 0o700
+_FILE_MODE = 0o600
+
+# Bytes lidos por atualização do hash
+_READ_CHUNK = 1024 * 1024
+
+# Entrada: (nomes das abas, {aba: (linha do cabeçalho, DataFrame)})
+CacheEntry = Tuple[List[str], Dict[str, Tuple[int, pd.DataFrame]]]
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bytes_digest(data: bytes) -> str:
+    """SHA-256 de um conteúdo em memória (mesmo hash de file_digest)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def default_cache_dir() -> str:
+    """Diretório local e privado do usuário para o cache em disco"""
+    base = (os.environ.get('XDG_CACHE_HOME')
+            or (os.environ.get('LOCALAPPDATA') if os.name == 'nt' else None)
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'painel_ccm', 'parse_cache')
+
+
+def _not_private(st: os.stat_result) -> Optional[str]:
+    """Motivo para não confiar no arquivo/diretório (None se é privado)"""
+    # Sem uid/modo POSIX (Windows) vale a ACL do perfil do usuário
+    if not hasattr(os, 'getuid'):
+        return None
+    if st.st_uid != os.getuid():
+        return 'pertence a outro usuário'
+    if st.st_mode & 0o022:
+        return f'gravável por outros usuários (permissões {st.st_mode & 0o777:o})'
+    return None
+
+
+class ParseCache:
+    """
+    Abas decodificadas por hash do conteúdo do HB
+
+    Args:
+        directory: Diretório do cache em disco (None = só memória)
+        max_entries: Arquivos mantidos em memória (e em disco)
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 16):
+        self.directory = directory
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._memory: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+
+        if directory:
+            problem = None
+            try:
+                os.makedirs(directory, mode=_DIR_MODE, exist_ok=True)
+                problem = _not_private(os.stat(directory))
+            except OSError as e:
+                problem = str(e)
+            if problem:
+                print(f"⚠️  Cache de parsing em disco desativado ({directory}: {problem}); "
+                      f"só memória")
+                self.directory = None
+
+    def _disk_path(self, digest: str) -> str:
+        return os.path.join(self.directory, f'{digest}.v{CACHE_VERSION}.pkl')
+
+    def get(self, digest: str) -> Optional[CacheEntry]:
+        """Entrada do arquivo com esse hash (None se ainda não decodificado)"""
+        entry = self._memory.get(digest)
+        if entry is not None:
+            self._memory.move_to_end(digest)
+            self.hits += 1
+            return entry
+
+        if self.directory:
+            path = self._disk_path(digest)
+            try:
+                with open(path, 'rb') as f:
+                    # Entrada plantada por outro usuário não é deserializada
+                    if _not_private(os.fstat(f.fileno())):
+                        raise OSError(f'entrada não confiável: {path}')
+                    entry = pickle.load(f)
+                os.utime(path)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                entry = None
+            if entry is not None:
+                self._remember(digest, entry)
+                self.hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, digest: str, entry: CacheEntry):
+        """Guarda as abas decodificadas de um arquivo"""
+        self._remember(digest, entry)
+
+        if self.directory:
+            path = self._disk_path(digest)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            try:
+                fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, _FILE_MODE)
+                with open(fd, 'wb') as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+                self._prune_disk()
+            except OSError as e:
+                print(f"⚠️  Cache de parsing não gravado: {e}")
+
+    def _remember(self, digest: str, entry: CacheEntry):
+        self._memory[digest] = entry
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune_disk(self):
+        """Remove as entradas em disco menos usadas além de max_entries"""
+        suffix = f'.v{CACHE_VERSION}.pkl'
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(suffix):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+        for _, path in sorted(entries, reverse=True)[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
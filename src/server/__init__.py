@@ -0,0 +1,3 @@
+"""
+Módulo Server - Servidor de conversão com conversores residentes
+"""
@@ -0,0 +1,290 @@
+"""
+Servidor de conversão HB -> Painel CCM
+Mantém os conversores residentes num pool de processos (configuração,
+transformadores compilados, regras de expansão e padrões aprendidos
+carregados uma vez por worker) e recebe jobs por HTTP local, em porta TCP
+ou socket Unix
+
+Endpoints:
+- POST /convert   corpo = xlsx HB; ?cliente=&projeto=&local=&arquivo=
+                  resposta JSON com o xlsx gerado (base64) e o relatório
+- GET  /metrics   fila, jobs em andamento e latências
+- GET  /health    status do servidor
+"""
+
+import base64
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.batch import batch_converter
+
+
+# Tamanho máximo do HB recebido (bytes)
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+
+# Jobs mais recentes considerados nas métricas de latência
+LATENCY_WINDOW = 1000
+
+# Parâmetros da URL -> chaves de info_projeto
+PROJECT_PARAMS = {
+    'cliente': 'cliente',
+    'projeto': 'nome_projeto',
+    'local': 'local',
+}
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _latency_summary(values: List[float]) -> Dict:
+    """Média, p50, p95 e máximo (segundos)"""
+    if not values:
+        return {'amostras': 0}
+    return {
+        'amostras': len(values),
+        'media': round(sum(values) / len(values), 4),
+        'p50': round(_percentile(values, 0.50), 4),
+        'p95': round(_percentile(values, 0.95), 4),
+        'max': round(max(values), 4),
+    }
+
+
+class ServerMetrics:
+    """Contadores e latências dos jobs (thread-safe)"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.started = time.time()
+        self.received = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self._wait: deque = deque(maxlen=LATENCY_WINDOW)
+        self._run: deque = deque(maxlen=LATENCY_WINDOW)
+        self._total: deque = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def job_submitted(self):
+        with self._lock:
+            self.received += 1
+            self.in_flight += 1
+
+    def job_finished(self, success: bool, wait: float, run: float, total: float):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            if not success:
+                self.failed += 1
+            self._wait.append(wait)
+            self._run.append(run)
+            self._total.append(total)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'uptime': round(time.time() - self.started, 1),
+                'recebidos': self.received,
+                'concluidos': self.completed,
+                'falhas': self.failed,
+                'em_andamento': self.in_flight,
+                # Jobs além do número de workers aguardam na fila do pool
+                'fila': max(0, self.in_flight - self.workers),
+                'latencia': {
+                    'espera_fila': _latency_summary(list(self._wait)),
+                    'conversao': _latency_summary(list(self._run)),
+                    'total': _latency_summary(list(self._total)),
+                },
+            }
+
+
+class ConversionServer:
+    """
+    Servidor de conversão com conversores residentes
+
+    Args:
+        factory: Classe/função que cria o conversor (ex: PainelConverter)
+        converter_kwargs: Argumentos do conversor (config_path, reference_file)
+        output_options: Opções de saída aplicadas com configure_output()
+        workers: Processos do pool (padrão: número de núcleos)
+        max_upload: Tamanho máximo do HB recebido (bytes)
+    """
+
+    def __init__(self, factory: Callable, converter_kwargs: Dict = None,
+                 output_options: Dict = None, workers: Optional[int] = None,
+                 max_upload: int = MAX_UPLOAD_BYTES):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_upload = max_upload
+        self.metrics = ServerMetrics(self.workers)
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=batch_converter._init_worker,
+            initargs=(factory, converter_kwargs or {}, output_options or {}),
+        )
+
+    def warm_up(self) -> List[int]:
+        """Cria e inicializa todos os workers antes do primeiro job"""
+        futures = [self.pool.submit(batch_converter._ping) for _ in range(self.workers)]
+        return sorted({future.result() for future in futures})
+
+    def convert(self, data: bytes, filename: str = None, info_projeto: Dict = None) -> Dict:
+        """
+        Converte um HB (bytes) num worker do pool
+
+        Returns:
+            Resposta JSON (xlsx em base64, relatório, contagens e tempos)
+        """
+        submitted = time.time()
+        self.metrics.job_submitted()
+
+        try:
+            job = self.pool.submit(batch_converter._convert_bytes, data,
+                                   filename, info_projeto or {}).result()
+        except Exception:  # worker encerrado (ex: falta de memória)
+            elapsed = time.time() - submitted
+            self.metrics.job_finished(False, 0.0, elapsed, elapsed)
+            raise
+
+        finished = time.time()
+        started = max(submitted, job['started'])
+        result = job['result']
+        self.metrics.job_finished(result.success, started - submitted,
+                                  finished - started, finished - submitted)
+
+        return {
+            'success': result.success,
+            'arquivo': result.output_file,
+            'xlsx': base64.b64encode(job['xlsx']).decode('ascii') if job['xlsx'] else None,
+            'relatorio': job['relatorio'],
+            'erros': result.errors,
+            'avisos': result.warnings,
+            'linhas': result.linhas,
+            'mensagem': result.message,
+            'worker': result.worker,
+            'tempo': {
+                'fila': round(started - submitted, 4),
+                'conversao': round(result.seconds, 4),
+                'total': round(finished - submitted, 4),
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def serve_tcp(self, host: str = '127.0.0.1', port: int = 8765):
+        """Atende em host:port até Ctrl+C"""
+        httpd = ThreadingHTTPServer((host, port), _Handler)
+        httpd.app = self
+        print(f"🌐 Servidor de conversão em http://{host}:{httpd.server_address[1]} "
+              f"({self.workers} workers)")
+        self._serve(httpd)
+
+    def serve_unix(self, path: str):
+        """Atende em socket Unix até Ctrl+C (ex: curl --unix-socket)"""
+        if os.path.exists(path):
+            os.remove(path)
+        httpd = _ThreadingUnixHTTPServer(path, _Handler)
+        httpd.app = self
+        print(f"🌐 Servidor de conversão em unix:{path} ({self.workers} workers)")
+        try:
+            self._serve(httpd)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _serve(self, httpd):
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n⏹️  Servidor encerrado")
+        finally:
+            httpd.server_close()
+            self.shutdown()
+
+    def shutdown(self):
+        """Encerra o pool de workers"""
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP sobre socket Unix (uma thread por requisição)"""
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Requisições HTTP do ConversionServer (self.server.app)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self) -> str:
+        # Socket Unix não tem endereço do cliente
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            self._send_json(200, self.server.app.metrics.snapshot())
+        elif path == '/health':
+            self._send_json(200, {'status': 'ok', 'workers': self.server.app.workers})
+        else:
+            self._send_json(404, {'erro': f'Caminho desconhecido: {path}'})
+
+    def do_POST(self):
+        # Respostas antes da leitura do corpo encerram a conexão: o corpo não
+        # lido ficaria no socket como início da próxima requisição
+        url = urlparse(self.path)
+        if url.path != '/convert':
+            self._send_json(404, {'erro': f'Caminho desconhecido: {url.path}'}, close=True)
+            return
+
+        app = self.server.app
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self._send_json(400, {'erro': 'Content-Length inválido'}, close=True)
+            return
+        if length <= 0:
+            self._send_json(400, {'erro': 'Corpo vazio: envie o xlsx HB'}, close=True)
+            return
+        if length > app.max_upload:
+            self._send_json(413, {'erro': f'Arquivo maior que {app.max_upload} bytes'},
+                            close=True)
+            return
+
+        data = self.rfile.read(length)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        info_projeto = {
+            field: params[param] for param, field in PROJECT_PARAMS.items() if params.get(param)
+        }
+
+        try:
+            response = app.convert(data, params.get('arquivo'), info_projeto)
+        except Exception as e:
+            self._send_json(500, {'success': False, 'erro': f'{type(e).__name__}: {e}'})
+            return
+
+        self._send_json(200 if response['success'] else 422, response)
+
+    def _send_json(self, status: int, payload: Dict, close: bool = False):
+        """Resposta JSON (close: encerra a conexão após a resposta)"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if close:
+            # send_header também marca close_connection
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
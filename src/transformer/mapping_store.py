@@ -0,0 +1,109 @@
+"""
+Mapeamentos conhecidos HB -> Referência
+Índice de resultados exatos já validados, consultado antes das regras
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MappingEntry:
+    """Resultado conhecido para uma linha do HB"""
+    nomenclatura: str
+    descricao: str = ""
+    anilha_cartao: str = ""
+    anilha_rele: str = ""
+    borne: str = ""
+
+
+class MappingStore:
+    """
+    Índice de mapeamentos exatos HB -> Referência
+
+    Chave: (nomenclatura, anilha1, anilha2) normalizados.
+    Linhas conhecidas são resolvidas com uma única consulta ao dicionário;
+    as demais seguem para as regras dos transformadores.
+    """
+
+    def __init__(self, entries: Dict[Tuple[str, str, str], MappingEntry] = None):
+        self.entries: Dict[Tuple[str, str, str], MappingEntry] = entries or {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_json(cls, filepath: str) -> 'MappingStore':
+        """Carrega mapeamentos de um arquivo JSON (formato mapeamento_completo_hb_ref.json)"""
+        store = cls()
+
+        if not filepath or not os.path.exists(filepath):
+            return store
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+        for record in records:
+            store.add(
+                record.get('hb_nomenclatura'),
+                record.get('hb_anilha1'),
+                record.get('hb_anilha2'),
+                MappingEntry(
+                    nomenclatura=cls._clean(record.get('ref_nomenclatura')),
+                    descricao=cls._clean(record.get('ref_descricao')),
+                    anilha_cartao=cls._clean(record.get('ref_anilha_cartao')),
+                    anilha_rele=cls._clean(record.get('ref_anilha_rele')),
+                    borne=cls._clean(record.get('ref_borne')),
+                )
+            )
+
+        return store
+
+    @staticmethod
+    def _clean(value) -> str:
+        """Converte valor do JSON para string (NaN/None -> vazio)"""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return ""
+        return str(value).strip()
+
+    @classmethod
+    def make_key(cls, nomenclatura, anilha1, anilha2) -> Tuple[str, str, str]:
+        """Normaliza (nomenclatura, anilha1, anilha2) para chave do índice"""
+        return (
+            cls._clean(nomenclatura).upper(),
+            cls._clean(anilha1).upper(),
+            cls._clean(anilha2).upper(),
+        )
+
+    def add(self, nomenclatura, anilha1, anilha2, entry: MappingEntry):
+        """Registra um mapeamento conhecido"""
+        self.entries[self.make_key(nomenclatura, anilha1, anilha2)] = entry
+
+    def lookup(self, nomenclatura, anilha1, anilha2) -> Optional[MappingEntry]:
+        """Retorna o mapeamento conhecido ou None (contabiliza caminho rápido/regras)"""
+        entry = self.entries.get(self.make_key(nomenclatura, anilha1, anilha2))
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def reset_stats(self):
+        """Zera contadores de consultas"""
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna estatísticas de consulta"""
+        return {
+            'mapeamentos': len(self.entries),
+            'caminho_rapido': self.hits,
+            'regras': self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -116,6 +116,10 @@ class NomenclaturaTransformer:
         
         return (mapped_nom, tipo)
     
+    def identify_type(self, nomenclatura: str, descricao: str = "") -> str:
+        """Identifica tipo de equipamento de uma nomenclatura já normalizada"""
+        return self._identify_equipment_type(nomenclatura, descricao)
+    
     def _clean(self, nomenclatura: str) -> str:
         """Limpa e padroniza a nomenclatura"""
         text = str(nomenclatura).strip().upper()
@@ -3,22 +3,71 @@ Validador de Compatibilidade com Sistema C#
 Garante que o Excel gerado está 100% compatível com ProjetosEletricosAutomacao
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
-import re
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.parser import codigos
+
+
+# Linhas de uma aba: DataFrame, lista de linhas (ordem das colunas C#) ou lista de dicts
+RowsLike = Union[pd.DataFrame, Sequence]
 
 
 class CSharpCompatibilityValidator:
     """
     Valida se o Excel gerado segue EXATAMENTE os padrões
     esperados pelo sistema C# ProjetosEletricosAutomacao
+    
+    O arquivo é lido uma única vez; ANILHA-CARTAO e CARTAO são decompostos
+    em colunas derivadas (painel, tipo, número cartão, número saída, seção)
+    e cada validação é uma passada vetorizada sobre essas colunas.
     """
     
-    def __init__(self, excel_path: str):
+    # Abas e colunas obrigatórias ({painel} = ID do painel)
+    REQUIRED_SHEETS = {
+        'Descrição de Projeto CCM-{painel}': ['NOMENCLATURA', 'DESCRICAO'],
+        'Acionamento CCM-{painel}': [
+            'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO',
+            'ANILHA-CARTAO', 'ANILHA-RELE', 'RELE', 'CAVALO',
+            'BORNE', 'CABEAMENTO', 'FUSIVEL'
+        ],
+        'Reconhecimento CCM-{painel}': [
+            'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO',
+            'ANILHA-CARTAO', 'BORNE', 'FUSIVEL'
+        ],
+        'Informações Especiais CCM-{painel}': ['INFORMACAO', 'VALOR']
+    }
+    
+    # Padrões de CARTAO (conexão direta / reconhecidos pelo C#)
+    DIRECT_CONNECTION_PATTERNS = codigos.DIRECT_CONNECTION_PATTERNS
+    VALID_CARTAO_PATTERNS = codigos.VALID_CARTAO_PATTERNS
+    
+    # Padrões de NOMENCLATURA com métodos C# específicos
+    RECOGNIZED_NOMENCLATURA_PATTERNS = [
+        r'^AT-\d+$',        # Atuador
+        r'^SS-',            # Soft Starter
+        r'^IF-',            # Inversor
+        r'^EL-\d+$',        # Elevador
+        r'^FR-EL-\d+$',     # Freio Elevador
+        r'CAR',             # Reversão (contains)
+        r'^FDC-\d+$',       # Fonte Atuador
+        r'COMANDO',         # Comando
+        r'^K-AT-\d+[AF]$',  # Contator Atuador
+    ]
+    
+    ANILHA_PATTERN = codigos.ANILHA_PATTERN
+    BORNE_PATTERN = codigos.BORNE_PATTERN
+    
+    def __init__(self, excel_path: str = None, painel_id: str = '1A'):
         self.excel_path = excel_path
+        self.painel_id = painel_id
         self.errors = []
         self.warnings = []
         
+        self._sheets: Optional[Dict[str, pd.DataFrame]] = None
+        self._acionamento: Optional[pd.DataFrame] = None
+    
     def validate_all(self) -> Tuple[bool, List[str], List[str]]:
         """Executa todas as validações"""
         
@@ -34,6 +83,207 @@ class CSharpCompatibilityValidator:
         is_valid = len(self.errors) == 0
         return is_valid, self.errors, self.warnings
     
+    def validate_rows(self,
+                      acionamentos: RowsLike,
+                      status: RowsLike,
+                      descricao: RowsLike,
+                      info_especiais: RowsLike = None) -> Tuple[bool, List[str], List[str]]:
+        """
+        Executa todas as validações sobre linhas em memória (sem ler/gravar xlsx)
+        
+        Args:
+            acionamentos: Linhas da aba Acionamento (DataFrame ou lista de linhas
+                na ordem das colunas C#)
+            status: Linhas da aba Reconhecimento
+            descricao: Linhas da aba Descrição de Projeto
+            info_especiais: Linhas da aba Informações Especiais (opcional)
+        
+        Returns:
+            (is_valid, errors, warnings), como validate_all()
+        """
+        provided = {
+            'Descrição de Projeto CCM-{painel}': descricao,
+            'Acionamento CCM-{painel}': acionamentos,
+            'Reconhecimento CCM-{painel}': status,
+            'Informações Especiais CCM-{painel}': info_especiais if info_especiais is not None else [],
+        }
+        
+        self.errors = []
+        self.warnings = []
+        self._acionamento = None
+        self._sheets = {
+            self._sheet_name(template): self._frame(rows, self.REQUIRED_SHEETS[template])
+            for template, rows in provided.items()
+        }
+        
+        return self.validate_all()
+    
+    def validate_sheets(self,
+                        sheets: Dict[str, Tuple[Sequence[str], RowsLike]]
+                        ) -> Tuple[bool, List[str], List[str]]:
+        """
+        Executa todas as validações sobre as abas exatamente como serão gravadas
+        (nomes e cabeçalhos do gerador, sem ler/gravar xlsx)
+        
+        Diferente de validate_rows(), nada vem dos modelos de REQUIRED_SHEETS:
+        aba renomeada ou cabeçalho trocado/reordenado falham na estrutura.
+        
+        Args:
+            sheets: Nome da aba -> (cabeçalhos, linhas: DataFrame ou lista de
+                linhas na ordem dos cabeçalhos)
+        
+        Returns:
+            (is_valid, errors, warnings), como validate_all()
+        """
+        self.errors = []
+        self.warnings = []
+        self._acionamento = None
+        self._sheets = {
+            name: self._table_frame(name, list(headers), rows)
+            for name, (headers, rows) in sheets.items()
+        }
+        
+        return self.validate_all()
+    
+    # ------------------------------------------------------------------
+    # Carga e colunas derivadas
+    # ------------------------------------------------------------------
+    
+    def _sheet_name(self, template: str) -> str:
+        return template.format(painel=self.painel_id)
+    
+    def _load_sheets(self) -> Dict[str, pd.DataFrame]:
+        """Lê todas as abas do arquivo uma única vez"""
+        if self._sheets is None:
+            sheets = pd.read_excel(self.excel_path, sheet_name=None)
+            self._sheets = {
+                name: df.replace('', np.nan) for name, df in sheets.items()
+            }
+        return self._sheets
+    
+    @staticmethod
+    def _frame(rows: RowsLike, columns: List[str]) -> pd.DataFrame:
+        """Converte linhas em memória para DataFrame com a mesma semântica do xlsx lido"""
+        if isinstance(rows, pd.DataFrame):
+            df = rows.reset_index(drop=True)
+        elif rows and isinstance(rows[0], dict):
+            df = pd.DataFrame(list(rows))
+        else:
+            df = pd.DataFrame(list(rows), columns=columns)
+        
+        # Células vazias ('' / None) são lidas como NaN do xlsx
+        return df.replace('', np.nan)
+    
+    def _table_frame(self, name: str, headers: List[str], rows: RowsLike) -> pd.DataFrame:
+        """
+        Aba em memória com os cabeçalhos que serão gravados
+        
+        Linhas com número de colunas diferente dos cabeçalhos viram erro (e
+        são completadas/cortadas para as demais validações).
+        """
+        width = len(headers)
+        if isinstance(rows, pd.DataFrame):
+            df = rows.reset_index(drop=True)
+            if df.shape[1] == width:
+                df = df.set_axis(headers, axis=1)
+            else:
+                self.errors.append(
+                    f"Aba '{name}': {df.shape[1]} colunas de dados para {width} cabeçalhos"
+                )
+        else:
+            bad = [idx for idx, row in enumerate(rows, 2) if len(row) != width]
+            if bad:
+                self.errors.append(
+                    f"Aba '{name}': {len(bad)} linha(s) com número de colunas diferente "
+                    f"dos {width} cabeçalhos (primeira: linha {bad[0]})"
+                )
+                rows = [(list(row) + [None] * width)[:width] for row in rows]
+            df = pd.DataFrame(list(rows), columns=headers)
+        
+        # Células vazias ('' / None) são lidas como NaN do xlsx
+        return df.replace('', np.nan)
+    
+    def _get_sheet(self, template: str) -> pd.DataFrame:
+        """Retorna aba carregada (vazia com colunas obrigatórias se ausente)"""
+        df = self._load_sheets().get(self._sheet_name(template))
+        if df is None:
+            df = pd.DataFrame(columns=self.REQUIRED_SHEETS[template])
+        return df
+    
+    @staticmethod
+    def _text(df: pd.DataFrame, column: str) -> pd.Series:
+        """Coluna como texto ('' para células vazias)"""
+        if column not in df.columns:
+            # Mesmo dtype de texto das colunas presentes (concatenadas nas mensagens)
+            return pd.Series('', index=df.index).astype(str)
+        series = df[column]
+        return series.astype(str).where(series.notna(), '')
+    
+    def _get_acionamento(self) -> pd.DataFrame:
+        """
+        Aba de Acionamento com colunas derivadas (calculadas uma vez)
+        
+        Simula a decomposição do C#: ANILHA-CARTAO é separada por '-',
+        a última parte por '.' -> número do cartão (antes do ponto) e
+        número da saída (após o ponto).
+        """
+        if self._acionamento is not None:
+            return self._acionamento
+        
+        df = self._get_sheet('Acionamento CCM-{painel}')
+        derived = pd.DataFrame(index=df.index)
+        
+        anilha = self._text(df, 'ANILHA-CARTAO')
+        cartao = self._text(df, 'CARTAO')
+        borne = self._text(df, 'BORNE')
+        
+        # Decomposição compartilhada (um parse por valor distinto)
+        anilhas = codigos.anilhas_series(anilha)
+        cartoes = codigos.cartoes_series(cartao)
+        bornes = codigos.bornes_series(borne)
+        
+        derived['linha'] = (df.index + 2).astype(str)
+        derived['anilha'] = anilha
+        derived['anilha_vazia'] = anilha == ''
+        derived['anilha_formato_valido'] = anilhas['formato_valido']
+        derived['n_partes'] = anilhas['partes']
+        derived['panel'] = anilhas['painel']
+        derived['tipo'] = anilhas['tipo']
+        derived['tem_ponto'] = anilhas['tem_ponto']
+        derived['numero_cartao'] = anilhas['numero_cartao']
+        derived['numero_cartao_valido'] = anilhas['numero_cartao_valido']
+        derived['numero_saida'] = anilhas['numero_saida']
+        derived['secao'] = anilhas['secao']
+        
+        derived['cartao'] = cartao
+        derived['cartao_vazio'] = cartao == ''
+        derived['conexao_direta'] = cartoes['conexao_direta']
+        derived['cartao_valido'] = cartoes['valido']
+        derived['borne'] = borne
+        derived['borne_valido'] = bornes['valido']
+        
+        self._acionamento = derived
+        return derived
+    
+    @staticmethod
+    def _collect(target: List[str], parts: List[pd.Series]):
+        """
+        Adiciona mensagens de várias máscaras mantendo ordem por linha
+        
+        Args:
+            target: Lista de destino (errors/warnings)
+            parts: Séries de mensagens indexadas pela linha de origem
+        """
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return
+        messages = pd.concat(parts).sort_index(kind='stable')
+        target.extend(messages.tolist())
+    
+    # ------------------------------------------------------------------
+    # Validações
+    # ------------------------------------------------------------------
+    
     def validate_anilha_format(self):
         """
         Valida formato de ANILHA-CARTAO
@@ -46,55 +296,35 @@ class CSharpCompatibilityValidator:
         
         IMPORTANTE: Conexões diretas (Borne Rele, 0V2, etc) não têm ANILHA-CARTAO e isso é esperado.
         """
-        df = pd.read_excel(self.excel_path, sheet_name='Acionamento CCM-1A')
-        
-        # Padrões de CARTAO que indicam conexão direta (não têm ANILHA-CARTAO)
-        direct_connection_patterns = [
-            r'Borne\s+Rele',
-            r'Borne\s+0V',
-            r'Módulo\s+de\s+freio',
-            r'K-EL-\d+',  # Contatores diretos de elevador
+        df = self._get_acionamento()
+        
+        # Se CARTAO é conexão direta, ANILHA vazia é esperada
+        m = df[df['anilha_vazia'] & ~df['conexao_direta']]
+        self._collect(self.warnings, [
+            "Linha " + m['linha'] + ": ANILHA-CARTAO vazia mas CARTAO '" + m['cartao']
+            + "' parece ser do CLP (não é conexão direta)"
+        ])
+        
+        preenchida = df[~df['anilha_vazia']]
+        tres_partes = preenchida['n_partes'] >= 3
+        
+        # Formato básico: XX-YY-NN.S
+        formato = preenchida[~preenchida['anilha_formato_valido']]
+        # Número do cartão extraível
+        sem_ponto = preenchida[tres_partes & ~preenchida['tem_ponto']]
+        nao_numerico = preenchida[
+            tres_partes & preenchida['tem_ponto'] & ~preenchida['numero_cartao_valido']
         ]
         
-        for idx, row in df.iterrows():
-            anilha = row.get('ANILHA-CARTAO', None)
-            cartao = str(row.get('CARTAO', ''))
-            
-            # Se CARTAO é conexão direta, ANILHA vazia é esperada
-            is_direct_connection = any(re.search(pattern, cartao, re.IGNORECASE) for pattern in direct_connection_patterns)
-            
-            if pd.isna(anilha):
-                if not is_direct_connection:
-                    self.warnings.append(
-                        f"Linha {idx+2}: ANILHA-CARTAO vazia mas CARTAO '{cartao}' parece ser do CLP (não é conexão direta)"
-                    )
-                continue
-            
-            anilha = str(anilha)
-            
-            if anilha == '':
-                continue
-            
-            # Validar formato básico: XX-YY-NN.S
-            if not re.match(r'^\d[A-Z]-[A-Z]+-\d+\.\d+$', anilha):
-                self.errors.append(
-                    f"Linha {idx+2}: ANILHA '{anilha}' não segue padrão C# (esperado: 1A-CT-13.1)"
-                )
-            
-            # Validar se pode extrair número do cartão
-            parts = anilha.split('-')
-            if len(parts) >= 3:
-                last_part = parts[-1]
-                if '.' not in last_part:
-                    self.errors.append(
-                        f"Linha {idx+2}: ANILHA '{anilha}' sem ponto (C# GetNumeroCartao() falhará)"
-                    )
-                else:
-                    numero_cartao = last_part.split('.')[0]
-                    if not numero_cartao.isdigit():
-                        self.errors.append(
-                            f"Linha {idx+2}: ANILHA '{anilha}' - número cartão '{numero_cartao}' não é numérico"
-                        )
+        self._collect(self.errors, [
+            "Linha " + formato['linha'] + ": ANILHA '" + formato['anilha']
+            + "' não segue padrão C# (esperado: 1A-CT-13.1)",
+            "Linha " + sem_ponto['linha'] + ": ANILHA '" + sem_ponto['anilha']
+            + "' sem ponto (C# GetNumeroCartao() falhará)",
+            "Linha " + nao_numerico['linha'] + ": ANILHA '" + nao_numerico['anilha']
+            + "' - número cartão '" + nao_numerico['numero_cartao']
+            + "' não é numérico",
+        ])
     
     def validate_cartao_format(self):
         """
@@ -106,28 +336,13 @@ class CSharpCompatibilityValidator:
         - IsDigital(): !contains("AO" ou "AIO")
         - IsAnalogic(): contains("AO" ou "AIO")
         """
-        df = pd.read_excel(self.excel_path, sheet_name='Acionamento CCM-1A')
-        
-        valid_patterns = [
-            r'^\d+-DO-P\d+$',      # 16-DO-P05
-            r'^\d+-DI-[A-Z]+$',    # 20-DI-PF, 20-DI-PCNT
-            r'^\d+-AO-[A-Z0-9]+$', # 8-AO-U2
-            r'^\d+-AIO-[A-Z0-9]+$' # 8-AIO-U2
-        ]
+        df = self._get_acionamento()
         
-        for idx, row in df.iterrows():
-            cartao = str(row.get('CARTAO', ''))
-            
-            if pd.isna(cartao) or cartao == '':
-                continue
-            
-            # Verificar se match algum padrão válido
-            matches_pattern = any(re.match(pattern, cartao) for pattern in valid_patterns)
-            
-            if not matches_pattern:
-                self.warnings.append(
-                    f"Linha {idx+2}: CARTAO '{cartao}' pode não ser reconhecido pelo C# (padrões esperados: 16-DO-P05, 20-DI-PF, 8-AO-U2, 8-AIO-U2)"
-                )
+        m = df[~df['cartao_vazio'] & ~df['cartao_valido']]
+        self._collect(self.warnings, [
+            "Linha " + m['linha'] + ": CARTAO '" + m['cartao']
+            + "' pode não ser reconhecido pelo C# (padrões esperados: 16-DO-P05, 20-DI-PF, 8-AO-U2, 8-AIO-U2)"
+        ])
     
     def validate_numero_cartao_extraction(self):
         """
@@ -143,44 +358,21 @@ class CSharpCompatibilityValidator:
         
         IMPORTANTE: Conexões diretas não têm ANILHA-CARTAO, então são ignoradas.
         """
-        df = pd.read_excel(self.excel_path, sheet_name='Acionamento CCM-1A')
-        
-        # Padrões de CARTAO que indicam conexão direta
-        direct_connection_patterns = [
-            r'Borne\s+Rele',
-            r'Borne\s+0V',
-            r'Módulo\s+de\s+freio',
-            r'K-EL-\d+',
-        ]
+        df = self._get_acionamento()
         
-        for idx, row in df.iterrows():
-            anilha = row.get('ANILHA-CARTAO', None)
-            cartao = str(row.get('CARTAO', ''))
-            
-            # Ignorar conexões diretas
-            is_direct_connection = any(re.search(pattern, cartao, re.IGNORECASE) for pattern in direct_connection_patterns)
-            if is_direct_connection or pd.isna(anilha):
-                continue
-            
-            anilha = str(anilha)
-            if anilha == '':
-                continue
-            
-            # Simular lógica C#
-            parts = anilha.split('-')
-            last_part = parts[-1]
-            
-            if '.' not in last_part:
-                self.errors.append(
-                    f"Linha {idx+2}: GetNumeroCartao() retornará vazio para '{anilha}' (falta ponto)"
-                )
-                continue
-            
-            numero_cartao = last_part.split('.')[0]
-            if not numero_cartao.isdigit():
-                self.errors.append(
-                    f"Linha {idx+2}: GetNumeroCartao() retornará vazio para '{anilha}' ('{numero_cartao}' não é número)"
-                )
+        # Ignorar conexões diretas
+        base = df[~df['conexao_direta'] & ~df['anilha_vazia']]
+        sem_ponto = base[~base['tem_ponto']]
+        nao_numerico = base[base['tem_ponto'] & ~base['numero_cartao_valido']]
+        
+        self._collect(self.errors, [
+            "Linha " + sem_ponto['linha'] + ": GetNumeroCartao() retornará vazio para '"
+            + sem_ponto['anilha'] + "' (falta ponto)",
+            "Linha " + nao_numerico['linha'] + ": GetNumeroCartao() retornará vazio para '"
+            + nao_numerico['anilha'] + "' ('"
+            + nao_numerico['numero_cartao']
+            + "' não é número)",
+        ])
     
     def validate_secao_cartao_calculation(self):
         """
@@ -194,33 +386,15 @@ class CSharpCompatibilityValidator:
         - 13-16: seção 4 (bug no C#: >= 12)
         - 17-20: seção 5
         """
-        df = pd.read_excel(self.excel_path, sheet_name='Acionamento CCM-1A')
+        df = self._get_acionamento()
         
-        for idx, row in df.iterrows():
-            anilha = str(row.get('ANILHA-CARTAO', ''))
-            
-            if pd.isna(anilha) or anilha == '':
-                continue
-            
-            # Extrair número da saída
-            parts = anilha.split('-')
-            last_part = parts[-1]
-            
-            if '.' not in last_part:
-                continue
-            
-            numero_saida = last_part.split('.')[-1]
-            
-            if not numero_saida.isdigit():
-                continue
-            
-            num = int(numero_saida)
-            
-            # Validar se está em range válido (1-20)
-            if num < 1 or num > 20:
-                self.warnings.append(
-                    f"Linha {idx+2}: Número saída {num} em '{anilha}' fora do range (1-20) - GetSecaoCartao() retornará vazio"
-                )
+        # Validar se está em range válido (1-20)
+        m = df[df['numero_saida'].notna() & df['secao'].isna()]
+        num = m['numero_saida'].astype(int).astype(str)
+        self._collect(self.warnings, [
+            "Linha " + m['linha'] + ": Número saída " + num + " em '" + m['anilha']
+            + "' fora do range (1-20) - GetSecaoCartao() retornará vazio"
+        ])
     
     def validate_numero_saida_cartao(self):
         """
@@ -231,58 +405,35 @@ class CSharpCompatibilityValidator:
         - 8-AO: ímpar = N+, par = -  (ex: 1 = 1+, 2 = -)
         - 8-AIO: mapeamento complexo (1=1+, 2=1-, 3=2+, 4=2-, ... 13=1+, 14=-)
         """
-        df = pd.read_excel(self.excel_path, sheet_name='Acionamento CCM-1A')
+        df = self._get_acionamento()
         
-        for idx, row in df.iterrows():
-            anilha = str(row.get('ANILHA-CARTAO', ''))
-            cartao = str(row.get('CARTAO', ''))
-            
-            if pd.isna(anilha) or anilha == '' or pd.isna(cartao) or cartao == '':
-                continue
-            
-            # Extrair número da saída
-            parts = anilha.split('-')
-            last_part = parts[-1]
-            
-            if '.' not in last_part:
-                continue
-            
-            numero_saida = last_part.split('.')[-1]
-            
-            if not numero_saida.isdigit():
-                continue
-            
-            num = int(numero_saida)
-            
-            # Validar por tipo de cartão
-            if 'AIO' in cartao:
-                # 8-AIO tem limites específicos
-                if num < 1 or num > 20:
-                    self.warnings.append(
-                        f"Linha {idx+2}: Saída {num} inválida para cartão 8-AIO (válido: 1-20)"
-                    )
-            elif 'AO' in cartao and 'AIO' not in cartao:
-                # 8-AO
-                if num < 1:
-                    self.warnings.append(
-                        f"Linha {idx+2}: Saída {num} inválida para cartão AO"
-                    )
+        base = df[df['numero_saida'].notna() & ~df['cartao_vazio']]
+        aio = base['cartao'].str.contains('AIO', regex=False)
+        ao = base['cartao'].str.contains('AO', regex=False) & ~aio
+        saida = base['numero_saida']
+        
+        # 8-AIO tem limites específicos
+        m_aio = base[aio & ~saida.between(1, 20)]
+        # 8-AO
+        m_ao = base[ao & (saida < 1)]
+        
+        self._collect(self.warnings, [
+            "Linha " + m_aio['linha'] + ": Saída " + m_aio['numero_saida'].astype(int).astype(str)
+            + " inválida para cartão 8-AIO (válido: 1-20)",
+            "Linha " + m_ao['linha'] + ": Saída " + m_ao['numero_saida'].astype(int).astype(str)
+            + " inválida para cartão AO",
+        ])
     
     def validate_borne_format(self):
         """Valida formato de BORNE"""
-        df = pd.read_excel(self.excel_path, sheet_name='Acionamento CCM-1A')
+        df = self._get_acionamento()
         
-        for idx, row in df.iterrows():
-            borne = str(row.get('BORNE', ''))
-            
-            if pd.isna(borne) or borne == '':
-                continue
-            
-            # Padrão comum: xNN ou xNNA (ex: x20A, x21B)
-            if not re.match(r'^x\d+[A-Z]?$', borne):
-                self.warnings.append(
-                    f"Linha {idx+2}: BORNE '{borne}' formato incomum (esperado: x20A, x21B, etc)"
-                )
+        # Padrão comum: xNN ou xNNA (ex: x20A, x21B)
+        m = df[(df['borne'] != '') & ~df['borne_valido']]
+        self._collect(self.warnings, [
+            "Linha " + m['linha'] + ": BORNE '" + m['borne']
+            + "' formato incomum (esperado: x20A, x21B, etc)"
+        ])
     
     def validate_nomenclatura_patterns(self):
         """
@@ -298,66 +449,37 @@ class CSharpCompatibilityValidator:
         - FDC: Fonte Atuador
         - COMANDO: Página de comando
         """
-        df_desc = pd.read_excel(self.excel_path, sheet_name='Descrição de Projeto CCM-1A')
-        
-        recognized_patterns = [
-            r'^AT-\d+$',        # Atuador
-            r'^SS-',            # Soft Starter
-            r'^IF-',            # Inversor
-            r'^EL-\d+$',        # Elevador
-            r'^FR-EL-\d+$',     # Freio Elevador
-            r'CAR',             # Reversão (contains)
-            r'^FDC-\d+$',       # Fonte Atuador
-            r'COMANDO',         # Comando
-            r'^K-AT-\d+[AF]$',  # Contator Atuador
-        ]
+        df_desc = self._get_sheet('Descrição de Projeto CCM-{painel}')
+        nom = self._text(df_desc, 'NOMENCLATURA')
         
-        for idx, row in df_desc.iterrows():
-            nom = str(row.get('NOMENCLATURA', ''))
-            
-            if pd.isna(nom) or nom == '':
-                continue
-            
-            # Verificar se match algum padrão conhecido
-            matches = any(
-                re.match(pattern, nom) or pattern in nom
-                for pattern in recognized_patterns
-            )
-            
-            if not matches:
-                self.warnings.append(
-                    f"Descrição linha {idx+2}: NOMENCLATURA '{nom}' pode não ser reconhecida por métodos C# específicos (IsAtuadorPage, IsSoftStarterPage, etc)"
-                )
+        # Verificar se match algum padrão conhecido
+        matches = nom.str.match('|'.join(f'(?:{p})' for p in self.RECOGNIZED_NOMENCLATURA_PATTERNS))
+        for pattern in self.RECOGNIZED_NOMENCLATURA_PATTERNS:
+            matches |= nom.str.contains(pattern, regex=False)
+        
+        m = nom[(nom != '') & ~matches]
+        self._collect(self.warnings, [
+            "Descrição linha " + (m.index + 2).astype(str).to_series(index=m.index)
+            + ": NOMENCLATURA '" + m
+            + "' pode não ser reconhecida por métodos C# específicos (IsAtuadorPage, IsSoftStarterPage, etc)"
+        ])
     
     def validate_sheet_structure(self):
         """Valida estrutura das abas do Excel"""
-        
-        required_sheets = {
-            'Descrição de Projeto CCM-1A': ['NOMENCLATURA', 'DESCRICAO'],
-            'Acionamento CCM-1A': [
-                'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO',
-                'ANILHA-CARTAO', 'ANILHA-RELE', 'RELE', 'CAVALO',
-                'BORNE', 'CABEAMENTO', 'FUSIVEL'
-            ],
-            'Reconhecimento CCM-1A': [
-                'NOMENCLATURA', 'TIPO', 'DESCRICAO', 'CARTAO',
-                'ANILHA-CARTAO', 'BORNE', 'FUSIVEL'
-            ],
-            'Informações Especiais CCM-1A': ['INFORMACAO', 'VALOR']
-        }
-        
         try:
-            xl_file = pd.ExcelFile(self.excel_path)
+            sheets = self._load_sheets()
             
             # Validar abas obrigatórias
-            for sheet_name, required_cols in required_sheets.items():
-                if sheet_name not in xl_file.sheet_names:
+            for template, required_cols in self.REQUIRED_SHEETS.items():
+                sheet_name = self._sheet_name(template)
+                
+                if sheet_name not in sheets:
                     self.errors.append(
                         f"Aba obrigatória '{sheet_name}' não encontrada (C# ExcelRepository espera essa aba)"
                     )
                     continue
                 
-                df = pd.read_excel(self.excel_path, sheet_name=sheet_name)
+                df = sheets[sheet_name]
                 
                 # Validar colunas obrigatórias
                 for col in required_cols: